@@ -4,6 +4,7 @@ from ui.payments_ui import render_payments_tab
 from ui.ledger_ui import render_ledger_tab
 from ui.liquidity_ui import render_liquidity_tab
 from ui.compliance_ui import render_compliance_tab
+from ui.shared_state_ui import render_change_notice
 from src.data_manager import initialize_session_state, refresh_liquidity_data
 
 # Set page config
@@ -72,6 +73,11 @@ with st.sidebar:
     This is a simulated environment using dummy data. No real transactions are processed.
     """)
 
+    st.markdown("---")
+    st.markdown("### Shared State")
+    st.markdown("All sessions see the same ledger and liquidity data.")
+    render_change_notice()
+
 # Main content
 st.title("StableNet Ledger MVP")
 
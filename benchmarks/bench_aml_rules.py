@@ -0,0 +1,80 @@
+"""Replay of a synthetic day of payments through the streaming AML rules.
+
+Settles 1M payments between 1,000 institutions (a share of them just under
+the reporting threshold or above the large-value limits), then replays them
+into a ledger with the AML rule engine attached, in batches of several
+sizes down to single entries. Reports the screening throughput (time spent
+in the rules only) against the 50k transactions per second target, and the
+alerts raised by each rule.
+
+Run from the project root:
+    python -m benchmarks.bench_aml_rules [payments]
+"""
+import datetime
+import sys
+import time
+import numpy as np
+import pandas as pd
+from src.aml_rules import AMLRuleEngine, RULE_SEVERITY
+from src.batch_ingest import validate_payment_batch, settle_payment_batch
+from src.ledger_store import LedgerStore
+
+PAYMENTS = 1_000_000
+INSTITUTIONS = 1_000
+BATCH_SIZES = [100_000, 1_000, 10]
+SINGLE_APPENDS = 20_000 # Replayed one store.append at a time (the payment form path)
+START = datetime.datetime(2026, 1, 1)
+
+
+def make_ledger(count, seed=0):
+    rng = np.random.default_rng(seed)
+    institutions = np.array([f"Institution {number:04d}" for number in range(INSTITUTIONS)])
+    # Skewed activity: a few institutions send most payments
+    senders = institutions[np.minimum(rng.zipf(1.5, count) - 1, INSTITUTIONS - 1)]
+    amounts = rng.lognormal(7.5, 1.5, count).clip(100, 5_000_000).round(2)
+    near = rng.random(count) < 0.02
+    amounts[near] = rng.uniform(9_000, 9_999, near.sum()).round(2)
+    payments = pd.DataFrame({
+        "Sending Institution": senders,
+        "Receiving Institution": institutions[rng.integers(0, INSTITUTIONS, count)],
+        "Corridor": np.array(["USD-MXN", "EUR-NGN"])[rng.integers(0, 2, count)],
+        "Amount Sent": amounts,
+        "Sending Stablecoin": np.array(["USDC", "EURC"])[rng.integers(0, 2, count)],
+        "Receiving Stablecoin": np.array(["USDC", "EURC"])[rng.integers(0, 2, count)],
+    })
+    valid, _ = validate_payment_batch(payments)
+    settled = settle_payment_batch(valid)
+    # One day of traffic, in append order
+    settled["Timestamp"] = START + pd.to_timedelta(np.arange(len(settled)) * (86400 / len(settled)), unit="s")
+    return settled
+
+
+def replay(ledger, batch_size):
+    store = LedgerStore()
+    engine = AMLRuleEngine(store)
+    for start in range(0, len(ledger), batch_size):
+        store.extend(ledger.iloc[start:start + batch_size])
+    return engine
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else PAYMENTS
+    ledger = make_ledger(count)
+    print(f"{len(ledger):,} payments over one day")
+    print(f"{'batch':>8} | {'screened':>10} | {'rules s':>8} | {'tx/s':>12} | alerts")
+    for batch_size in BATCH_SIZES:
+        rows = ledger if batch_size >= 1_000 else ledger.iloc[:count // 10]
+        engine = replay(rows, batch_size)
+        counts = {rule: sum(engine.alerts.status_counts("Rule", rule).values()) for rule in RULE_SEVERITY}
+        print(f"{batch_size:>8,} | {engine.processed:>10,} | {engine.seconds:>8.2f} | {engine.processed / engine.seconds:>12,.0f} | "
+              + ", ".join(f"{rule} {number:,}" for rule, number in counts.items() if number))
+
+    store = LedgerStore()
+    engine = AMLRuleEngine(store)
+    entries = ledger.iloc[:SINGLE_APPENDS].to_dict("records")
+    start = time.perf_counter()
+    for entry in entries:
+        store.append(entry)
+    elapsed = time.perf_counter() - start
+    print(f"{'single':>8} | {engine.processed:>10,} | {engine.seconds:>8.2f} | {engine.processed / engine.seconds:>12,.0f} | "
+          f"{engine.seconds / engine.processed * 1e6:.1f} us per entry in the rules, {elapsed / len(entries) * 1e6:.1f} us per append overall")
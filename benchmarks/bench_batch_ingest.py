@@ -0,0 +1,37 @@
+"""Throughput of vectorized batch payment ingestion (validate + settle + single ledger append).
+
+Run from the project root:
+    python -m benchmarks.bench_batch_ingest
+"""
+import time
+import numpy as np
+import pandas as pd
+from src.batch_ingest import ingest_payment_batch
+from src.ledger_store import LedgerStore
+
+BATCH_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def make_payments(count, seed=0):
+    rng = np.random.default_rng(seed)
+    institutions = np.array(["FinTech A", "PSP Alpha", "Bank B Mexico", "FinTech Omega Nigeria"])
+    return pd.DataFrame({
+        "Sending Institution": institutions[rng.integers(0, 4, count)],
+        "Receiving Institution": institutions[rng.integers(0, 4, count)],
+        "Corridor": np.array(["USD-MXN", "EUR-NGN"])[rng.integers(0, 2, count)],
+        "Amount Sent": rng.uniform(50, 100_000, count).round(2), # ~0.05% fall below the minimum
+        "Sending Stablecoin": np.array(["USDC", "EURC"])[rng.integers(0, 2, count)],
+        "Receiving Stablecoin": np.array(["USDC", "EURC"])[rng.integers(0, 2, count)],
+        "Priority": np.array(["Standard", "High Priority"])[rng.integers(0, 2, count)],
+    })
+
+
+if __name__ == "__main__":
+    print(f"{'batch':>10} | {'settled':>10} | {'rejected':>8} | {'seconds':>8} | {'payments/s':>12}")
+    for size in BATCH_SIZES:
+        payments = make_payments(size)
+        store = LedgerStore()
+        start = time.perf_counter()
+        settled, rejected = ingest_payment_batch(payments, store)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>10,} | {len(settled):>10,} | {len(rejected):>8,} | {elapsed:>8.3f} | {size / elapsed:>12,.0f}")
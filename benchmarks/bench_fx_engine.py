@@ -0,0 +1,49 @@
+"""Vectorized "rate as of timestamp" lookups vs. per-row Python calls.
+
+Run from the project root:
+    python -m benchmarks.bench_fx_engine
+"""
+import time
+import numpy as np
+from src.fx_engine import FXEngine
+
+CURRENCIES = ["USDC", "EURC", "GBPC", "MXNC", "NGNC", "SGDC"]
+SNAPSHOTS = 10_000 # One snapshot per hour for about 14 months
+ROWS = 1_000_000
+LOOP_ROWS = 100_000 # The per-row baseline runs on a sample and is extrapolated
+
+
+def build_engine(seed=0):
+    rng = np.random.default_rng(seed)
+    engine = FXEngine(CURRENCIES)
+    usd_values = np.array([1.0, 1.08, 1.27, 0.058, 0.00065, 0.74]) # Only quotes against USDC; the rest is triangulated
+    start = np.datetime64("2025-01-01T00:00:00", "s")
+    for hour in range(SNAPSHOTS):
+        usd_values = usd_values * np.exp(rng.normal(0, 0.001, len(usd_values)))
+        engine.publish({(currency, "USDC"): usd_values[code] for code, currency in enumerate(CURRENCIES)}, start + np.timedelta64(hour, "h"))
+    return engine, start
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    engine, first_time = build_engine()
+    print(f"Published {len(engine):,} snapshots of {len(CURRENCIES)} currencies in {time.perf_counter() - start:.2f} s")
+
+    rng = np.random.default_rng(1)
+    sending = np.array(CURRENCIES, dtype=object)[rng.integers(0, len(CURRENCIES), ROWS)]
+    receiving = np.array(CURRENCIES, dtype=object)[rng.integers(0, len(CURRENCIES), ROWS)]
+    timestamps = first_time + rng.integers(0, SNAPSHOTS * 3600, ROWS).astype("timedelta64[s]")
+
+    start = time.perf_counter()
+    engine.rates(sending[:1], receiving[:1], timestamps[:1])
+    print(f"First lookup (triangulates and stacks every snapshot): {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+    start = time.perf_counter()
+    rates = engine.rates(sending, receiving, timestamps)
+    vectorized = time.perf_counter() - start
+    start = time.perf_counter()
+    looped = [engine.rate(s, r, t) for s, r, t in zip(sending[:LOOP_ROWS], receiving[:LOOP_ROWS], timestamps[:LOOP_ROWS])]
+    per_row = (time.perf_counter() - start) / LOOP_ROWS
+    assert np.allclose(rates[:LOOP_ROWS], looped)
+    print(f"Vectorized: {ROWS:,} lookups in {vectorized * 1e3:.0f} ms ({ROWS / vectorized:,.0f} rows/s)")
+    print(f"Per row:    {per_row * 1e6:.1f} µs per lookup, ~{per_row * ROWS:.1f} s for {ROWS:,} rows")
@@ -0,0 +1,43 @@
+"""Build, proof generation and proof verification throughput of the hash-chained Merkle ledger.
+
+Run from the project root:
+    python -m benchmarks.bench_ledger_chain
+"""
+import os
+import time
+import numpy as np
+from src.ledger_chain import LedgerChain, verify_inclusion
+
+LEDGER_SIZES = [1_000_000, 4_000_000]
+PROOFS = 20_000
+
+
+def synthetic_payloads(count, size=120):
+    # Random fixed-size payloads standing in for encoded ledger entries
+    blob = os.urandom(count * size)
+    return [blob[i * size:(i + 1) * size] for i in range(count)]
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    print(f"{'entries':>10} | {'build/s':>10} | {'proofs/s':>10} | {'verify/s':>10} | {'proof hashes':>12}")
+    for size in LEDGER_SIZES:
+        chain = LedgerChain()
+        payloads = synthetic_payloads(size)
+        start = time.perf_counter()
+        chain.extend(payloads)
+        build = time.perf_counter() - start
+        del payloads
+
+        indices = rng.integers(0, size, PROOFS).tolist()
+        start = time.perf_counter()
+        proofs = [chain.inclusion_proof(i) for i in indices]
+        prove = time.perf_counter() - start
+
+        root = chain.root()
+        start = time.perf_counter()
+        assert all(verify_inclusion(proof, root) for proof in proofs)
+        verify = time.perf_counter() - start
+
+        proof_hashes = np.mean([len(p["siblings"]) + len(p["peaks"]) for p in proofs])
+        print(f"{size:>10,} | {size / build:>10,.0f} | {PROOFS / prove:>10,.0f} | {PROOFS / verify:>10,.0f} | {proof_hashes:>12.1f}")
@@ -0,0 +1,57 @@
+"""Throughput and peak memory of chunked ledger exports vs. a full DataFrame.to_csv.
+
+Run from the project root:
+    python -m benchmarks.bench_ledger_export [rows]
+"""
+import sys
+import time
+import tracemalloc
+from benchmarks.bench_batch_ingest import make_payments
+from src.batch_ingest import ingest_payment_batch
+from src.ledger_export import export_to_file
+from src.ledger_store import LedgerStore
+
+ROWS = 1_000_000
+BATCH = 500_000
+
+
+def measure(export):
+    """Runs `export` twice: once timed, once under tracemalloc (which slows it down).
+
+    Returns (bytes produced, seconds, peak traced MiB).
+    """
+    start = time.perf_counter()
+    size = export()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    export()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, peak / (1 << 20)
+
+
+def full_csv(store):
+    return len(store.to_dataframe().to_csv(index=False).encode("utf-8"))
+
+
+def chunked(store, export_format):
+    export_file, stats = export_to_file(store, export_format)
+    export_file.close()
+    return stats.bytes
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    store = LedgerStore()
+    while len(store) < rows:
+        ingest_payment_batch(make_payments(min(BATCH, rows - len(store)), seed=len(store)), store)
+    store.to_dataframe() # Warm the cached full view so the baseline pays only for to_csv
+    print(f"Ledger of {len(store):,} rows")
+    print(f"{'export':>16} | {'MB':>8} | {'s':>6} | {'MB/s':>7} | {'peak MiB':>9}")
+    for name, export in [
+        ("to_csv (full)", lambda: full_csv(store)),
+        ("CSV (chunked)", lambda: chunked(store, "CSV")),
+        ("Parquet", lambda: chunked(store, "Parquet")),
+    ]:
+        size, elapsed, peak = measure(export)
+        print(f"{name:>16} | {size / 1e6:>8.1f} | {elapsed:>6.2f} | {size / 1e6 / elapsed:>7.1f} | {peak:>9.1f}")
@@ -0,0 +1,53 @@
+"""Latency of indexed Ledger tab filters at 5M rows.
+
+Run from the project root:
+    python -m benchmarks.bench_ledger_index
+"""
+import datetime
+import time
+import numpy as np
+import pandas as pd
+from benchmarks.bench_batch_ingest import make_payments
+from src.batch_ingest import validate_payment_batch, settle_payment_batch
+from src.ledger_index import LedgerIndex
+from src.ledger_store import LedgerStore
+
+ROWS = 5_000_000
+BATCH = 500_000
+START = datetime.datetime(2026, 1, 1)
+
+QUERIES = {
+    "one institution": dict(institutions=["PSP Alpha"]),
+    "one corridor": dict(corridors=["EUR-NGN"]),
+    "institution + corridor": dict(institutions=["Bank B Mexico"], corridors=["USD-MXN"]),
+    "one day": dict(start=START + datetime.timedelta(days=40), end=START + datetime.timedelta(days=41)),
+    "all filters": dict(institutions=["FinTech A", "PSP Alpha"], corridors=["USD-MXN"], start=START + datetime.timedelta(days=10), end=START + datetime.timedelta(days=20)),
+}
+
+
+def build_store(rows):
+    store = LedgerStore()
+    index = LedgerIndex(store)
+    while len(store) < rows:
+        valid, _ = validate_payment_batch(make_payments(BATCH, seed=len(store)))
+        settled = settle_payment_batch(valid)
+        # Spread the payments evenly over 90 days in append order
+        settled["Timestamp"] = START + pd.to_timedelta((len(store) + np.arange(len(settled))) * (90 * 86400 / rows), unit="s")
+        store.extend(settled)
+    return store, index
+
+
+if __name__ == "__main__":
+    store, index = build_store(ROWS)
+    print(f"Ledger of {len(store):,} rows")
+    start = time.perf_counter()
+    index.query(corridors=["USD-MXN"])
+    print(f"First query (builds the per-chunk indexes): {(time.perf_counter() - start) * 1e3:.0f} ms")
+    print(f"{'query':>24} | {'rows':>10} | {'ms':>8}")
+    for name, filters in QUERIES.items():
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            rows = index.query(**filters)
+            timings.append(time.perf_counter() - start)
+        print(f"{name:>24} | {len(rows):>10,} | {np.median(timings) * 1e3:>8.1f}")
@@ -0,0 +1,76 @@
+"""Cold-start time of the persisted ledger (memory-mapped segments + WAL tail replay).
+
+Also times the AML rule engine's start-up from the counterparty pairs saved
+with the sealed segments, against scanning every row for them.
+
+The first run builds a ledger of ROWS entries (hash chain included) in the
+benchmark directory, which takes a few minutes; later runs reuse it.
+
+Run from the project root:
+    python -m benchmarks.bench_ledger_persistence [rows] [directory]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+from benchmarks.bench_batch_ingest import make_payments
+from src.aml_rules import AMLRuleEngine
+from src.batch_ingest import ingest_payment_batch
+from src.ledger_chain import LedgerChain, verify_inclusion
+from src.ledger_persistence import LedgerPersistence
+from src.ledger_store import LedgerStore
+
+ROWS = 10_000_000
+BUILD_BATCH = 1_000_000
+WAL_TAIL = 5_000 # Unsealed rows left in the WAL after the build
+
+
+def open_ledger(directory):
+    store = LedgerStore()
+    chain = LedgerChain(chunk_nodes=store.chunk_rows)
+    persistence = LedgerPersistence(directory)
+    replayed = persistence.open(store, chain)
+    return store, chain, persistence, replayed
+
+
+def build(directory, rows):
+    store, chain, persistence, _ = open_ledger(directory)
+    start = time.perf_counter()
+    target = rows - rows % store.chunk_rows + WAL_TAIL
+    while len(store) < target:
+        ingest_payment_batch(make_payments(min(BUILD_BATCH, target - len(store)), seed=len(store)), store)
+        print(f"  built {len(store):,} rows ({time.perf_counter() - start:.0f} s)")
+    persistence.close()
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    directory = sys.argv[2] if len(sys.argv) > 2 else os.path.join(tempfile.gettempdir(), f"stablenet_ledger_{rows}")
+    if not os.path.exists(os.path.join(directory, "manifest.json")):
+        print(f"Building a {rows:,}-row ledger in {directory} ...")
+        build(directory, rows)
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    store, chain, persistence, replayed = open_ledger(directory)
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"Cold start: {len(store):,} rows ({persistence.sealed_rows:,} sealed, {replayed:,} replayed from WAL) in {elapsed * 1e3:.0f} ms")
+    print(f"Peak RSS growth during start: {(rss_after - rss_before) / 1024:.1f} MiB")
+
+    start = time.perf_counter()
+    row = len(store) // 2
+    proof = chain.inclusion_proof(row)
+    assert verify_inclusion(proof, chain.root())
+    print(f"Inclusion proof for row {row:,} after cold start: {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+    for name, make_engine in (("segment pairs", lambda: AMLRuleEngine(store, known_pairs=persistence.counterparty_pairs(), known_rows=persistence.sealed_rows)),
+                              ("full scan", lambda: AMLRuleEngine(store))):
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        make_engine()
+        elapsed = time.perf_counter() - start
+        rss_growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+        print(f"AML engine start from {name}: {elapsed * 1e3:.1f} ms, peak RSS growth {rss_growth:.1f} MiB")
+    persistence.close()
@@ -0,0 +1,75 @@
+"""Compliance chart queries from the hourly rollup as the ledger grows.
+
+Grows a ledger streaming in over 90 days to 4M rows and, at each size,
+times the Compliance tab's queries (one corridor's daily volume over 7
+days, and the institution share over 30 days) from the hourly rollup
+against the same answer computed by scanning the ledger columns. The
+rollup's cost should stay flat while the scan grows with the ledger.
+
+Run from the project root:
+    python -m benchmarks.bench_ledger_rollups
+"""
+import datetime
+import time
+import numpy as np
+import pandas as pd
+from benchmarks.bench_batch_ingest import make_payments
+from src.batch_ingest import validate_payment_batch, settle_payment_batch
+from src.ledger_rollups import LedgerRollup
+from src.ledger_store import LedgerStore
+
+BATCH = 500_000
+BATCHES = 8 # Queries are timed after each batch
+START = datetime.datetime(2026, 1, 1)
+DAYS = 90
+CORRIDOR = "USD-MXN"
+
+
+def timed(function, repeats=5):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return result, np.median(timings)
+
+
+def scan_volume(store, start, end):
+    corridor = store.vocabulary("Corridor").codes[CORRIDOR]
+    times = store.column("Timestamp")
+    mask = (store.column("Corridor") == corridor) & (times >= np.datetime64(start, "s")) & (times <= np.datetime64(end, "s"))
+    days = times[mask].astype("datetime64[D]")
+    return pd.Series(1, index=days).groupby(level=0).sum()
+
+
+def scan_activity(store, start, end):
+    corridor = store.vocabulary("Corridor").codes[CORRIDOR]
+    times = store.column("Timestamp")
+    mask = (store.column("Corridor") == corridor) & (times >= np.datetime64(start, "s")) & (times <= np.datetime64(end, "s"))
+    return np.bincount(store.column("Sending Institution")[mask])
+
+
+if __name__ == "__main__":
+    store = LedgerStore()
+    rollup = LedgerRollup(store, bucket_seconds=3600)
+    rollup.totals() # Aggregate appends as they arrive
+    append_seconds = 0.0
+    print(f"{'rows':>10} | {'cells':>7} | {'volume ms':>9} | {'scan ms':>8} | {'share ms':>8} | {'scan ms':>8}")
+    seconds_per_row = DAYS * 86400 / (BATCH * BATCHES)
+    for batch in range(BATCHES):
+        valid, _ = validate_payment_batch(make_payments(BATCH, seed=batch))
+        settled = settle_payment_batch(valid)
+        # Spread the rows evenly over DAYS days in append order, as if they had streamed in
+        settled["Timestamp"] = START + pd.to_timedelta((len(store) + np.arange(len(settled))) * seconds_per_row, unit="s")
+        started = time.perf_counter()
+        store.extend(settled)
+        append_seconds += time.perf_counter() - started
+        end = START + datetime.timedelta(seconds=len(store) * seconds_per_row)
+        week = (end - datetime.timedelta(days=7), end)
+        month = (end - datetime.timedelta(days=30), end)
+        _, volume = timed(lambda: rollup.timeline(corridors=[CORRIDOR], start=week[0], end=week[1], bucket_seconds=86400))
+        _, volume_scan = timed(lambda: scan_volume(store, *week))
+        _, share = timed(lambda: rollup.totals(by="Sending Institution", corridors=[CORRIDOR], start=month[0], end=month[1]))
+        _, share_scan = timed(lambda: scan_activity(store, *month))
+        print(f"{len(store):>10,} | {len(rollup):>7,} | {volume * 1e3:>9.2f} | {volume_scan * 1e3:>8.1f} | {share * 1e3:>8.2f} | {share_scan * 1e3:>8.1f}")
+    print(f"Appends with the rollup attached: {len(store) / append_seconds:,.0f} rows/s")
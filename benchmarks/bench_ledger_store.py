@@ -0,0 +1,51 @@
+"""Append cost of LedgerStore vs. the old per-payment pd.concat.
+
+Run from the project root:
+    python -m benchmarks.bench_ledger_store
+"""
+import time
+import pandas as pd
+from src.ledger_store import LedgerStore, LEDGER_COLUMNS
+from src.utils import create_ledger_entry
+
+CHECKPOINTS = [1_000, 10_000, 100_000, 1_000_000]
+WINDOW = 1_000 # Appends timed at each checkpoint
+
+
+def sample_entry():
+    return create_ledger_entry("FinTech A", "Bank B Mexico", "USD-MXN", 5000, "USDC", "USDC", "Standard", 0.5)
+
+
+def bench_store():
+    store = LedgerStore()
+    entry = sample_entry()
+    print(f"{'rows':>10} | {'LedgerStore append (us)':>24}")
+    for checkpoint in CHECKPOINTS:
+        while len(store) < checkpoint - WINDOW:
+            store.append(entry)
+        start = time.perf_counter()
+        for _ in range(WINDOW):
+            store.append(entry)
+        elapsed = time.perf_counter() - start
+        print(f"{checkpoint:>10,} | {elapsed / WINDOW * 1e6:>24.2f}")
+    start = time.perf_counter()
+    store.to_dataframe()
+    print(f"DataFrame view of {len(store):,} rows: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+
+def bench_concat(limit=5_000):
+    entry = sample_entry()
+    frame = pd.DataFrame([entry], columns=LEDGER_COLUMNS)
+    print(f"{'rows':>10} | {'pd.concat append (us)':>24}")
+    for checkpoint in [1_000, limit]:
+        while len(frame) < checkpoint - 100:
+            frame = pd.concat([frame, pd.DataFrame([entry])], ignore_index=True)
+        start = time.perf_counter()
+        for _ in range(100):
+            frame = pd.concat([frame, pd.DataFrame([entry])], ignore_index=True)
+        print(f"{checkpoint:>10,} | {(time.perf_counter() - start) / 100 * 1e6:>24.2f}")
+
+
+if __name__ == "__main__":
+    bench_store()
+    bench_concat()
@@ -0,0 +1,59 @@
+"""Online trend / volatility estimators vs. refitting every series' window.
+
+Times one tick across all series (a new point per series) followed by a
+fit of the whole portfolio, with the running-sum estimators and with a
+TrendFit over freshly stacked windows, on 10k series.
+
+Run from the project root:
+    python -m benchmarks.bench_liquidity_estimators
+"""
+import datetime
+import time
+import numpy as np
+from benchmarks.bench_liquidity_generator import make_triplets
+from src.liquidity_estimators import OnlineTrendEstimators
+from src.liquidity_forecast import TrendFit, stack_windows
+from src.liquidity_generator import generate_liquidity_history
+from src.liquidity_store import LiquidityStore
+
+INSTITUTIONS = 5_000
+DAYS = 60 # 10k series x 60 days
+TICKS = 20
+
+
+if __name__ == "__main__":
+    triplets = make_triplets(INSTITUTIONS)
+    history = generate_liquidity_history(datetime.date(2026, 1, 1), DAYS, triplets, seed=0)
+    store = LiquidityStore()
+    store.extend(history)
+    keys = store.keys()
+    print(f"{len(keys):,} series, {len(store):,} points")
+
+    start = time.perf_counter()
+    estimators = OnlineTrendEstimators() # Not listening to the store: ticks are fed as one vectorized update
+    for key in keys:
+        estimators.reset(estimators.row(key), store.window(key)[1])
+    print(f"Estimator catch-up: {time.perf_counter() - start:.2f} s")
+    rows = estimators.rows_for(keys)
+
+    rng = np.random.default_rng(0)
+    timestamp = np.datetime64("2026-06-01", "ns")
+    online = refit = 0.0
+    for tick in range(TICKS):
+        values = rng.normal(0, 50_000, len(keys))
+        for key, value in zip(keys, values.tolist()):
+            store.append(key, timestamp, value)
+
+        start = time.perf_counter()
+        estimators.update_rows(rows, values)
+        online_fit = estimators.fit(keys)
+        online += time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, windows, _ = stack_windows(store, keys)
+        full_fit = TrendFit(windows)
+        refit += time.perf_counter() - start
+
+    assert np.allclose(online_fit.slope, full_fit.slope) and np.allclose(online_fit.volatility, full_fit.volatility)
+    print(f"Online estimators: {online / TICKS * 1e3:>8.2f} ms per tick + portfolio fit")
+    print(f"Refit windows:     {refit / TICKS * 1e3:>8.2f} ms per tick + portfolio fit")
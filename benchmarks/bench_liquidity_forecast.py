@@ -0,0 +1,36 @@
+"""Batch forecasting of every liquidity series: 10k series x 14 days x 1k paths.
+
+Run from the project root:
+    python -m benchmarks.bench_liquidity_forecast [institutions] [paths]
+"""
+import datetime
+import sys
+import time
+from benchmarks.bench_liquidity_generator import make_triplets
+from src.liquidity_forecast import TrendFit, simulate_paths, stack_windows
+from src.liquidity_generator import generate_liquidity_history
+from src.liquidity_store import LiquidityStore
+
+INSTITUTIONS = 5_000 # Two series each
+PATHS = 1_000
+HORIZON = 14
+HISTORY_DAYS = 60
+
+if __name__ == "__main__":
+    institutions = int(sys.argv[1]) if len(sys.argv) > 1 else INSTITUTIONS
+    num_paths = int(sys.argv[2]) if len(sys.argv) > 2 else PATHS
+    store = LiquidityStore()
+    store.extend(generate_liquidity_history(datetime.date(2026, 1, 1), HISTORY_DAYS, make_triplets(institutions), seed=0))
+
+    start = time.perf_counter()
+    keys, values, last_times = stack_windows(store)
+    stacked = time.perf_counter()
+    fit = TrendFit(values)
+    fitted = time.perf_counter()
+    paths = simulate_paths(fit, HORIZON, num_paths, seed=0)
+    simulated = time.perf_counter()
+    print(f"{len(keys):,} series x {HORIZON} days x {num_paths:,} paths ({paths.nbytes / 2**20:,.0f} MiB of {paths.dtype})")
+    print(f"  gather windows: {(stacked - start) * 1e3:>8.0f} ms")
+    print(f"  fit trends:     {(fitted - stacked) * 1e3:>8.0f} ms")
+    print(f"  simulate paths: {(simulated - fitted) * 1e3:>8.0f} ms")
+    print(f"  total:          {(simulated - start):>8.2f} s")
@@ -0,0 +1,76 @@
+"""Fit latency and backtest accuracy of the EMA / Holt and ARIMA models vs. the random-walk heuristic.
+
+Fits 10k series at once (cold fit and warm-start update after one appended
+point), then backtests on the last HORIZON days of each series: every
+method is fitted on the preceding FIT_WINDOW days and scored by mean
+absolute error. Two panels are used: the app's synthetic history (linear
+trend plus noise) and a random walk with drift built from the same
+parameters. The heuristic is the previous "Simulated EMA / ARIMA" path
+(one random path around the trend line); its trend line is listed as well.
+
+Run from the project root:
+    python -m benchmarks.bench_liquidity_models
+"""
+import datetime
+import time
+import numpy as np
+from benchmarks.bench_liquidity_generator import make_triplets
+from src.liquidity_forecast import FIT_WINDOW, TrendFit, simulate_paths
+from src.liquidity_generator import generate_liquidity_history
+from src.liquidity_models import ExponentialSmoothing, ARIMAModel, DEFAULT_ARIMA_ORDER
+
+INSTITUTIONS = 5_000 # Two series each
+HORIZON = 7
+DAYS = FIT_WINDOW + HORIZON
+MODELS = {
+    "Simple EMA": lambda: ExponentialSmoothing(trend=False),
+    "Holt": lambda: ExponentialSmoothing(trend=True),
+    f"ARIMA{DEFAULT_ARIMA_ORDER}": lambda: ARIMAModel(DEFAULT_ARIMA_ORDER),
+    "ARIMA(0, 1, 1)": lambda: ARIMAModel((0, 1, 1)),
+}
+
+
+def panels(triplets):
+    """(series, days) matrices: the generator's history and a random walk with drift."""
+    history = generate_liquidity_history(datetime.date(2026, 1, 1), DAYS, triplets, seed=0)
+    trend_panel = history["Net Position"].to_numpy().reshape(DAYS, len(triplets)).T
+    rng = np.random.default_rng(1)
+    steps = triplets["trend_per_day"].to_numpy()[:, None] + rng.standard_normal((len(triplets), DAYS)) * triplets["volatility"].to_numpy()[:, None]
+    walk_panel = triplets["base"].to_numpy()[:, None] + np.cumsum(steps, axis=1)
+    return {"Trend + noise": trend_panel, "Random walk": walk_panel}
+
+
+def forecasts(train):
+    """Point forecasts of every method over the held-out horizon."""
+    fit = TrendFit(train)
+    results = {
+        "Heuristic path": simulate_paths(fit, HORIZON, 1, seed=0, dtype=np.float64)[:, 0, :],
+        "Heuristic trend line": fit.start_values()[:, None] + fit.slope[:, None] * np.arange(HORIZON),
+    }
+    for name, model in MODELS.items():
+        results[name] = model().fit(train).forecast(HORIZON)
+    return results
+
+
+if __name__ == "__main__":
+    triplets = make_triplets(INSTITUTIONS)
+    data = panels(triplets)
+    train = data["Trend + noise"][:, :FIT_WINDOW]
+    print(f"{len(train):,} series, {FIT_WINDOW}-day windows")
+
+    print("\nFit latency (all series at once)")
+    for name, model in MODELS.items():
+        start = time.perf_counter()
+        fitted = model().fit(train[:, :-1])
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        fitted.update(train[:, -1])
+        warm = time.perf_counter() - start
+        print(f"  {name:<16} cold fit {cold * 1e3:>8.1f} ms   warm update {warm * 1e3:>7.2f} ms")
+
+    print(f"\nBacktest MAE over the last {HORIZON} days")
+    for panel_name, panel in data.items():
+        actual = panel[:, FIT_WINDOW:]
+        print(f"  {panel_name}")
+        for name, forecast in forecasts(panel[:, :FIT_WINDOW]).items():
+            print(f"    {name:<22} {np.abs(forecast - actual).mean():>10,.0f}")
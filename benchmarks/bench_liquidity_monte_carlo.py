@@ -0,0 +1,45 @@
+"""Monte Carlo fan charts: time and peak memory of sketched path chunks, serial vs. process pool.
+
+Run from the project root:
+    python -m benchmarks.bench_liquidity_monte_carlo
+"""
+import os
+import time
+import tracemalloc
+import numpy as np
+from src.liquidity_forecast import TrendFit
+from src.liquidity_monte_carlo import CHUNK_ELEMENTS, monte_carlo_forecast
+
+HORIZON = 14
+RUNS = [(1, 100_000), (10, 100_000), (100, 10_000)] # (series, paths per series)
+WORKERS = max(2, min(4, os.cpu_count() or 1))
+
+
+def make_fit(series, seed=0):
+    rng = np.random.default_rng(seed)
+    history = np.cumsum(rng.normal(rng.uniform(-800, 800, (series, 1)), 3000, (series, 30)), axis=1) + rng.uniform(-20_000, 60_000, (series, 1))
+    return TrendFit(history)
+
+
+def measure(fit, num_paths, workers):
+    """Returns (sketch, seconds, peak traced MiB); chunks are sized so every worker gets some."""
+    chunk_paths = max(1, CHUNK_ELEMENTS // (len(fit) * HORIZON * WORKERS))
+    start = time.perf_counter()
+    sketch = monte_carlo_forecast(fit, HORIZON, num_paths, seed=0, chunk_paths=chunk_paths, workers=workers)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    monte_carlo_forecast(fit, HORIZON, num_paths, seed=0, chunk_paths=chunk_paths)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sketch, elapsed, peak / 2**20
+
+
+if __name__ == "__main__":
+    print(f"{'series':>7} | {'paths':>8} | {'full tensor MiB':>15} | {'peak MiB':>8} | {'serial s':>8} | {f'{WORKERS} workers s':>11}")
+    for series, num_paths in RUNS:
+        fit = make_fit(series)
+        serial, serial_time, peak = measure(fit, num_paths, None)
+        pooled, pooled_time, _ = measure(fit, num_paths, WORKERS)
+        assert np.array_equal(serial.counts, pooled.counts) # Same seeds per chunk wherever they run
+        full = series * num_paths * HORIZON * 8 / 2**20
+        print(f"{series:>7,} | {num_paths:>8,} | {full:>15,.0f} | {peak:>8.0f} | {serial_time:>8.2f} | {pooled_time:>11.2f}")
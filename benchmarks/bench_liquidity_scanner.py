@@ -0,0 +1,37 @@
+"""Full early-warning scan of 10k liquidity series.
+
+Times a scan from the online estimators (the app's path) and one refitting
+every window, and reports the alert count against the per-institution
+thresholds. The target is under a second for the whole portfolio.
+
+Run from the project root:
+    python -m benchmarks.bench_liquidity_scanner [institutions]
+"""
+import datetime
+import sys
+import time
+from benchmarks.bench_liquidity_generator import make_triplets
+from src.liquidity_estimators import OnlineTrendEstimators
+from src.liquidity_generator import generate_liquidity_history
+from src.liquidity_scanner import LiquidityScanner
+from src.liquidity_store import LiquidityStore
+
+INSTITUTIONS = 5_000 # Two series each
+HISTORY_DAYS = 60
+SCANS = 5
+
+if __name__ == "__main__":
+    institutions = int(sys.argv[1]) if len(sys.argv) > 1 else INSTITUTIONS
+    store = LiquidityStore()
+    store.extend(generate_liquidity_history(datetime.date(2026, 1, 1), HISTORY_DAYS, make_triplets(institutions), seed=0))
+    estimators = OnlineTrendEstimators(store)
+    print(f"{len(store.keys()):,} series, {len(store):,} points")
+
+    for name, scanner in (("Online estimators", LiquidityScanner(store, estimators)), ("Refit windows", LiquidityScanner(store))):
+        scanner.scan() # Thresholds are looked up once per new series
+        start = time.perf_counter()
+        for _ in range(SCANS):
+            alerts = scanner.scan()
+        elapsed = (time.perf_counter() - start) / SCANS
+        print(f"{name:<18} {elapsed * 1e3:>8.1f} ms per scan, {len(alerts):,} alerts "
+              f"({(alerts['Alert'] == 'Shortfall').sum():,} shortfall / {(alerts['Alert'] == 'Surplus').sum():,} surplus)")
@@ -0,0 +1,61 @@
+"""Per-series ring buffers vs. the previous single-DataFrame liquidity table.
+
+Compares one refresh cycle (look up a series' recent window, append a point)
+on a 1M-point panel.
+
+Run from the project root:
+    python -m benchmarks.bench_liquidity_store
+"""
+import datetime
+import time
+import numpy as np
+import pandas as pd
+from benchmarks.bench_liquidity_generator import make_triplets
+from src.liquidity_generator import generate_liquidity_history
+from src.liquidity_store import LiquidityStore
+
+INSTITUTIONS = 5_000
+DAYS = 100 # 10k series x 100 days = 1M points
+CYCLES = 1_000
+
+
+def table_cycle(table, key, timestamp):
+    """One refresh with the previous approach: mask, sort, concat one row, truncate."""
+    institution, stablecoin, corridor = key
+    series = table[
+        (table["Institution"] == institution) & (table["Corridor"] == corridor) & (table["Stablecoin"] == stablecoin)
+    ].sort_values(by="Timestamp").set_index("Timestamp")["Net Position"]
+    point = pd.DataFrame([{"Timestamp": timestamp, "Institution": institution, "Corridor": corridor, "Stablecoin": stablecoin, "Net Position": series.iloc[-1]}])
+    return pd.concat([table, point], ignore_index=True)
+
+
+def store_cycle(store, key, timestamp):
+    """One refresh with the ring-buffer store: window view and O(1) append."""
+    recent = store.series(key, length=7)
+    store.append(key, timestamp, recent.iloc[-1])
+
+
+if __name__ == "__main__":
+    triplets = make_triplets(INSTITUTIONS)
+    history = generate_liquidity_history(datetime.date(2026, 1, 1), DAYS, triplets, seed=0)
+    keys = list(zip(triplets["Institution"], triplets["Stablecoin"], triplets["Corridor"]))
+    rng = np.random.default_rng(0)
+    picks = [keys[i] for i in rng.integers(0, len(keys), CYCLES)]
+    timestamp = datetime.datetime(2026, 6, 1)
+    print(f"Panel of {len(history):,} points in {len(keys):,} series")
+
+    store = LiquidityStore()
+    start = time.perf_counter()
+    store.extend(history)
+    print(f"Store load: {time.perf_counter() - start:.2f} s")
+    start = time.perf_counter()
+    for key in picks:
+        store_cycle(store, key, timestamp)
+    print(f"Ring-buffer store: {(time.perf_counter() - start) / CYCLES * 1e6:>10.1f} µs per refresh")
+
+    table = history.astype({"Institution": object, "Corridor": object, "Stablecoin": object})
+    table_cycles = 20 # The table approach is far slower; time a few cycles
+    start = time.perf_counter()
+    for key in picks[:table_cycles]:
+        table = table_cycle(table, key, timestamp)
+    print(f"DataFrame table:   {(time.perf_counter() - start) / table_cycles * 1e6:>10.1f} µs per refresh")
@@ -0,0 +1,57 @@
+"""Streaming simulated ticks into 10k liquidity series.
+
+Runs the background tick simulator against a store with the online
+estimators and the early-warning scanner attached (as in the app), at
+several target rates, and reports the rate actually applied to the store,
+the store updates (coalesced batches) and the backpressure stalls. The
+target is 10k+ ticks per second sustained with every listener updated. A
+last run adds a listener costing SLOW_LISTENER_TICKS_PER_SECOND, below the
+target rate, so the bounded queue fills up and the producer is held back.
+
+Run from the project root:
+    python -m benchmarks.bench_liquidity_ticker [institutions]
+"""
+import datetime
+import sys
+import time
+from benchmarks.bench_liquidity_generator import make_triplets
+from src.liquidity_estimators import OnlineTrendEstimators
+from src.liquidity_generator import generate_liquidity_history
+from src.liquidity_scanner import LiquidityScanner
+from src.liquidity_store import LiquidityStore
+from src.liquidity_ticker import LiquidityTicker
+
+INSTITUTIONS = 5_000 # Two series each
+HISTORY_DAYS = 60
+RATES = [10_000, 50_000, 200_000, 1_000_000] # Target ticks per second; the last ones are beyond what the producer sustains on one core
+SECONDS = 3.0
+SLOW_LISTENER_TICKS_PER_SECOND = 20_000
+SLOW_TARGET_RATE = 50_000
+
+if __name__ == "__main__":
+    institutions = int(sys.argv[1]) if len(sys.argv) > 1 else INSTITUTIONS
+    store = LiquidityStore()
+    store.extend(generate_liquidity_history(datetime.date(2026, 1, 1), HISTORY_DAYS, make_triplets(institutions), seed=0))
+    estimators = OnlineTrendEstimators(store)
+    scanner = LiquidityScanner(store, estimators)
+    print(f"{len(store.keys()):,} series, {len(store):,} points")
+
+    def run(rate):
+        ticker = LiquidityTicker(store, rate=rate, seed=0).start()
+        time.sleep(SECONDS)
+        ticker.stop()
+        return ticker.stats()
+
+    def report(rate, stats):
+        print(f"target {rate:>9,}/s: applied {stats['ticks_per_second']:>9,.0f} ticks/s, {stats['batches']:>4} store updates "
+              f"({stats['applied'] / max(stats['batches'], 1):>7,.0f} ticks each), "
+              f"{stats['stalls']:>3} stalls ({stats['stalled_seconds']:.2f} s blocked)")
+
+    for rate in RATES:
+        report(rate, run(rate))
+    print(f"Scan after streaming: {len(scanner.scan()):,} alerts in {scanner.scan_seconds * 1e3:.1f} ms")
+
+    # A consumer slower than the producer: the queue bounds the backlog instead of memory growing
+    store.add_listener(lambda *args: None, lambda store, keys, rows, timestamps, values: time.sleep(len(values) / SLOW_LISTENER_TICKS_PER_SECOND))
+    print(f"With a listener handling {SLOW_LISTENER_TICKS_PER_SECOND:,} ticks/s:")
+    report(SLOW_TARGET_RATE, run(SLOW_TARGET_RATE))
@@ -0,0 +1,27 @@
+"""Gross vs. multilaterally netted settlement transfers, and netting time per window.
+
+Run from the project root:
+    python -m benchmarks.bench_netting
+"""
+import time
+import numpy as np
+from benchmarks.bench_batch_ingest import make_payments
+from src.batch_ingest import ingest_payment_batch
+from src.ledger_store import LedgerStore
+from src.netting import net_settlement
+
+WINDOW_SIZES = [10_000, 100_000, 1_000_000]
+
+
+if __name__ == "__main__":
+    print(f"{'window':>10} | {'gross transfers':>15} | {'net transfers':>13} | {'reduction':>9} | {'ms':>8}")
+    for size in WINDOW_SIZES:
+        store = LedgerStore()
+        ingest_payment_batch(make_payments(size, seed=size), store)
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            positions, transfers = net_settlement(store, start=0, stop=len(store))
+            timings.append(time.perf_counter() - start)
+        gross = len(store) # Each payment settles on its own without netting
+        print(f"{size:>10,} | {gross:>15,} | {len(transfers):>13,} | {gross / len(transfers):>8,.0f}x | {np.median(timings) * 1e3:>8.1f}")
@@ -0,0 +1,92 @@
+"""Fuzzy name screening against a 1M-entry watchlist.
+
+Builds the n-gram screening index over 1M synthetic watchlist names and
+reports the build time and index size, then screens single names as the
+payment form does (listed names, listed names with 1-3 typos, and clean
+names), reporting the median and 99th percentile latency against the 1 ms
+target. Finally screens a bulk batch of distinct counterparty names.
+
+Run from the project root:
+    python -m benchmarks.bench_sanctions_screening [entries]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from src.sanctions_screening import ScreeningIndex
+
+ENTRIES = 1_000_000
+QUERIES = 3_000 # Per kind
+BULK_NAMES = 50_000
+VOCABULARY = 100_000 # Distinct name tokens
+SUFFIXES = ["", " Ltd", " Holdings", " Trading", " Bank", " Exchange", " Capital"]
+
+
+def make_vocabulary(size=VOCABULARY, seed=0):
+    """Pronounceable pseudo-words of 2 to 4 syllables."""
+    rng = np.random.default_rng(seed)
+    consonants = np.array(list("bcdfghjklmnprstvwzy") + ["sh", "ch", "kh", "th", "tr", "br", "st", "gr"])
+    vowels = np.array(list("aeiou") + ["ai", "ou", "ei", "ia"])
+    draws = 2 * size
+    syllables = [pd.Series(np.where(rng.random(draws) < share, consonants[rng.integers(0, len(consonants), draws)] + vowels[rng.integers(0, len(vowels), draws)], ""))
+                 for share in (1.0, 1.0, 0.6, 0.3)]
+    endings = pd.Series(np.where(rng.random(draws) < 0.5, consonants[rng.integers(0, len(consonants), draws)], ""))
+    return pd.unique(syllables[0].str.cat(syllables[1:] + [endings]).str.capitalize())[:size]
+
+
+def make_names(count, seed=0, vocabulary=None):
+    """Names of 1 to 3 tokens plus an optional business word; token frequencies follow Zipf's law, as in real name lists."""
+    vocabulary = make_vocabulary() if vocabulary is None else vocabulary
+    rng = np.random.default_rng(seed)
+    tokens = [pd.Series(vocabulary[np.exp(rng.random(count) * np.log(len(vocabulary))).astype(np.int64) - 1]) for _ in range(3)]
+    lengths = rng.integers(1, 4, count)
+    names = tokens[0].where(lengths < 2, tokens[0] + " " + tokens[1]).where(lengths < 3, tokens[0] + " " + tokens[1] + " " + tokens[2])
+    return (names + np.array(SUFFIXES)[rng.integers(0, len(SUFFIXES), count)]).tolist()
+
+
+def typo(name, rng):
+    chars = list(name)
+    for _ in range(rng.integers(1, 4)):
+        position = int(rng.integers(0, len(chars)))
+        operation = rng.integers(0, 3)
+        if operation == 0:
+            chars.insert(position, chr(97 + int(rng.integers(0, 26))))
+        elif operation == 1:
+            chars[position] = chr(97 + int(rng.integers(0, 26)))
+        elif len(chars) > 1:
+            del chars[position]
+    return "".join(chars)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else ENTRIES
+    vocabulary = make_vocabulary()
+    names = make_names(count, vocabulary=vocabulary)
+    watchlist = pd.DataFrame({"Entry ID": [f"WL{row + 1:07d}" for row in range(count)], "Name": names, "List": "Synthetic"})
+    index = ScreeningIndex(watchlist)
+    size = sum(array.nbytes for array in (index.postings, index.offsets, index.keys, index.gram_codes, index.entry_grams, index.entry_offsets, index.signatures))
+    print(f"{len(index):,} entries ({len(index.normalized):,} distinct names) indexed in {index.build_seconds:.2f} s: "
+          f"{len(index.gram_codes):,} grams, {len(index.postings):,} postings ({size / 1e6:.0f} MB)")
+
+    rng = np.random.default_rng(1)
+    listed = [names[row] for row in rng.integers(0, count, QUERIES)]
+    kinds = {
+        "listed": listed,
+        "listed + typos": [typo(name, rng) for name in listed],
+        "clean": make_names(QUERIES, seed=2, vocabulary=vocabulary), # Same vocabulary, so some are close to listed names by chance
+    }
+    print(f"{'names':>15} | {'matched':>7} | {'p50 us':>7} | {'p99 us':>7} | {'max us':>7}")
+    for kind, queries in kinds.items():
+        timings, matched = [], 0
+        for name in queries:
+            started = time.perf_counter()
+            matched += bool(index.search(name, limit=1)) # Uncached: screen() remembers recent names
+            timings.append(time.perf_counter() - started)
+        timings = np.array(timings) * 1e6
+        print(f"{kind:>15} | {matched / len(queries):>7.1%} | {np.median(timings):>7.0f} | {np.percentile(timings, 99):>7.0f} | {timings.max():>7.0f}")
+
+    bulk = make_names(BULK_NAMES, seed=3, vocabulary=vocabulary)
+    started = time.perf_counter()
+    hits = index.screen_names(bulk)
+    elapsed = time.perf_counter() - started
+    print(f"Bulk {len(bulk):,} names: {elapsed:.2f} s ({len(bulk) / elapsed:,.0f} names/s), {len(hits):,} matches")
@@ -0,0 +1,31 @@
+"""Load test of the settlement engine without Streamlit.
+
+Submits a burst of payments with a 2 s mean latency and reports how long the
+whole burst takes to settle (serial settlement would take count x 2 s).
+
+Run from the project root:
+    python -m benchmarks.bench_settlement_engine
+"""
+import time
+from src.ledger_store import LedgerStore
+from src.settlement_engine import SettlementEngine, LatencyModel
+from src.utils import create_ledger_entry
+
+BURST_SIZES = [1_000, 10_000, 50_000]
+
+
+if __name__ == "__main__":
+    print(f"{'payments':>10} | {'submit (s)':>10} | {'settle all (s)':>14} | {'settled/s':>10}")
+    for count in BURST_SIZES:
+        store = LedgerStore()
+        engine = SettlementEngine(on_settled=store.append, latency_model=LatencyModel(mean_seconds=2.0, seed=0)).start()
+        entries = [create_ledger_entry("FinTech A", "Bank B Mexico", "USD-MXN", 5000, "USDC", "USDC", "Standard", 0.5) for _ in range(count)]
+        start = time.perf_counter()
+        for entry in entries:
+            engine.submit(entry)
+        submitted = time.perf_counter() - start
+        engine.wait_idle()
+        elapsed = time.perf_counter() - start
+        engine.stop()
+        assert len(store) == count
+        print(f"{count:>10,} | {submitted:>10.3f} | {elapsed:>14.3f} | {count / elapsed:>10,.0f}")
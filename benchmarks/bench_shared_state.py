@@ -0,0 +1,144 @@
+"""Process-wide shared ledger and liquidity state across app sessions.
+
+Opens several sessions of the app in this process (Streamlit's AppTest, as
+the server does for each browser tab), each generating the default Monte
+Carlo forecast, and reports the memory each extra session adds and the
+shared forecast cache's hits, next to what one private copy of the
+liquidity state (store, estimators, scanner, ticker, forecast cache with
+one forecast) used to cost per session. Then times snapshot reads of one
+series (lock-free views) against locked copies while the tick simulator
+writes 10k series, and the delay between a ledger append and the wake-up of
+a session waiting on the change feed.
+
+Run from the project root:
+    python -m benchmarks.bench_shared_state [sessions]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import numpy as np
+
+os.environ.setdefault("STABLENET_LEDGER_DIR", tempfile.mkdtemp(prefix="bench_shared_state_")) # Before the config is imported
+
+import datetime
+from streamlit.testing.v1 import AppTest
+from benchmarks.bench_aml_rules import make_ledger
+from benchmarks.bench_liquidity_generator import make_triplets
+from src.change_feed import ChangeFeed
+from src.config_base import generate_initial_liquidity_data
+from src.forecast_cache import ForecastCache
+from src.ledger_store import LedgerStore
+from src.liquidity_estimators import OnlineTrendEstimators
+from src.liquidity_generator import generate_liquidity_history
+from src.liquidity_monte_carlo import monte_carlo_forecast
+from src.liquidity_scanner import LiquidityScanner
+from src.liquidity_store import LiquidityStore
+from src.liquidity_ticker import LiquidityTicker
+
+SESSIONS = 8
+READ_INSTITUTIONS = 5_000 # Two series each, ticked while reading
+READ_TICK_RATE = 50_000
+READ_SECONDS = 3.0
+READ_POINTS = 60 # As the Live Feed
+NOTIFICATIONS = 1_000
+
+
+def private_state():
+    """The liquidity state each session used to generate for itself, with one forecast cached."""
+    store = LiquidityStore()
+    store.extend(generate_initial_liquidity_data(datetime.date.today(), num_days=30))
+    estimators = OnlineTrendEstimators(store)
+    cache = ForecastCache()
+    key = store.keys()[0]
+    cache.get_or_compute(key, store.version(key), "monte_carlo", lambda: monte_carlo_forecast(estimators.fit([key]), 7, num_paths=10_000, seed=0))
+    return [store, estimators, LiquidityScanner(store, estimators), LiquidityTicker(store), cache]
+
+
+def open_session():
+    session = AppTest.from_file("app.py", default_timeout=300).run()
+    [button for button in session.button if button.label == "Generate Forecast"][0].click().run()
+    assert not session.exception, session.exception
+    return session
+
+
+def percentiles(timings):
+    timings = np.array(timings) * 1e6
+    return f"p50 {np.median(timings):>8.1f} us | p99 {np.percentile(timings, 99):>8.1f} us | max {timings.max():>9.1f} us"
+
+
+def read_under_ticks(store, key, read):
+    """Times `read()` in a loop while the ticker writes every series from its own threads."""
+    ticker = LiquidityTicker(store, rate=READ_TICK_RATE, seed=0).start()
+    timings = []
+    deadline = time.perf_counter() + READ_SECONDS
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        read(store, key)
+        timings.append(time.perf_counter() - started)
+        time.sleep(0) # Let the ticker threads run between reads
+    ticker.stop()
+    return timings, ticker.stats()["applied"]
+
+
+def locked_copy(store, key):
+    with store.lock:
+        return [view.copy() for view in store.window(key, READ_POINTS)]
+
+
+def snapshot(store, key):
+    return store.window(key, READ_POINTS)
+
+
+if __name__ == "__main__":
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else SESSIONS
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    copies = [private_state() for _ in range(2)]
+    private_bytes = (tracemalloc.get_traced_memory()[0] - before) / len(copies)
+    del copies
+    print(f"Private liquidity state: {private_bytes / 1e6:.2f} MB per session (up to {ForecastCache().max_bytes / 1e6:.0f} MB more as its forecast cache fills)")
+
+    opened, footprints = [], []
+    for number in range(sessions):
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        opened.append(open_session())
+        footprints.append((tracemalloc.get_traced_memory()[0] - before, time.perf_counter() - started))
+    tracemalloc.stop()
+    cache = opened[0].session_state["forecast_cache"].stats()
+    print(f"{'session':>8} | {'added MB':>8} | {'first run s':>11}")
+    for number, (added, seconds) in enumerate(footprints, 1):
+        print(f"{number:>8} | {added / 1e6:>8.2f} | {seconds:>11.2f}")
+    print(f"Shared forecast cache: {cache['hits']} hits, {cache['misses']} misses, {cache['entries']} entries "
+          f"({cache['bytes'] / 1e6:.2f} MB) for {sessions} sessions")
+    del opened
+
+    store = LiquidityStore()
+    store.extend(generate_liquidity_history(datetime.date(2026, 1, 1), 60, make_triplets(READ_INSTITUTIONS), seed=0))
+    OnlineTrendEstimators(store) # Listeners in the write path, as in the app
+    key = store.keys()[0]
+    print(f"Reads of {READ_POINTS} points of one series while ticking {len(store.keys()):,} series at {READ_TICK_RATE:,} ticks/s:")
+    for name, read in (("locked copy", locked_copy), ("snapshot view", snapshot)):
+        timings, applied = read_under_ticks(store, key, read)
+        print(f"{name:>14} | {len(timings):>9,} reads | {percentiles(timings)} | {applied:,} ticks applied")
+
+    ledger = make_ledger(NOTIFICATIONS)
+    ledger_store = LedgerStore()
+    feed = ChangeFeed()
+    feed.watch_ledger(ledger_store)
+    delays = []
+    for row in range(NOTIFICATIONS):
+        seen = feed.counters()
+        woken = []
+        waiter = threading.Thread(target=lambda: woken.append((feed.wait(seen, timeout=5), time.perf_counter())))
+        waiter.start()
+        time.sleep(0.0005) # The waiter is blocked before the append
+        appended = time.perf_counter()
+        ledger_store.extend(ledger.iloc[row:row + 1])
+        waiter.join()
+        delays.append(woken[0][1] - appended)
+    print(f"One-row ledger append until a waiting session wakes: {percentiles(delays)}")
@@ -0,0 +1,209 @@
+import threading
+import numpy as np
+import pandas as pd
+from src.ledger_store import Vocabulary
+
+ALERT_COLUMNS = ["Alert ID", "Timestamp", "Rule", "Severity", "Institution", "Corridor", "Transaction ID", "Details", "Status"]
+INDEXED_ALERT_FIELDS = ["Rule", "Severity", "Institution", "Corridor"] # Fixed once raised; Status changes during review
+ALERT_STATUSES = ["Pending", "Reviewed", "Escalated", "Closed"]
+NEW_ALERT_STATUS = "Pending"
+ALERT_PAGE_SIZE = 50
+
+
+class _Postings:
+    """Growable array of the rows holding one value of an indexed field, in row order."""
+
+    def __init__(self):
+        self.rows = np.empty(16, dtype=np.int64)
+        self.size = 0
+
+    def append(self, row):
+        if self.size == len(self.rows):
+            self.rows = np.resize(self.rows, 2 * self.size)
+        self.rows[self.size] = row
+        self.size += 1
+
+    def view(self):
+        return self.rows[:self.size]
+
+
+def _grow(array, size):
+    return array if size < len(array) else np.resize(array, 2 * len(array))
+
+
+class AlertStore:
+    """Append-only store of compliance alerts with typed, indexed fields.
+
+    Rule, severity, institution and corridor are dictionary-coded and each
+    value keeps the rows holding it (postings), so a filtered query starts
+    from the smallest matching postings instead of scanning every alert;
+    remaining filters, status and the time range are vectorized checks on
+    those rows only. Alerts arrive in time order, so a time range is a
+    binary search. Status counts, overall and per indexed value, are kept
+    up to date on every add and status change: summaries are O(1).
+    """
+
+    def __init__(self, capacity=1024):
+        self.vocabularies = {field: Vocabulary() for field in INDEXED_ALERT_FIELDS}
+        self.statuses = Vocabulary(ALERT_STATUSES)
+        self._codes = {field: np.empty(capacity, dtype=np.int32) for field in INDEXED_ALERT_FIELDS}
+        self._postings = {field: [] for field in INDEXED_ALERT_FIELDS} # Per field: code -> _Postings
+        self._times = np.empty(capacity, dtype="datetime64[s]")
+        self._status = np.empty(capacity, dtype=np.int8)
+        self._transaction_ids = []
+        self._details = []
+        self._status_counts = np.zeros(len(ALERT_STATUSES), dtype=np.int64)
+        self._value_status_counts = {field: [] for field in INDEXED_ALERT_FIELDS} # Per field: code -> counts per status
+        self._size = 0
+        self._in_order = True # Timestamps are non-decreasing in row order
+        self.lock = threading.RLock()
+        self.version = 0 # Incremented on every change, used to invalidate cached views
+
+    def __len__(self):
+        return self._size
+
+    def add(self, timestamp, rule, severity, institution, corridor, transaction_id, details, status=NEW_ALERT_STATUS):
+        """Appends one alert and returns its Alert ID."""
+        with self.lock:
+            row = self._size
+            for field in INDEXED_ALERT_FIELDS:
+                self._codes[field] = _grow(self._codes[field], row)
+            self._times = _grow(self._times, row)
+            self._status = _grow(self._status, row)
+            status_code = self._status_code(status)
+
+            for field, value in zip(INDEXED_ALERT_FIELDS, (rule, severity, institution, corridor)):
+                code = self.vocabularies[field].encode(value)
+                if code == len(self._postings[field]): # First alert with this value
+                    self._postings[field].append(_Postings())
+                    self._value_status_counts[field].append(np.zeros(len(ALERT_STATUSES), dtype=np.int64))
+                self._codes[field][row] = code
+                self._postings[field][code].append(row)
+                self._value_status_counts[field][code][status_code] += 1
+            timestamp = np.datetime64(timestamp, "s")
+            if row and timestamp < self._times[row - 1]:
+                self._in_order = False
+            self._times[row] = timestamp
+            self._status[row] = status_code
+            self._status_counts[status_code] += 1
+            self._transaction_ids.append(transaction_id)
+            self._details.append(details)
+            self._size = row + 1
+            self.version += 1
+            return self.alert_id(row)
+
+    @staticmethod
+    def alert_id(row):
+        return f"AML{row + 1:07d}"
+
+    def row(self, alert_id):
+        """Returns the row of an Alert ID, or None if there is no such alert."""
+        try:
+            row = int(str(alert_id).strip().upper().removeprefix("AML")) - 1
+        except ValueError:
+            return None
+        return row if 0 <= row < self._size else None
+
+    def _status_code(self, status):
+        if status not in self.statuses.codes:
+            raise ValueError(f"Unknown alert status '{status}'; expected one of {', '.join(ALERT_STATUSES)}.")
+        return self.statuses.codes[status]
+
+    def set_status(self, rows, status):
+        """Moves the given alert rows to `status`, keeping every status count current."""
+        with self.lock:
+            status_code = self._status_code(status)
+            rows = np.unique(np.asarray(rows, dtype=np.int64))
+            rows = rows[(rows >= 0) & (rows < self._size)]
+            previous = self._status[rows]
+            changed = rows[previous != status_code]
+            previous = self._status[changed]
+            np.subtract.at(self._status_counts, previous, 1)
+            self._status_counts[status_code] += len(changed)
+            for field in INDEXED_ALERT_FIELDS:
+                counts = self._value_status_counts[field]
+                for code, old in zip(self._codes[field][changed].tolist(), previous.tolist()):
+                    counts[code][old] -= 1
+                    counts[code][status_code] += 1
+            self._status[changed] = status_code
+            self.version += 1
+            return len(changed)
+
+    def status_counts(self, field=None, value=None):
+        """Returns {status: count}, over all alerts or those whose `field` equals `value`."""
+        with self.lock:
+            if field is None:
+                counts = self._status_counts
+            else:
+                code = self.vocabularies[field].codes.get(value)
+                counts = self._value_status_counts[field][code] if code is not None else np.zeros(len(ALERT_STATUSES), dtype=np.int64)
+            return dict(zip(ALERT_STATUSES, counts.tolist()))
+
+    def _time_range(self, start, end):
+        """Row range [low, high) that may hold alerts in [start, end]."""
+        low, high = 0, self._size
+        if self._in_order:
+            times = self._times[:self._size]
+            if start is not None:
+                low = int(np.searchsorted(times, np.datetime64(start, "s"), side="left"))
+            if end is not None:
+                high = int(np.searchsorted(times, np.datetime64(end, "s"), side="right"))
+        return low, high
+
+    def query(self, rules=None, severities=None, institutions=None, corridors=None, statuses=None, start=None, end=None):
+        """Returns the sorted rows of the alerts matching every given filter.
+
+        Each filter is a list of accepted values; `start` / `end` bound the
+        Timestamp inclusively.
+        """
+        with self.lock:
+            filters = {field: values for field, values in zip(INDEXED_ALERT_FIELDS, (rules, severities, institutions, corridors)) if values}
+            codes = {field: self.vocabularies[field].lookup(values) for field, values in filters.items()}
+            if any(not field_codes for field_codes in codes.values()):
+                return np.empty(0, dtype=np.int64)
+            low, high = self._time_range(start, end)
+
+            if codes:
+                # Start from the field with the fewest matching alerts
+                sizes = {field: sum(self._postings[field][code].size for code in field_codes) for field, field_codes in codes.items()}
+                first = min(sizes, key=sizes.get)
+                parts = [self._postings[first][code].view() for code in codes.pop(first)]
+                rows = np.sort(np.concatenate(parts)) if len(parts) > 1 else parts[0].copy()
+                rows = rows[np.searchsorted(rows, low):np.searchsorted(rows, high)]
+            else:
+                rows = np.arange(low, high, dtype=np.int64)
+            for field, field_codes in codes.items():
+                rows = rows[np.isin(self._codes[field][rows], field_codes)]
+            if statuses:
+                rows = rows[np.isin(self._status[rows], [self._status_code(status) for status in statuses])]
+            if not self._in_order:
+                times = self._times[rows]
+                if start is not None:
+                    rows = rows[times >= np.datetime64(start, "s")]
+                    times = self._times[rows]
+                if end is not None:
+                    rows = rows[times <= np.datetime64(end, "s")]
+            return rows
+
+    def to_dataframe(self, rows=None):
+        """Returns the given alert rows (all by default) as a DataFrame with the ALERT_COLUMNS."""
+        with self.lock:
+            rows = np.arange(self._size) if rows is None else np.asarray(rows, dtype=np.int64)
+            frame = {"Alert ID": [self.alert_id(row) for row in rows.tolist()], "Timestamp": self._times[rows]}
+            for field in INDEXED_ALERT_FIELDS:
+                frame[field] = pd.Categorical.from_codes(self._codes[field][rows], categories=list(self.vocabularies[field].values))
+            frame["Transaction ID"] = [self._transaction_ids[row] for row in rows.tolist()]
+            frame["Details"] = [self._details[row] for row in rows.tolist()]
+            frame["Status"] = pd.Categorical.from_codes(self._status[rows], categories=ALERT_STATUSES)
+            return pd.DataFrame(frame, columns=ALERT_COLUMNS)
+
+    def page(self, number=0, size=ALERT_PAGE_SIZE, rows=None, **filters):
+        """Returns (page `number` of the matching alerts newest first, as a DataFrame, total matches).
+
+        Pass the `rows` of an earlier `query` to page them without querying
+        again; otherwise the `filters` are queried.
+        """
+        with self.lock:
+            rows = self.query(**filters) if rows is None else rows
+            newest = len(rows) - number * size
+            return self.to_dataframe(rows[max(newest - size, 0):max(newest, 0)][::-1]), len(rows)
@@ -0,0 +1,177 @@
+import collections
+import time
+import numpy as np
+from src.alert_store import AlertStore
+from src.ledger_store import counterparty_pairs
+from src.config_base import (
+    AML_VELOCITY_LIMIT, AML_VELOCITY_WINDOW_SECONDS, AML_REPORTING_THRESHOLD, AML_STRUCTURING_MARGIN,
+    AML_STRUCTURING_LIMIT, AML_STRUCTURING_WINDOW_SECONDS, AML_LARGE_VALUE_THRESHOLDS, AML_LARGE_VALUE_DEFAULT,
+    AML_NEW_COUNTERPARTY_LIMIT, AML_NEW_COUNTERPARTY_WINDOW_SECONDS
+)
+
+RULE_SEVERITY = {"Velocity": "Medium", "Structuring": "High", "Large Value": "High", "New Counterparty Burst": "Medium"}
+SMALL_BATCH_ROWS = 32 # Smaller appends are screened entry by entry, cheaper than the vectorized batch path
+
+
+class WindowedCounter:
+    """Per-key sliding-window counter answering "more than `limit` events in the last `window_seconds`?".
+
+    Only the latest limit + 1 event times of a key are kept (a bounded deque):
+    the window holds more than `limit` events exactly when the oldest of them
+    is still inside it. Each event is O(1) and memory is bounded by the number
+    of keys, whatever the traffic. A key is reported at most once per window,
+    not on every event past its limit.
+    """
+
+    def __init__(self, limit, window_seconds):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._times = {}
+        self._quiet_until = {} # Key -> time before which it is not reported again
+
+    def __len__(self):
+        return len(self._times)
+
+    def add(self, key, timestamp):
+        """Records an event of `key` at `timestamp` (seconds); True if its window now exceeds the limit."""
+        times = self._times.get(key)
+        if times is None:
+            times = self._times[key] = collections.deque(maxlen=self.limit + 1)
+        times.append(timestamp)
+        if len(times) > self.limit and times[0] > timestamp - self.window_seconds and timestamp >= self._quiet_until.get(key, timestamp):
+            self._quiet_until[key] = timestamp + self.window_seconds
+            return True
+        return False
+
+
+class AMLRuleEngine:
+    """Streaming AML rules over every entry appended to a LedgerStore.
+
+    Runs as a store listener, so payments from the form, the settlement
+    engine and bulk uploads are all screened as they are appended:
+
+    - Velocity: more than AML_VELOCITY_LIMIT payments from one institution
+      within the velocity window.
+    - Structuring: more than AML_STRUCTURING_LIMIT payments from one
+      institution just under AML_REPORTING_THRESHOLD within a day.
+    - Large Value: a single payment at or above its corridor's threshold.
+    - New Counterparty Burst: more than AML_NEW_COUNTERPARTY_LIMIT first-time
+      receiving institutions for one sender within the window.
+
+    Windowed rules use WindowedCounter (O(1) per payment); per-batch filters
+    (near-threshold amounts, large values, first-time pairs) are vectorized, so
+    only velocity is a per-payment Python step. Alerts are added to an
+    AlertStore.
+    Entries already in the ledger are not screened, but their counterparty
+    pairs are known, so a restart does not look like a burst of new ones.
+    `known_pairs` are the pairs of the first `known_rows` entries (e.g. saved
+    with the sealed segments, see LedgerPersistence.counterparty_pairs), so
+    only the entries after them are read at startup.
+    """
+
+    def __init__(self, store, alerts=None, known_pairs=None, known_rows=0):
+        self.store = store
+        self.velocity = WindowedCounter(AML_VELOCITY_LIMIT, AML_VELOCITY_WINDOW_SECONDS)
+        self.structuring = WindowedCounter(AML_STRUCTURING_LIMIT, AML_STRUCTURING_WINDOW_SECONDS)
+        self.new_counterparties = WindowedCounter(AML_NEW_COUNTERPARTY_LIMIT, AML_NEW_COUNTERPARTY_WINDOW_SECONDS)
+        self.alerts = alerts if alerts is not None else AlertStore() # Where alerts are raised
+        self.processed = 0
+        self.seconds = 0.0 # Time spent screening
+        self._thresholds = np.empty(0)
+        with store.lock:
+            pairs = counterparty_pairs(store.column("Sending Institution", known_rows), store.column("Receiving Institution", known_rows))
+            if known_pairs is not None:
+                pairs = np.concatenate([known_pairs, pairs])
+            self._counterparties = set(np.unique(pairs).tolist()) # Known (sender, receiver) pairs
+            store.add_listener(self._on_append)
+
+    def _large_value_threshold(self, corridors):
+        """Large-value thresholds of corridor codes (an array, or a single code)."""
+        labels = self.store.vocabulary("Corridor").values
+        if len(self._thresholds) < len(labels): # Corridors seen for the first time
+            self._thresholds = np.array([AML_LARGE_VALUE_THRESHOLDS.get(label, AML_LARGE_VALUE_DEFAULT) for label in labels], dtype=np.float64)
+        return self._thresholds[corridors]
+
+    def _on_append(self, store, start, stop):
+        started = time.perf_counter()
+        if stop - start <= SMALL_BATCH_ROWS:
+            hits = [hit for row in range(start, stop) for hit in self._screen_entry(store, row)]
+        else:
+            hits = self._screen_batch(store, start, stop)
+        for row, rule in hits:
+            self._raise(store, row, rule)
+        self.processed += stop - start
+        self.seconds += time.perf_counter() - started
+
+    def _screen_entry(self, store, row):
+        """Rules of a single entry, on Python scalars (the payment form and settlement engine path)."""
+        chunk, offset = store.chunk(row // store.chunk_rows), row % store.chunk_rows
+        sender = int(chunk["Sending Institution"][offset])
+        receiver = int(chunk["Receiving Institution"][offset])
+        timestamp = int(chunk["Timestamp"][offset].astype(np.int64))
+        amount = float(chunk["Amount Sent"][offset])
+        hits = []
+        if self.velocity.add(sender, timestamp):
+            hits.append((row, "Velocity"))
+        if AML_REPORTING_THRESHOLD * (1 - AML_STRUCTURING_MARGIN) <= amount < AML_REPORTING_THRESHOLD and self.structuring.add(sender, timestamp):
+            hits.append((row, "Structuring"))
+        if amount >= self._large_value_threshold(int(chunk["Corridor"][offset])):
+            hits.append((row, "Large Value"))
+        pair = (sender << 32) | receiver
+        if pair not in self._counterparties:
+            self._counterparties.add(pair)
+            if self.new_counterparties.add(sender, timestamp):
+                hits.append((row, "New Counterparty Burst"))
+        return hits
+
+    def _screen_batch(self, store, start, stop):
+        """Rules of a batch of entries: only velocity steps through every payment, the other filters are vectorized."""
+        times = store.column("Timestamp", start, stop).astype(np.int64)
+        senders = store.column("Sending Institution", start, stop)
+        receivers = store.column("Receiving Institution", start, stop)
+        amounts = store.column("Amount Sent", start, stop)
+        hits = [] # (batch row, rule)
+
+        for row, (sender, timestamp) in enumerate(zip(senders.tolist(), times.tolist())):
+            if self.velocity.add(sender, timestamp):
+                hits.append((row, "Velocity"))
+
+        near = (amounts >= AML_REPORTING_THRESHOLD * (1 - AML_STRUCTURING_MARGIN)) & (amounts < AML_REPORTING_THRESHOLD)
+        for row in np.flatnonzero(near).tolist():
+            if self.structuring.add(int(senders[row]), int(times[row])):
+                hits.append((row, "Structuring"))
+
+        large = amounts >= self._large_value_threshold(store.column("Corridor", start, stop))
+        hits.extend((row, "Large Value") for row in np.flatnonzero(large).tolist())
+
+        # First payment of each pair in the batch, in append order, then only pairs never seen before
+        unique_pairs, first_rows = np.unique(counterparty_pairs(senders, receivers), return_index=True)
+        order = np.argsort(first_rows)
+        for pair, row in zip(unique_pairs[order].tolist(), first_rows[order].tolist()):
+            if pair not in self._counterparties:
+                self._counterparties.add(pair)
+                if self.new_counterparties.add(pair >> 32, int(times[row])):
+                    hits.append((row, "New Counterparty Burst"))
+        return [(start + row, rule) for row, rule in sorted(hits)]
+
+    def _raise(self, store, row, rule):
+        """Records an alert of `rule` for ledger row `row`."""
+        sender = int(store.column("Sending Institution", row, row + 1)[0])
+        timestamp = store.column("Timestamp", row, row + 1)[0]
+        institution = store.vocabulary("Sending Institution").values[sender]
+        corridor = store.vocabulary("Corridor").values[int(store.column("Corridor", row, row + 1)[0])]
+        amount = float(store.column("Amount Sent", row, row + 1)[0])
+        stablecoin = store.vocabulary("Sending Stablecoin").values[int(store.column("Sending Stablecoin", row, row + 1)[0])]
+        if rule == "Velocity":
+            details = f"More than {AML_VELOCITY_LIMIT} payments from {institution} within {AML_VELOCITY_WINDOW_SECONDS / 3600:g} h."
+        elif rule == "Structuring":
+            details = (f"More than {AML_STRUCTURING_LIMIT} payments from {institution} just under the {AML_REPORTING_THRESHOLD:,} "
+                       f"reporting threshold within {AML_STRUCTURING_WINDOW_SECONDS / 3600:g} h (latest {amount:,.2f} {stablecoin} in {corridor}).")
+        elif rule == "Large Value":
+            details = f"High-value payment ({amount:,.2f} {stablecoin}) flagged for review in {corridor} corridor."
+        else:
+            details = f"More than {AML_NEW_COUNTERPARTY_LIMIT} new counterparties for {institution} within {AML_NEW_COUNTERPARTY_WINDOW_SECONDS / 3600:g} h."
+        self.alerts.add(
+            timestamp, rule, RULE_SEVERITY[rule], institution, corridor,
+            str(store.column("Transaction ID", row, row + 1)[0]), details,
+        )
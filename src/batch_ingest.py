@@ -0,0 +1,110 @@
+import datetime
+import numpy as np
+import pandas as pd
+from src.config_base import SUPPORTED_STABLECOINS, SUPPORTED_CORRIDORS, TRANSACTION_PRIORITIES
+from src.utils import get_fx_rates, calculate_fees, generate_transaction_ids
+from src.ledger_store import LEDGER_COLUMNS
+from src.sanctions_screening import screen_payments
+
+# Columns a payment batch file must provide ("Priority" defaults to "Standard")
+PAYMENT_BATCH_COLUMNS = [
+    "Sending Institution", "Receiving Institution", "Corridor", "Amount Sent",
+    "Sending Stablecoin", "Receiving Stablecoin"
+]
+MIN_PAYMENT_AMOUNT = 100
+
+
+def read_payment_file(file, file_name=None):
+    """Reads a batch of payments from a CSV or Parquet file (path or file-like object)."""
+    file_name = file_name or getattr(file, "name", None) or str(file)
+    if file_name.lower().endswith((".parquet", ".pq")):
+        return pd.read_parquet(file)
+    return pd.read_csv(file)
+
+
+def validate_payment_batch(payments, timestamp=None):
+    """Validates all rows of a payment batch at once, pricing it at the FX rates in force at `timestamp` (default: latest).
+
+    Returns (valid, rejected): the valid rows normalised to the batch schema, and
+    the rejected rows with an "Error" column naming the first rule they failed.
+    """
+    missing = [name for name in PAYMENT_BATCH_COLUMNS if name not in payments.columns]
+    if missing:
+        raise ValueError(f"Payment file is missing required columns: {', '.join(missing)}.")
+
+    batch = pd.DataFrame({
+        "Sending Institution": payments["Sending Institution"].astype("string").str.strip(),
+        "Receiving Institution": payments["Receiving Institution"].astype("string").str.strip(),
+        "Corridor": payments["Corridor"].astype("string"),
+        "Amount Sent": pd.to_numeric(payments["Amount Sent"], errors="coerce"),
+        "Sending Stablecoin": payments["Sending Stablecoin"].astype("string"),
+        "Receiving Stablecoin": payments["Receiving Stablecoin"].astype("string"),
+        "Priority": payments["Priority"].astype("string") if "Priority" in payments.columns else "Standard",
+    }, index=payments.index)
+    batch["Priority"] = batch["Priority"].fillna("Standard")
+    fx_rates = get_fx_rates(batch["Sending Stablecoin"], batch["Receiving Stablecoin"], timestamp)
+
+    # Checked in order; a row is reported against the first rule it fails
+    checks = [
+        (batch["Sending Institution"].fillna("").eq("").to_numpy(), "Sending Institution name is required."),
+        (batch["Receiving Institution"].fillna("").eq("").to_numpy(), "Receiving Institution name is required."),
+        (~batch["Amount Sent"].ge(MIN_PAYMENT_AMOUNT).to_numpy(dtype=bool, na_value=False), f"Amount Sent must be a number of at least {MIN_PAYMENT_AMOUNT}."),
+        (~batch["Corridor"].isin(SUPPORTED_CORRIDORS).to_numpy(dtype=bool, na_value=False), "Invalid Corridor."),
+        (~batch["Sending Stablecoin"].isin(SUPPORTED_STABLECOINS).to_numpy(dtype=bool, na_value=False), "Invalid Sending Stablecoin."),
+        (~batch["Receiving Stablecoin"].isin(SUPPORTED_STABLECOINS).to_numpy(dtype=bool, na_value=False), "Invalid Receiving Stablecoin."),
+        (np.isnan(fx_rates), "No FX rate available for the stablecoin pair."),
+        (~batch["Priority"].isin(TRANSACTION_PRIORITIES).to_numpy(dtype=bool, na_value=False), "Invalid Priority."),
+    ]
+    conditions = [condition for condition, _ in checks]
+    errors = np.select(conditions, [message for _, message in checks], default="")
+    invalid = errors != ""
+
+    valid = batch[~invalid].copy()
+    valid["FX Rate"] = fx_rates[~invalid]
+    rejected = payments[invalid].copy()
+    rejected["Error"] = errors[invalid]
+    return valid, rejected
+
+
+def settle_payment_batch(valid_payments, timestamp=None):
+    """Computes fees, FX conversion and received amounts for validated payments as column operations.
+
+    Returns a DataFrame with the ledger columns, ready for LedgerStore.extend.
+    """
+    count = len(valid_payments)
+    timestamp = timestamp or datetime.datetime.now()
+    amounts = valid_payments["Amount Sent"].to_numpy(dtype=np.float64)
+    fees = calculate_fees(amounts, valid_payments["Priority"].to_numpy(dtype=object))
+    return pd.DataFrame({
+        "Transaction ID": generate_transaction_ids(count),
+        "Timestamp": np.full(count, np.datetime64(timestamp, "s")),
+        "Sending Institution": valid_payments["Sending Institution"].to_numpy(dtype=object),
+        "Receiving Institution": valid_payments["Receiving Institution"].to_numpy(dtype=object),
+        "Corridor": valid_payments["Corridor"].to_numpy(dtype=object),
+        "Amount Sent": amounts,
+        "Sending Stablecoin": valid_payments["Sending Stablecoin"].to_numpy(dtype=object),
+        "Amount Received": np.round(amounts * valid_payments["FX Rate"].to_numpy(), 2), # Round for display
+        "Receiving Stablecoin": valid_payments["Receiving Stablecoin"].to_numpy(dtype=object),
+        "Fee": np.round(fees, 4), # Round fee for display
+        "Priority": valid_payments["Priority"].to_numpy(dtype=object),
+        "Status": "Settled Instantly",
+    }, columns=LEDGER_COLUMNS)
+
+
+def ingest_payment_batch(payments, store, screening_index=None):
+    """Validates and settles a batch of payments, writing all settled entries to the ledger in one append.
+
+    With a `screening_index`, payments whose sending or receiving institution
+    matches the watchlist are rejected too (see screen_payments).
+    Returns (settled, rejected) DataFrames.
+    """
+    timestamp = datetime.datetime.now()
+    valid, rejected = validate_payment_batch(payments, timestamp)
+    if screening_index is not None and not valid.empty:
+        errors = screen_payments(valid, screening_index)
+        blocked = errors != ""
+        rejected = pd.concat([rejected, payments.loc[valid.index[blocked]].assign(Error=errors[blocked])]).sort_index()
+        valid = valid[~blocked]
+    settled = settle_payment_batch(valid, timestamp)
+    store.extend(settled)
+    return settled, rejected
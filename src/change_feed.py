@@ -0,0 +1,47 @@
+import threading
+
+
+class ChangeFeed:
+    """Change counters of the shared ledger and liquidity stores, for sessions to poll or wait on.
+
+    Follows the stores through their listeners: every ledger append and
+    liquidity update advances its topic ("ledger", "liquidity") by the rows or
+    points written and wakes the threads blocked in `wait`. A session keeps
+    the counters of the state it last drew and asks what changed `since`
+    then, without reading the stores. Nothing here depends on Streamlit.
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._changed = threading.Condition()
+
+    def publish(self, topic, count=1):
+        """Records `count` changes to a topic and wakes the waiters."""
+        with self._changed:
+            self._counters[topic] = self._counters.get(topic, 0) + count
+            self._changed.notify_all()
+
+    def counters(self):
+        """Returns the current counter of every topic."""
+        with self._changed:
+            return dict(self._counters)
+
+    def since(self, seen):
+        """Returns the changes per topic after the `seen` counters (topics without changes are left out)."""
+        with self._changed:
+            return {topic: count - seen.get(topic, 0) for topic, count in self._counters.items() if count > seen.get(topic, 0)}
+
+    def wait(self, seen, timeout=None):
+        """Blocks until a topic moves past the `seen` counters; returns `since(seen)` ({} on timeout)."""
+        with self._changed:
+            self._changed.wait_for(lambda: any(count > seen.get(topic, 0) for topic, count in self._counters.items()), timeout)
+            return self.since(seen)
+
+    def watch_ledger(self, store, topic="ledger"):
+        """Counts the rows appended to a LedgerStore."""
+        store.add_listener(lambda store, start, stop: self.publish(topic, stop - start))
+
+    def watch_liquidity(self, store, topic="liquidity"):
+        """Counts the points appended to a LiquidityStore (a whole `append_many` batch at once)."""
+        store.add_listener(lambda store, key, timestamps, values: self.publish(topic, len(values)),
+                           lambda store, keys, rows, timestamps, values: self.publish(topic, len(values)))
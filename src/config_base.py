@@ -1,6 +1,8 @@
 import datetime
+import os
 import pandas as pd
 import numpy as np
+from src.liquidity_generator import liquidity_triplets, generate_liquidity_history
 
 # Define a mapping of Institutions, Stablecoins, and relevant Corridors
 # **Restricted to EUR-NGN and USD-MXN, and USDC/EURC as requested**
@@ -41,67 +43,41 @@ base_positions_and_trends = {
 }
 
 # Dummy Liquidity Data (Initial 30 days - Simulated)
-def generate_initial_liquidity_data(start_date, num_days=30):
-    data = []
-    institutions = list(institution_stablecoin_corridors.keys())
-
-
-    date_range = [start_date - datetime.timedelta(days=i) for i in range(num_days -1, -1, -1)]
-    date_range.sort() # Ensure dates are in ascending order
-
-    for date in date_range:
-        for inst in institutions:
-            for coin in institution_stablecoin_corridors.get(inst, {}).keys():
-                corridors_for_pair = institution_stablecoin_corridors[inst][coin]
-                for corr in corridors_for_pair:
-                    # Get base, trend, and volatility for the specific institution-stablecoin-corridor triplet
-                    pos_config = base_positions_and_trends.get((inst, coin, corr), {"base": 0, "trend_per_day": 0, "volatility": 1000})
-                    base = pos_config["base"]
-                    trend_per_day = pos_config["trend_per_day"]
-                    volatility = pos_config["volatility"]
-
-                    # Calculate position based on base, trend, and days from the start of the 30-day period
-                    days_index = (date - date_range[0]).days
-
-                    trend_component = trend_per_day * days_index
-
-                    # Add random fluctuation based on volatility
-                    fluctuation = np.random.normal(0, volatility)
-
-                    net_position = base + trend_component + fluctuation
-
-                    data.append({
-                        "Timestamp": date,
-                        "Institution": inst,
-                        "Corridor": corr,
-                        "Stablecoin": coin,
-                        "Net Position": round(net_position, 2)
-                    })
-
-    df = pd.DataFrame(data)
+def generate_initial_liquidity_data(start_date, num_days=30, seed=None):
+    """Generates `num_days` of daily net positions per triplet, ending on `start_date`.
+
+    The panel is built with NumPy broadcasting (see src/liquidity_generator.py);
+    pass `seed` for a reproducible history.
+    """
+    triplets = liquidity_triplets(institution_stablecoin_corridors, base_positions_and_trends)
+    df = generate_liquidity_history(start_date, num_days, triplets, seed=seed)
+    for name in ["Institution", "Corridor", "Stablecoin"]:
+        df[name] = df[name].astype(object)
     df['Timestamp'] = pd.to_datetime(df['Timestamp']).dt.date # Keep only date for plotting historical
 
     return df
 
 # Generate a new liquidity point, attempting to continue a recent trend
 # Updated to pass volatility for more realistic new point generation
-def generate_new_liquidity_point(last_position, historical_data_series, institution, corridor, stablecoin):
-    """Generates a single new data point simulating real-time flow, projecting from recent trend."""
+def generate_new_liquidity_point(last_position, historical_data_series, institution, corridor, stablecoin, average_change=None):
+    """Generates a single new data point simulating real-time flow, projecting from recent trend.
+
+    `average_change` is the series' current daily trend when it is already known
+    (e.g. from its online estimators); otherwise it is estimated from `historical_data_series`.
+    """
     timestamp = datetime.datetime.now()
 
     # Find the relevant volatility from the initial config for this triplet
-    volatility = 1000 # Default volatility if not found
-    for (inst, coin, corr), config in base_positions_and_trends.items():
-        if inst == institution and coin == stablecoin and corr == corridor:
-            volatility = config["volatility"]
-            break
+    config = base_positions_and_trends.get((institution, stablecoin, corridor))
+    volatility = config["volatility"] if config is not None else 1000 # Default volatility if not found
 
-    # Calculate recent average daily change from historical data (e.g., last 7 days)
-    recent_data = historical_data_series.tail(7)
-    if len(recent_data) > 1:
-        average_change = (recent_data.iloc[-1] - recent_data.iloc[0]) / (len(recent_data) - 1)
-    else:
-        average_change = 0 # No change if less than 2 points
+    if average_change is None:
+        # Calculate recent average daily change from historical data (e.g., last 7 days)
+        recent_data = historical_data_series.tail(7)
+        if len(recent_data) > 1:
+            average_change = (recent_data.iloc[-1] - recent_data.iloc[0]) / (len(recent_data) - 1)
+        else:
+            average_change = 0 # No change if less than 2 points
 
 
     # Project position based on last position and average recent change, plus some noise
@@ -123,29 +99,6 @@ def generate_new_liquidity_point(last_position, historical_data_series, institut
     }
 
 
-# Mock Compliance Alerts (Keep existing)
-mock_compliance_alerts = [
-    {"Alert ID": "ALERT001", "Timestamp": datetime.datetime.now() - datetime.timedelta(days=2), "Institution": "FinTech A", "Details": "High-value transaction (1M USDC) flagged for review in USD-MXN corridor.", "Status": "Pending"},
-    {"Alert ID": "ALERT002", "Timestamp": datetime.datetime.now() - datetime.timedelta(days=1), "Institution": "PSP Alpha", "Details": "Multiple small transactions from new counterparty in EUR-NGN corridor.", "Status": "Reviewed"},
-    {"Alert ID": "ALERT003", "Timestamp": datetime.datetime.now() - datetime.timedelta(hours=5), "Institution": "Bank B Mexico", "Details": "Unusual transaction pattern detected in EUR-USD corridor.", "Status": "Pending"},
-]
-
-# Dummy transaction volume data per corridor for the last 7 days
-# Restricted to EUR-NGN and USD-MXN
-dummy_volume_data = {
-    "USD-MXN": [50, 60, 45, 70, 55, 80, 65],
-    "EUR-NGN": [30, 35, 28, 40, 33, 45, 38],
-    # Removed other corridors
-}
-
-# Dummy institution activity data for each corridor
-# Restricted to EUR-NGN and USD-MXN
-dummy_institution_activity = {
-    "USD-MXN": {"FinTech A": 40, "PSP Alpha": 30, "Bank B Mexico": 20, "Others": 10},
-    "EUR-NGN": {"FinTech Omega Nigeria": 50, "Bank B Mexico": 25, "PSP Alpha": 15, "Others": 10},
-    # Removed other corridors
-}
-
 # Mock FX Rates (Ensured only USDC and EURC pairs are here)
 FX_RATES = {
     ("EURC", "USDC"): 1.08,
@@ -153,4 +106,55 @@ FX_RATES = {
     ("USDC", "USDC"): 1.00,
     ("EURC", "EURC"): 1.00,
     # Removed SGDC and GBP rates
-}
\ No newline at end of file
+}
+
+# Allowed values for payment fields (used by the payment form and batch ingestion)
+SUPPORTED_STABLECOINS = ["USDC", "EURC"]
+SUPPORTED_CORRIDORS = ["USD-MXN", "EUR-NGN"]
+TRANSACTION_PRIORITIES = ["Standard", "High Priority"]
+
+# AML rules evaluated on every ledger entry (see src/aml_rules.py)
+AML_VELOCITY_LIMIT = 200 # More payments than this from one institution within the window raise an alert
+AML_VELOCITY_WINDOW_SECONDS = 3600
+AML_REPORTING_THRESHOLD = 10000 # Payments just under it count towards structuring
+AML_STRUCTURING_MARGIN = 0.10 # "Just under": within 10% below the reporting threshold
+AML_STRUCTURING_LIMIT = 3 # More such payments than this from one institution within the window raise an alert
+AML_STRUCTURING_WINDOW_SECONDS = 86400
+AML_LARGE_VALUE_THRESHOLDS = {"USD-MXN": 1000000, "EUR-NGN": 250000} # Single payments from this amount are flagged
+AML_LARGE_VALUE_DEFAULT = 1000000 # For corridors not listed above
+AML_NEW_COUNTERPARTY_LIMIT = 5 # More first-time counterparties than this for one institution within the window raise an alert
+AML_NEW_COUNTERPARTY_WINDOW_SECONDS = 3600
+
+# Sanctions / counterparty name screening (see src/sanctions_screening.py)
+SANCTIONS_WATCHLIST_PATH = os.environ.get("STABLENET_WATCHLIST_PATH", os.path.join("data", "watchlist.csv"))
+SANCTIONS_EDIT_RATIO = 0.15 # Edits tolerated per character of a normalized name (must stay below 1/4, see GRAM)
+SANCTIONS_MAX_EDITS = 2 # Whatever the name's length
+SANCTIONS_NAME_STOPWORDS = ("ltd", "limited", "inc", "llc", "plc", "sa", "co", "corp", "corporation", "incorporated", "company", "the") # Legal forms ignored when matching
+
+COMPLIANCE_ROLLUP_BUCKET_SECONDS = 3600 # Hourly rollup cells behind the Compliance tab charts (days are merged from them)
+
+# Directory holding the durable ledger (write-ahead log + sealed segments)
+LEDGER_DATA_DIR = os.environ.get("STABLENET_LEDGER_DIR", os.path.join("data", "ledger"))
+
+# Liquidity thresholds used by forecasts and recommendations
+LIQUIDITY_SHORTFALL_THRESHOLD = -10000
+LIQUIDITY_SURPLUS_THRESHOLD = 50000
+LIQUIDITY_ALERT_PROBABILITY = 0.5 # Monte Carlo probability from which a crossing is flagged
+# Per-institution overrides of the (shortfall, surplus) thresholds above
+LIQUIDITY_INSTITUTION_THRESHOLDS = {
+    "Bank B Mexico": (-25000, 100000), # Larger balance sheet: wider band
+    "FinTech Omega Nigeria": (-5000, 30000),
+}
+LIQUIDITY_SCAN_INTERVAL_SECONDS = 60 # Minimum time between early-warning scans of all series
+STRESS_OUTFLOW_HAIRCUT = 0.20 # "Simulate Stress Scenario": 20% increased outflows
+# Stress pack grid: every combination of these is one scenario
+STRESS_OUTFLOW_SHOCKS = (0.0, 0.10, 0.20, 0.40) # Share of each position lost to increased outflows
+STRESS_VOLATILITY_MULTIPLIERS = (1.0, 1.5, 2.5)
+STRESS_FX_SHOCKS = ({}, {("EURC", "USDC"): -0.10}, {("EURC", "USDC"): 0.10}) # Relative moves of FX_RATES quotes
+STRESS_CORRIDOR_SHUTDOWNS = ((), ("USD-MXN",), ("EUR-NGN",)) # Corridors whose positive balances are trapped
+STRESS_REPORTING_CURRENCY = "USDC" # Institution totals are converted into this currency
+STRESS_CONFIDENCE = 0.95 # Worst case = 5th percentile; breach day = first day with a 5% breach probability
+
+def liquidity_thresholds(institution):
+    """Returns the (shortfall, surplus) thresholds of an institution."""
+    return LIQUIDITY_INSTITUTION_THRESHOLDS.get(institution, (LIQUIDITY_SHORTFALL_THRESHOLD, LIQUIDITY_SURPLUS_THRESHOLD))
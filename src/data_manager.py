@@ -1,66 +1,139 @@
+import os
 import streamlit as st
 import pandas as pd
 import datetime
-from src.config_base import generate_initial_liquidity_data, generate_new_liquidity_point
+from src.config_base import generate_initial_liquidity_data, generate_new_liquidity_point, LEDGER_DATA_DIR, COMPLIANCE_ROLLUP_BUCKET_SECONDS, SANCTIONS_WATCHLIST_PATH
+from src.ledger_store import LedgerStore
+from src.ledger_chain import LedgerChain
+from src.ledger_persistence import LedgerPersistence
+from src.ledger_index import LedgerIndex
+from src.ledger_rollups import LedgerRollup
+from src.aml_rules import AMLRuleEngine
+from src.sanctions_screening import ScreeningIndex
+from src.settlement_engine import SettlementEngine
+from src.liquidity_store import LiquidityStore
+from src.forecast_cache import ForecastCache
+from src.liquidity_estimators import OnlineTrendEstimators
+from src.liquidity_scanner import LiquidityScanner
+from src.liquidity_ticker import LiquidityTicker
+from src.change_feed import ChangeFeed
+
+@st.cache_resource
+def open_persistent_ledger(directory=LEDGER_DATA_DIR):
+    """Opens the durable ledger once per process: maps sealed segments and replays the WAL tail.
+
+    Returns the ledger components keyed by their session state names.
+    """
+    store = LedgerStore()
+    chain = LedgerChain(chunk_nodes=store.chunk_rows) # Hash-chains every entry into Merkle-rooted blocks
+    persistence = LedgerPersistence(directory)
+    persistence.open(store, chain)
+    return {
+        'ledger_store': store,
+        'ledger_chain': chain,
+        'ledger_persistence': persistence,
+        'ledger_index': LedgerIndex(store), # Institution / corridor / time indexes for the Ledger tab filters
+        'ledger_rollup': LedgerRollup(store), # Daily running totals for the Ledger tab metrics
+        'compliance_rollup': LedgerRollup(store, bucket_seconds=COMPLIANCE_ROLLUP_BUCKET_SECONDS), # Hourly totals for the Compliance tab charts
+        # Streaming AML rules over every new entry, for the Compliance tab; sealed rows' pairs come from their segments
+        'aml_engine': AMLRuleEngine(store, known_pairs=persistence.counterparty_pairs(), known_rows=persistence.sealed_rows),
+    }
+
+@st.cache_resource
+def load_screening_index(path=SANCTIONS_WATCHLIST_PATH):
+    """Builds the sanctions screening index once per process from the local watchlist file (None if there is no file)."""
+    if not os.path.exists(path):
+        return None
+    return ScreeningIndex.from_file(path)
+
+@st.cache_resource
+def start_settlement_engine():
+    """One settlement engine per process, settling every session's payments into the shared ledger."""
+    return SettlementEngine(on_settled=open_persistent_ledger()['ledger_store'].append)
+
+@st.cache_resource
+def open_liquidity_state():
+    """Generates the 30-day liquidity panel once per process.
+
+    Returns the liquidity components keyed by their session state names; every
+    session reads and updates the same series, estimators, scanner, ticker and
+    forecast cache instead of its own copy.
+    """
+    store = LiquidityStore() # One ring buffer per (institution, stablecoin, corridor) series
+    store.extend(generate_initial_liquidity_data(datetime.date.today(), num_days=30))
+    estimators = OnlineTrendEstimators(store) # Running trend / volatility sums per series, updated by the store on every append
+    return {
+        'liquidity_store': store,
+        'liquidity_estimators': estimators,
+        'liquidity_scanner': LiquidityScanner(store, estimators), # Early-warning scan of every series against the per-institution thresholds
+        'liquidity_ticker': LiquidityTicker(store), # Background tick simulator, started from the Live Feed of the Liquidity tab
+        'forecast_cache': ForecastCache(), # Forecasts keyed by series version: a refresh only invalidates the refreshed series
+    }
+
+@st.cache_resource
+def open_change_feed():
+    """Change counters of the shared ledger and liquidity stores, polled by each session's change notice."""
+    feed = ChangeFeed()
+    feed.watch_ledger(open_persistent_ledger()['ledger_store'])
+    feed.watch_liquidity(open_liquidity_state()['liquidity_store'])
+    return feed
 
 def initialize_session_state():
     """Initializes Streamlit session state variables."""
-    if 'transactions' not in st.session_state:
-        st.session_state['transactions'] = pd.DataFrame(columns=[
-            "Transaction ID", "Timestamp", "Sending Institution", "Receiving Institution",
-            "Corridor", "Amount Sent", "Sending Stablecoin", "Amount Received",
-            "Receiving Stablecoin", "Fee", "Priority", "Status"
-        ])
+    if 'ledger_store' not in st.session_state:
+        # The ledger lives on disk, so all sessions of this process share one store
+        st.session_state.update(open_persistent_ledger())
+
+    if 'screening_index' not in st.session_state:
+        # Fuzzy name index over the watchlist, screening both parties of every payment
+        st.session_state['screening_index'] = load_screening_index()
+
+    if 'settlement_engine' not in st.session_state:
+        # Settled payments are appended to the ledger from the engine's background thread
+        st.session_state['settlement_engine'] = start_settlement_engine()
 
     if 'dark_mode' not in st.session_state:
         st.session_state['dark_mode'] = False
 
-    # Initialize liquidity data if not exists
-    if 'liquidity_data' not in st.session_state:
-        today = datetime.date.today()
-        st.session_state['liquidity_data'] = generate_initial_liquidity_data(today, num_days=30)
-        # Ensure Timestamp is datetime
-        st.session_state['liquidity_data']['Timestamp'] = pd.to_datetime(st.session_state['liquidity_data']['Timestamp'])
-        st.cache_data.clear() # Clear cache on initial load
+    if 'liquidity_store' not in st.session_state:
+        # Shared by all sessions of this process, like the ledger
+        st.session_state.update(open_liquidity_state())
+
+    if 'change_feed' not in st.session_state:
+        st.session_state['change_feed'] = open_change_feed()
+    # Counters of the shared state drawn by this run, compared by the sidebar's change notice
+    st.session_state['seen_changes'] = st.session_state['change_feed'].counters()
 
 def refresh_liquidity_data(institution, corridor, stablecoin):
     """Simulates real-time data update for liquidity."""
     if institution and stablecoin and corridor:
         with st.spinner("Processing real-time data update..."):
-            # Filter data for the selected institution, corridor, and stablecoin
-            filtered_data_series = st.session_state['liquidity_data'][
-                (st.session_state['liquidity_data']['Institution'] == institution) &
-                (st.session_state['liquidity_data']['Corridor'] == corridor) &
-                (st.session_state['liquidity_data']['Stablecoin'] == stablecoin)
-            ].sort_values(by='Timestamp').set_index('Timestamp')['Net Position']
-
-            if not filtered_data_series.empty:
-                last_position = filtered_data_series.iloc[-1]
-                # Pass the historical data series to generate_new_liquidity_point to inform its trend/volatility
-                new_point = generate_new_liquidity_point(
-                    last_position,
-                    filtered_data_series, # Pass historical data
-                    institution,
-                    corridor,
-                    stablecoin
-                    )
-                new_point_df = pd.DataFrame([new_point])
-
-                # Ensure Timestamp is datetime before concatenation
-                new_point_df['Timestamp'] = pd.to_datetime(new_point_df['Timestamp'])
-                st.session_state['liquidity_data']['Timestamp'] = pd.to_datetime(st.session_state['liquidity_data']['Timestamp'])
-
-
-                # Append new point and update session state
-                st.session_state['liquidity_data'] = pd.concat([st.session_state['liquidity_data'], new_point_df], ignore_index=True)
-
-                # Limit data size (e.g., keep last 1000 rows total across all filters)
-                if len(st.session_state['liquidity_data']) > 1000:
-                     st.session_state['liquidity_data'] = st.session_state['liquidity_data'].tail(1000).reset_index(drop=True)
+            liquidity_store = st.session_state['liquidity_store']
+            series_key = (institution, stablecoin, corridor)
+            # Other sessions and the ticker write to the same series: read the last point and append as one write
+            with liquidity_store.lock:
+                last_position = liquidity_store.last(series_key)
+                if last_position is not None:
+                    # The trend comes from the series' online estimators: O(1), no window is read
+                    new_point = generate_new_liquidity_point(
+                        last_position,
+                        None,
+                        institution,
+                        corridor,
+                        stablecoin,
+                        average_change=st.session_state['liquidity_estimators'].trend(series_key)
+                        )
+
+                    # O(1) append; a full series evicts only its own oldest point
+                    liquidity_store.append(series_key, new_point['Timestamp'], new_point['Net Position'])
 
+            if last_position is not None:
                 st.success("Simulated real-time data updated!")
-                st.cache_data.clear() # Clear cache to re-calculate forecast with new data
+                # Free this series' outdated forecasts; other series keep theirs
+                st.session_state['forecast_cache'].invalidate(series_key, keep_version=liquidity_store.version(series_key))
+                st.session_state['forecast_cache'].invalidate("portfolio") # Covers every series
+                st.session_state['forecast_cache'].invalidate("stress")
             else:
                 st.warning("Cannot refresh data: No historical data found for the selected parameters.")
     else:
-        st.warning("Please select Institution, Stablecoin, and Corridor to refresh data.") 
\ No newline at end of file
+        st.warning("Please select Institution, Stablecoin, and Corridor to refresh data.")
@@ -0,0 +1,88 @@
+import collections
+import sys
+import threading
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_BYTES = 64 << 20
+
+
+def estimate_nbytes(value):
+    """Approximate memory held by a cached forecast (arrays, pandas objects and containers of them)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+class ForecastCache:
+    """LRU cache of forecasts keyed by (series key, series version, params), within a memory budget.
+
+    The series version changes whenever that series gets a new point, so a
+    refresh only makes the affected series' entries unreachable (they are
+    dropped by `invalidate` or age out), and the key is hashed from a few
+    small values instead of the input data. Entries are evicted least
+    recently used first once their estimated size exceeds `max_bytes`.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict() # Cache key -> (value, size), least recently used first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, series_key, version, params, compute):
+        """Returns the cached forecast for the key, or calls `compute()` and caches its result."""
+        key = (series_key, version, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        value = compute() # Outside the lock: forecasts may take a while
+        size = estimate_nbytes(value)
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self.nbytes += size
+                self._evict()
+        return value
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.nbytes -= size
+            self.evictions += 1
+
+    def invalidate(self, series_key, keep_version=None):
+        """Drops a series' entries (except those of `keep_version`); returns how many were dropped."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == series_key and key[1] != keep_version]
+            for key in stale:
+                self.nbytes -= self._entries.pop(key)[1]
+            return len(stale)
+
+    def stats(self):
+        """Returns the hit, miss and eviction counters with the entry count and memory use."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries), "bytes": self.nbytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
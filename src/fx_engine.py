@@ -0,0 +1,135 @@
+import threading
+import numpy as np
+import pandas as pd
+
+EARLIEST_RATE_TIME = np.datetime64("1970-01-01T00:00:00", "s") # Effective time of a seed snapshot
+
+
+def triangulate(quotes):
+    """Completes a currency matrix of quoted rates (NaN where unquoted) with derived cross rates.
+
+    Inverse quotes fill their mirror pair, then missing pairs are derived through
+    each currency in turn (rate[i, j] = rate[i, k] * rate[k, j]), so any pair
+    connected by a chain of quotes gets a rate. Quoted rates are never overridden.
+    """
+    rates = np.array(quotes, dtype=np.float64)
+    np.fill_diagonal(rates, 1.0)
+    rates = np.where(np.isnan(rates), 1.0 / rates.T, rates)
+    for pivot in range(len(rates)):
+        rates = np.where(np.isnan(rates), np.outer(rates[:, pivot], rates[pivot, :]), rates)
+    return rates
+
+
+class FXEngine:
+    """Versioned FX rates: snapshots over time, each a dense currency x currency matrix.
+
+    A snapshot publishes the quoted rates in force from its effective time until
+    the next snapshot. Cross rates are triangulated once per snapshot and cached;
+    lookups for whole columns of transactions map labels to currency codes and
+    timestamps to snapshots with NumPy, then gather from a stacked
+    (snapshot, sending, receiving) array. Pairs without a rate give NaN.
+    """
+
+    def __init__(self, currencies):
+        self.currencies = list(currencies)
+        self._codes = {currency: code for code, currency in enumerate(self.currencies)}
+        self._times = np.empty(0, dtype="datetime64[s]") # Effective time of each snapshot, ascending
+        self._quotes = [] # Quoted rate matrix of each snapshot
+        self._cross = [] # Triangulated matrix of each snapshot (None until first needed)
+        self._stack = None # Cross matrices in time order, NaN-padded past the last snapshot and in the last row/column
+        self._stacked_count = 0 # Snapshots already copied into the stack
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_rates(cls, rates, timestamp=EARLIEST_RATE_TIME):
+        """Creates an engine over the currencies of a {(sending, receiving): rate} table, seeded with it."""
+        engine = cls(sorted({currency for pair in rates for currency in pair}))
+        engine.publish(rates, timestamp)
+        return engine
+
+    def __len__(self):
+        return len(self._quotes)
+
+    def publish(self, rates, timestamp=None):
+        """Adds a snapshot of {(sending, receiving): rate} effective from `timestamp` (default: now).
+
+        Returns the snapshot's version number, i.e. its position in time order.
+        Currencies not known to the engine are rejected.
+        """
+        unknown = {currency for pair in rates for currency in pair} - set(self._codes)
+        if unknown:
+            raise ValueError(f"Unknown currencies: {', '.join(sorted(unknown))}.")
+        quotes = np.full((len(self.currencies), len(self.currencies)), np.nan)
+        for (sending, receiving), rate in rates.items():
+            quotes[self._codes[sending], self._codes[receiving]] = rate
+        timestamp = np.datetime64(timestamp if timestamp is not None else "now", "s")
+        with self._lock:
+            version = int(np.searchsorted(self._times, timestamp, side="right"))
+            self._times = np.insert(self._times, version, timestamp)
+            self._quotes.insert(version, quotes)
+            self._cross.insert(version, None)
+            if version < self._stacked_count:
+                self._stack, self._stacked_count = None, 0 # Back-dated snapshot: restack from scratch
+        return version
+
+    def _cross_matrix(self, version):
+        # Caller holds the lock
+        if self._cross[version] is None:
+            self._cross[version] = triangulate(self._quotes[version])
+        return self._cross[version]
+
+    def matrix(self, version=-1):
+        """Returns the triangulated cross-rate matrix of a snapshot (latest by default)."""
+        with self._lock:
+            return self._cross_matrix(version)
+
+    def _stacked(self):
+        with self._lock:
+            count = len(self.currencies)
+            if self._stack is None or len(self._stack) <= len(self):
+                # Grow geometrically so appending snapshots restacks in amortized O(1)
+                stack = np.full((2 * len(self) + 1, count + 1, count + 1), np.nan)
+                if self._stack is not None:
+                    stack[:self._stacked_count] = self._stack[:self._stacked_count]
+                self._stack = stack
+            for version in range(self._stacked_count, len(self)):
+                self._stack[version, :count, :count] = self._cross_matrix(version)
+            self._stacked_count = len(self)
+            return self._stack, self._times
+
+    def codes(self, currencies):
+        """Maps a column of currency labels to codes (-1 for unknown currencies)."""
+        return pd.Categorical(currencies, categories=self.currencies).codes
+
+    def rates(self, sending, receiving, timestamps=None):
+        """Vectorized rate lookup for columns of currency pairs, as of each timestamp.
+
+        `timestamps` may be a column, a single time, or None for the latest
+        snapshot. Returns a float64 array with NaN where no rate applies.
+        """
+        stack, times = self._stacked() # Consistent with each other even if a snapshot is published meanwhile
+        sending_codes, receiving_codes = self.codes(sending), self.codes(receiving)
+        if timestamps is None:
+            versions = len(times) - 1
+        else:
+            versions = np.searchsorted(times, np.asarray(timestamps, dtype="datetime64[s]"), side="right") - 1
+            versions = np.where(versions < 0, len(times), versions) # Before the first snapshot: NaN slab
+        return stack[versions, sending_codes, receiving_codes] # Code -1 indexes the NaN row/column
+
+    def rate(self, sending, receiving, timestamp=None):
+        """Rate of a single pair as of `timestamp` (latest by default); NaN when there is none."""
+        with self._lock:
+            if sending not in self._codes or receiving not in self._codes:
+                return np.nan
+            if timestamp is None:
+                version = len(self) - 1
+            else:
+                version = int(np.searchsorted(self._times, np.datetime64(timestamp, "s"), side="right")) - 1
+            if version < 0:
+                return np.nan
+            return float(self._cross_matrix(version)[self._codes[sending], self._codes[receiving]])
+
+    def revalue(self, amounts, currencies, target, timestamps=None):
+        """Converts a column of amounts in `currencies` into the `target` currency as of each timestamp."""
+        amounts = np.asarray(amounts, dtype=np.float64)
+        return amounts * self.rates(currencies, np.full(len(amounts), target, dtype=object), timestamps)
@@ -0,0 +1,262 @@
+import hashlib
+import struct
+import threading
+import numpy as np
+from src.ledger_store import LEDGER_COLUMNS, CATEGORY_VOCABULARIES, AMOUNT_COLUMNS, DEFAULT_CHUNK_ROWS
+
+HASH_SIZE = 32
+EMPTY_HASH = bytes(HASH_SIZE)
+BLOCK_LEVEL = 10
+BLOCK_ENTRIES = 1 << BLOCK_LEVEL # Entries per sealed Merkle block
+
+# Domain separation so leaves, inner nodes and block headers can never collide
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+_HEADER_PREFIX = b"\x02"
+
+# Entry payload layout: every field as a 4-byte little-endian length and its UTF-8 bytes,
+# so no field value can shift bytes into its neighbour. Bumped whenever the layout changes.
+PAYLOAD_ENCODING = 2
+_FIELD_LENGTH = struct.Struct("<I")
+
+
+def _sha256(data):
+    return hashlib.sha256(data).digest()
+
+
+def hash_leaf(previous_leaf, payload):
+    """Chains an entry to its predecessor: H(0x00 || previous leaf hash || entry payload)."""
+    return _sha256(_LEAF_PREFIX + previous_leaf + payload)
+
+
+def hash_node(left, right):
+    """Hashes two Merkle children into their parent."""
+    return _sha256(_NODE_PREFIX + left + right)
+
+
+def bag_peaks(peaks):
+    """Folds the peaks of the Merkle mountain range into a single root, right to left."""
+    if not peaks:
+        return EMPTY_HASH
+    root = peaks[-1]
+    for peak in reversed(peaks[:-1]):
+        root = hash_node(peak, root)
+    return root
+
+
+def peak_positions(size):
+    """Returns the (level, node index) of every peak for a ledger of `size` entries, left to right."""
+    positions = []
+    covered = 0
+    for level in range(size.bit_length() - 1, -1, -1):
+        if size >> level & 1:
+            positions.append((level, covered >> level))
+            covered += 1 << level
+    return positions
+
+
+def _encode_fields(values):
+    """Length-prefixed UTF-8 encoding of each field value."""
+    pack = _FIELD_LENGTH.pack
+    return [pack(len(value)) + value for value in map(str.encode, values)]
+
+
+def entry_payloads(store, start, stop):
+    """Canonical byte encoding of ledger rows [start, stop), one payload per row (see PAYLOAD_ENCODING)."""
+    columns = []
+    for name in LEDGER_COLUMNS:
+        values = store.column(name, start, stop)
+        if name in CATEGORY_VOCABULARIES:
+            # Encode each vocabulary value once and gather by code
+            fields = np.asarray(_encode_fields(store.vocabulary(name).values), dtype=object)
+            columns.append(fields[values])
+        elif name in AMOUNT_COLUMNS:
+            columns.append(_encode_fields(map(repr, values.tolist())))
+        else:
+            columns.append(_encode_fields(values.astype(str).tolist())) # Timestamps in ISO 8601
+    return [b"".join(row) for row in zip(*columns)]
+
+
+class _NodeLevel:
+    """One level of the Merkle tree, stored as fixed-size chunks of packed 32-byte hashes."""
+
+    def __init__(self, chunk_nodes):
+        self.chunk_nodes = chunk_nodes
+        self.chunks = []
+        self.size = 0
+
+    def append(self, digest):
+        offset = self.size % self.chunk_nodes
+        if offset == 0:
+            self.chunks.append(bytearray(self.chunk_nodes * HASH_SIZE))
+        self.chunks[-1][offset * HASH_SIZE:(offset + 1) * HASH_SIZE] = digest
+        self.size += 1
+
+    def adopt(self, chunk):
+        """Appends an already filled chunk of chunk_nodes hashes."""
+        if self.size % self.chunk_nodes:
+            raise ValueError("A full chunk can only be adopted at a chunk boundary.")
+        self.chunks.append(chunk)
+        self.size += self.chunk_nodes
+
+    def get(self, index):
+        chunk = self.chunks[index // self.chunk_nodes]
+        offset = index % self.chunk_nodes * HASH_SIZE
+        return bytes(chunk[offset:offset + HASH_SIZE])
+
+
+class LedgerChain:
+    """Hash chain and Merkle mountain range over the ledger entries.
+
+    Every entry's leaf hash commits to the previous leaf, and the leaves are the
+    bottom level of an append-only Merkle tree. Each run of BLOCK_ENTRIES leaves
+    forms a sealed block whose Merkle root is chained into a block header.
+    Appending touches at most log2(N) nodes, and inclusion proofs contain one
+    sibling per level plus the current peaks, so both are O(log N).
+    """
+
+    def __init__(self, chunk_nodes=DEFAULT_CHUNK_ROWS):
+        self.chunk_nodes = chunk_nodes
+        self._levels = []
+        self.block_headers = [] # One chained header per sealed block
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self._levels[0].size if self._levels else 0
+
+    @classmethod
+    def attach(cls, store):
+        """Creates a chain over `store` that hashes every entry appended from now on."""
+        return cls(chunk_nodes=store.chunk_rows).follow(store)
+
+    def follow(self, store):
+        """Hashes the store's entries not yet in the chain, then every later append."""
+        with store.lock:
+            if len(store) > len(self):
+                self._on_append(store, len(self), len(store))
+            store.add_listener(self._on_append)
+        return self
+
+    def _level(self, level):
+        while len(self._levels) <= level:
+            self._levels.append(_NodeLevel(max(1, self.chunk_nodes >> len(self._levels))))
+        return self._levels[level]
+
+    def _on_append(self, store, start, stop):
+        self.extend(entry_payloads(store, start, stop))
+
+    def extend(self, payloads):
+        """Chains and appends entry payloads, updating the Merkle tree incrementally."""
+        with self._lock:
+            leaves = self._level(0)
+            previous = leaves.get(leaves.size - 1) if leaves.size else EMPTY_HASH
+            for payload in payloads:
+                previous = hash_leaf(previous, payload)
+                self._append_leaf(previous)
+
+    def _append_leaf(self, leaf):
+        self._levels[0].append(leaf)
+        self._carry(0, self._levels[0].size - 1, leaf)
+
+    def _carry(self, level, index, node):
+        # `node` was just stored at `index` of `level`; hash it upwards while it completes a pair
+        while index & 1:
+            node = hash_node(self._levels[level].get(index - 1), node)
+            level += 1
+            index >>= 1
+            self._level(level).append(node)
+            if level == BLOCK_LEVEL and len(self.block_headers) == index:
+                previous_header = self.block_headers[-1] if self.block_headers else EMPTY_HASH
+                self.block_headers.append(_sha256(_HEADER_PREFIX + previous_header + node))
+
+    @property
+    def segment_level(self):
+        """Highest tree level whose chunks still cover exactly one store chunk (log2 of chunk_nodes)."""
+        return self.chunk_nodes.bit_length() - 1
+
+    def segment_chunks(self, segment):
+        """Returns the level chunks (levels 0..segment_level) covering store chunk `segment`."""
+        with self._lock:
+            return [self._levels[level].chunks[segment] for level in range(self.segment_level + 1)]
+
+    def replace_segment_chunks(self, segment, chunks):
+        """Swaps the level chunks of a sealed segment for equal-content ones (e.g. memory-mapped)."""
+        with self._lock:
+            for level, chunk in enumerate(chunks):
+                self._levels[level].chunks[segment] = chunk
+
+    def load_segment(self, chunks, block_headers, root):
+        """Adopts the stored levels of one full segment without rehashing its entries.
+
+        `chunks` are the level chunks 0..segment_level, `block_headers` the headers
+        sealed inside the segment and `root` its Merkle root.
+        """
+        with self._lock:
+            for level, chunk in enumerate(chunks):
+                self._level(level).adopt(chunk)
+            self.block_headers.extend(block_headers)
+            top = self.segment_level
+            self._carry(top, self._levels[top].size - 1, root)
+
+    def leaf(self, index):
+        """Returns the chained leaf hash of entry `index`."""
+        with self._lock:
+            return self._levels[0].get(index)
+
+    def peaks(self):
+        """Returns the current Merkle peaks, left to right."""
+        with self._lock:
+            return [self._levels[level].get(index) for level, index in peak_positions(len(self))]
+
+    def root(self):
+        """Returns the Merkle root committing to every entry so far."""
+        return bag_peaks(self.peaks())
+
+    def block_root(self, block):
+        """Returns the Merkle root of a sealed block."""
+        with self._lock:
+            return self._levels[BLOCK_LEVEL].get(block)
+
+    def inclusion_proof(self, index):
+        """Builds an O(log N) proof that entry `index` is part of the current root."""
+        with self._lock:
+            size = len(self)
+            if not 0 <= index < size:
+                raise IndexError(f"Entry {index} is not in a ledger of {size} entries.")
+            positions = peak_positions(size)
+            covered = 0
+            for peak_index, (level, _) in enumerate(positions):
+                if index < covered + (1 << level):
+                    break
+                covered += 1 << level
+            siblings = [self._levels[depth].get((index >> depth) ^ 1) for depth in range(level)]
+            return {
+                "index": index,
+                "size": size,
+                "leaf": self._levels[0].get(index),
+                "siblings": siblings,
+                "peak_index": peak_index,
+                "peaks": [self._levels[lvl].get(i) for lvl, i in positions],
+            }
+
+
+def verify_inclusion(proof, root):
+    """Checks an inclusion proof against a Merkle root in O(log N)."""
+    node, index = proof["leaf"], proof["index"]
+    for sibling in proof["siblings"]:
+        node = hash_node(sibling, node) if index & 1 else hash_node(node, sibling)
+        index >>= 1
+    peaks = proof["peaks"]
+    return node == peaks[proof["peak_index"]] and bag_peaks(peaks) == root
+
+
+def verify_append(previous_peaks, previous_size, payload, previous_leaf, new_root):
+    """Checks in O(log N) that `new_root` is the previous ledger plus exactly one entry with `payload`."""
+    node = hash_leaf(previous_leaf, payload)
+    peaks = list(previous_peaks)
+    index = previous_size
+    while index & 1: # Merge with the peaks the new leaf completes, as _append_leaf does
+        node = hash_node(peaks.pop(), node)
+        index >>= 1
+    peaks.append(node)
+    return bag_peaks(peaks) == new_root
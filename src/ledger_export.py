@@ -0,0 +1,115 @@
+import tempfile
+import time
+import numpy as np
+
+EXPORT_FORMATS = {
+    "CSV": {"extension": "csv", "mime": "text/csv"},
+    "Parquet": {"extension": "parquet", "mime": "application/vnd.apache.parquet"},
+}
+EXPORT_CHUNK_ROWS = 1 << 16
+SPOOL_MAX_BYTES = 8 << 20 # Exports larger than this are spooled to a temporary file
+
+
+class ExportStats:
+    """Bytes and wall time of one export, for reporting throughput."""
+
+    def __init__(self):
+        self.bytes = 0
+        self.rows = 0
+        self.seconds = 0.0
+
+    @property
+    def bytes_per_second(self):
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+
+class _ChunkSink:
+    """Minimal writable file that hands out what was written since the last drain."""
+
+    closed = False
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _row_batches(store, rows, chunk_rows):
+    if rows is None:
+        total = len(store)
+        for start in range(0, total, chunk_rows):
+            yield np.arange(start, min(start + chunk_rows, total))
+    else:
+        for start in range(0, len(rows), chunk_rows):
+            yield rows[start:start + chunk_rows]
+
+
+def iter_csv_chunks(store, rows=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yields the ledger (or the given row ids) as CSV, `chunk_rows` rows at a time."""
+    header = True
+    for batch in _row_batches(store, rows, chunk_rows):
+        yield store.to_dataframe(batch).to_csv(index=False, header=header).encode("utf-8")
+        header = False
+    if header: # Nothing exported: still emit the header line
+        yield store.to_dataframe(np.empty(0, dtype=np.int64)).to_csv(index=False).encode("utf-8")
+
+
+def iter_parquet_chunks(store, rows=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yields the ledger (or the given row ids) as Parquet bytes, one row group per chunk."""
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    writer = None
+    for batch in _row_batches(store, rows, chunk_rows):
+        table = store.to_arrow(batch)
+        if writer is None:
+            writer = pq.ParquetWriter(sink, table.schema)
+        writer.write_table(table)
+        yield sink.drain()
+    if writer is None:
+        writer = pq.ParquetWriter(sink, store.to_arrow(np.empty(0, dtype=np.int64)).schema)
+    writer.close()
+    yield sink.drain()
+
+
+def iter_export_chunks(store, export_format, rows=None, chunk_rows=EXPORT_CHUNK_ROWS, stats=None):
+    """Streams an export in the given EXPORT_FORMATS format, updating `stats` as chunks are produced."""
+    chunks = iter_parquet_chunks(store, rows, chunk_rows) if export_format == "Parquet" else iter_csv_chunks(store, rows, chunk_rows)
+    start = time.perf_counter()
+    for chunk in chunks:
+        if stats is not None:
+            stats.bytes += len(chunk)
+            stats.seconds = time.perf_counter() - start
+        yield chunk
+    if stats is not None:
+        stats.rows = len(store) if rows is None else len(rows)
+
+
+def export_to_file(store, export_format, rows=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Writes an export chunk by chunk into a spooled temporary file.
+
+    Only one chunk is held in memory at a time; the file stays in RAM up to
+    SPOOL_MAX_BYTES and moves to disk beyond that. Returns (file, stats) with the
+    file rewound for reading.
+    """
+    stats = ExportStats()
+    export_file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    for chunk in iter_export_chunks(store, export_format, rows, chunk_rows, stats):
+        export_file.write(chunk)
+    export_file.seek(0)
+    return export_file, stats
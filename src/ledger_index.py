@@ -0,0 +1,205 @@
+import numpy as np
+
+# Indexed columns; both institution sides share the institution vocabulary
+INDEXED_COLUMNS = ["Sending Institution", "Receiving Institution", "Corridor"]
+
+
+class _ChunkIndex:
+    """Inverted indexes, a sorted timestamp index and a Transaction ID order over one full store chunk.
+
+    Built once from the chunk's columns: postings are the chunk offsets grouped
+    by code (CSR layout), so they also work for sealed chunks that were
+    memory-mapped from disk instead of appended in this process.
+    """
+
+    def __init__(self, chunk):
+        self.postings = {}
+        for name in INDEXED_COLUMNS:
+            codes = np.asarray(chunk[name])
+            order = np.argsort(codes, kind="stable").astype(np.int32)
+            offsets = np.concatenate(([0], np.cumsum(np.bincount(codes))))
+            self.postings[name] = (order, offsets)
+        timestamps = np.asarray(chunk["Timestamp"])
+        self.time_order = np.argsort(timestamps, kind="stable").astype(np.int32)
+        self.sorted_times = timestamps[self.time_order]
+        # Sorter for binary searches in the chunk's own Transaction ID column (not copied)
+        self.transaction_ids = np.asarray(chunk["Transaction ID"])
+        self.transaction_order = np.argsort(self.transaction_ids, kind="stable").astype(np.int32)
+
+    def rows_for(self, name, codes):
+        order, offsets = self.postings[name]
+        parts = [order[offsets[code]:offsets[code + 1]] for code in codes if code + 1 < len(offsets)]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+
+    def time_bounds(self):
+        return self.sorted_times[0], self.sorted_times[-1]
+
+    def rows_between(self, start, end):
+        low = np.searchsorted(self.sorted_times, start, side="left") if start is not None else 0
+        high = np.searchsorted(self.sorted_times, end, side="right") if end is not None else len(self.sorted_times)
+        return self.time_order[low:high]
+
+    def offset_of(self, transaction_id):
+        position = np.searchsorted(self.transaction_ids, transaction_id, sorter=self.transaction_order)
+        if position < len(self.transaction_order) and self.transaction_ids[self.transaction_order[position]] == transaction_id:
+            return int(self.transaction_order[position])
+        return None
+
+
+class _ActiveChunkIndex:
+    """Postings of the chunk currently being filled, extended on every append."""
+
+    def __init__(self):
+        self.postings = {name: {} for name in INDEXED_COLUMNS}
+        self.transactions = {} # Transaction ID -> first offset
+        self.min_time = None
+        self.max_time = None
+
+    def add(self, columns, first_offset):
+        offsets = np.arange(first_offset, first_offset + len(columns["Timestamp"]), dtype=np.int32)
+        for name in INDEXED_COLUMNS:
+            codes = columns[name]
+            postings = self.postings[name]
+            if len(codes) == 1:
+                postings.setdefault(int(codes[0]), []).append(int(offsets[0]))
+                continue
+            for code in np.unique(codes):
+                postings.setdefault(int(code), []).extend(offsets[codes == code].tolist())
+        for transaction_id, offset in zip(columns["Transaction ID"].tolist(), offsets.tolist()):
+            self.transactions.setdefault(transaction_id, offset)
+        timestamps = columns["Timestamp"]
+        low, high = timestamps.min(), timestamps.max()
+        self.min_time = low if self.min_time is None else min(self.min_time, low)
+        self.max_time = high if self.max_time is None else max(self.max_time, high)
+
+    def rows_for(self, name, codes):
+        postings = self.postings[name]
+        parts = [postings[code] for code in codes if code in postings]
+        return np.fromiter((offset for part in parts for offset in part), dtype=np.int32) if parts else np.empty(0, dtype=np.int32)
+
+    def time_bounds(self):
+        return self.min_time, self.max_time
+
+    def offset_of(self, transaction_id):
+        return self.transactions.get(transaction_id)
+
+
+class LedgerIndex:
+    """Secondary indexes over a LedgerStore for the Ledger tab filters.
+
+    Maintains institution -> rows (sending and receiving side), corridor -> rows,
+    a sorted timestamp index and a Transaction ID lookup per store chunk. The
+    chunk being filled is indexed incrementally on each append and as a whole
+    once it fills; chunks loaded from disk are indexed by the first query
+    reaching them. A query visits each chunk's postings instead of scanning
+    columns, and skips chunks outside the time range.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._sealed = {} # Chunk number -> _ChunkIndex of a full chunk
+        self._active = _ActiveChunkIndex()
+        self._active_chunk = len(store) // store.chunk_rows
+        with store.lock:
+            if len(store) % store.chunk_rows:
+                start = self._active_chunk * store.chunk_rows
+                self._on_append(store, start, len(store))
+            store.add_listener(self._on_append)
+
+    def _on_append(self, store, start, stop):
+        chunk_rows = store.chunk_rows
+        while start < stop:
+            chunk_number = start // chunk_rows
+            piece_stop = min(stop, (chunk_number + 1) * chunk_rows)
+            if chunk_number != self._active_chunk:
+                self._active, self._active_chunk = _ActiveChunkIndex(), chunk_number
+            if piece_stop % chunk_rows == 0:
+                # The chunk is full now: index it as a whole (amortized over its rows)
+                self._sealed[chunk_number] = _ChunkIndex(store.chunk(chunk_number))
+                self._active, self._active_chunk = _ActiveChunkIndex(), chunk_number + 1
+            else:
+                columns = {name: store.column(name, start, piece_stop) for name in INDEXED_COLUMNS + ["Timestamp", "Transaction ID"]}
+                self._active.add(columns, start - chunk_number * chunk_rows)
+            start = piece_stop
+
+    def _chunk_index(self, chunk_number):
+        if chunk_number == self._active_chunk:
+            return self._active
+        index = self._sealed.get(chunk_number)
+        if index is None:
+            index = self._sealed[chunk_number] = _ChunkIndex(self.store.chunk(chunk_number))
+        return index
+
+    def time_bounds(self):
+        """Returns the earliest and latest Timestamp in the ledger (None, None when empty)."""
+        with self.store.lock:
+            bounds = [self._chunk_index(number).time_bounds() for number in range(self._chunk_count())]
+            bounds = [bound for bound in bounds if bound[0] is not None]
+            if not bounds:
+                return None, None
+            return min(low for low, _ in bounds), max(high for _, high in bounds)
+
+    def _chunk_count(self):
+        return -(-len(self.store) // self.store.chunk_rows)
+
+    def find(self, transaction_id):
+        """Returns the row id of a Transaction ID (its first entry), or None if it is not in the ledger.
+
+        One binary search per sealed chunk and a dict lookup in the chunk being filled.
+        """
+        store = self.store
+        with store.lock:
+            for number in range(self._chunk_count()):
+                offset = self._chunk_index(number).offset_of(transaction_id)
+                if offset is not None:
+                    return number * store.chunk_rows + offset
+            return None
+
+    def query(self, institutions=None, corridors=None, start=None, end=None):
+        """Returns the sorted row ids matching every given filter.
+
+        `institutions` match either side of a payment, `corridors` any listed
+        corridor, and `start` / `end` bound the Timestamp inclusively.
+        Returns None when no filter is given (i.e. all rows).
+        """
+        if not institutions and not corridors and start is None and end is None:
+            return None
+        store = self.store
+        start = np.datetime64(start, "s") if start is not None else None
+        end = np.datetime64(end, "s") if end is not None else None
+        with store.lock:
+            institution_codes = store.vocabulary("Sending Institution").lookup(institutions or [])
+            corridor_codes = store.vocabulary("Corridor").lookup(corridors or [])
+            if (institutions and not institution_codes) or (corridors and not corridor_codes):
+                return np.empty(0, dtype=np.int64)
+
+            matches = []
+            for number in range(self._chunk_count()):
+                index = self._chunk_index(number)
+                filled = min(store.chunk_rows, len(store) - number * store.chunk_rows)
+                low, high = index.time_bounds()
+                if (start is not None and high < start) or (end is not None and low > end):
+                    continue
+                mask = np.ones(filled, dtype=bool)
+                if institutions:
+                    mask[:] = False
+                    mask[index.rows_for("Sending Institution", institution_codes)] = True
+                    mask[index.rows_for("Receiving Institution", institution_codes)] = True
+                if corridors:
+                    corridor_mask = np.zeros(filled, dtype=bool)
+                    corridor_mask[index.rows_for("Corridor", corridor_codes)] = True
+                    mask &= corridor_mask
+                if (start is not None and low < start) or (end is not None and high > end):
+                    if isinstance(index, _ChunkIndex):
+                        time_mask = np.zeros(filled, dtype=bool)
+                        time_mask[index.rows_between(start, end)] = True
+                    else:
+                        timestamps = store.column("Timestamp", number * store.chunk_rows, number * store.chunk_rows + filled)
+                        time_mask = np.ones(filled, dtype=bool)
+                        if start is not None:
+                            time_mask &= timestamps >= start
+                        if end is not None:
+                            time_mask &= timestamps <= end
+                    mask &= time_mask
+                matches.append(np.flatnonzero(mask) + number * store.chunk_rows)
+            return np.concatenate(matches) if matches else np.empty(0, dtype=np.int64)
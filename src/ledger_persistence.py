@@ -0,0 +1,341 @@
+import json
+import os
+import struct
+import zlib
+import numpy as np
+from src.ledger_store import LEDGER_COLUMNS, CATEGORY_VOCABULARIES, column_dtype, counterparty_pairs
+from src.ledger_chain import HASH_SIZE, BLOCK_ENTRIES, PAYLOAD_ENCODING
+
+MANIFEST_FILE = "manifest.json"
+WAL_FILE = "wal.log"
+SEGMENTS_DIR = "segments"
+SEGMENT_COLUMNS_FILE = "columns.bin"
+SEGMENT_MERKLE_FILE = "merkle.bin"
+SEGMENT_PAIRS_FILE = "pairs.bin" # Distinct (sender, receiver) pairs of the segment, for the AML rules
+
+_WAL_MAGIC = b"SNWL"
+_WAL_RECORD_HEADER = struct.Struct("<4sIQI") # magic, header length, body length, CRC32 of header + body
+
+
+def _write_atomic(path, data, sync):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(data)
+        handle.flush()
+        if sync:
+            os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def _column_layout(chunk_rows):
+    """Byte offset and dtype of every ledger column inside a segment's columns.bin."""
+    layout, offset = {}, 0
+    for name in LEDGER_COLUMNS:
+        dtype = column_dtype(name)
+        layout[name] = (offset, dtype)
+        offset += chunk_rows * dtype.itemsize
+    return layout
+
+
+def _merkle_layout(chunk_rows):
+    """Byte ranges of Merkle levels 0..log2(chunk_rows) inside a segment's merkle.bin; headers follow."""
+    ranges, offset = [], 0
+    for level in range(chunk_rows.bit_length()):
+        size = (chunk_rows >> level) * HASH_SIZE
+        ranges.append((offset, offset + size))
+        offset += size
+    return ranges, offset
+
+
+class _MappedFile:
+    """Read-only memory map of a segment file, opened on first access."""
+
+    def __init__(self, path):
+        self.path = path
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = np.memmap(self.path, dtype=np.uint8, mode="r")
+        return self._data
+
+
+class _SegmentColumns(dict):
+    """Column dict of a sealed segment; columns are views into one memory-mapped file."""
+
+    def __init__(self, mapped_file, chunk_rows):
+        super().__init__()
+        self._file = mapped_file
+        self._layout = _column_layout(chunk_rows)
+        self._chunk_rows = chunk_rows
+
+    def __missing__(self, name):
+        offset, dtype = self._layout[name]
+        values = self._file.data[offset:offset + self._chunk_rows * dtype.itemsize].view(dtype)
+        self[name] = values
+        return values
+
+
+class _SegmentLevel:
+    """One Merkle level chunk of a sealed segment, sliced lazily out of merkle.bin."""
+
+    def __init__(self, mapped_file, start, stop):
+        self._file = mapped_file
+        self._start = start
+        self._stop = stop
+
+    def __getitem__(self, key):
+        return self._file.data[self._start:self._stop][key]
+
+
+class LedgerPersistence:
+    """Durable storage for a LedgerStore (and its LedgerChain).
+
+    Every append is written to an append-only write-ahead log before the store
+    commits it, so a failed write leaves the ledger unchanged. Whenever a
+    store chunk fills up it is sealed into an immutable segment (one file of
+    columns, one of Merkle levels), the manifest is replaced atomically, the WAL
+    is cut back to the unsealed tail, and the in-memory chunk is swapped for a
+    memory map of the segment. Startup maps the segments lazily and replays only
+    the WAL tail, so it never reads sealed history into memory.
+    """
+
+    def __init__(self, directory, sync=False):
+        self.directory = directory
+        self.sync = sync # fsync every WAL write (slower, survives power loss)
+        self.sealed_rows = 0
+        self._segments = []
+        self._wal = None
+        self._store = None
+        self._chain = None
+
+    def _path(self, *parts):
+        return os.path.join(self.directory, *parts)
+
+    def open(self, store, chain=None):
+        """Recovers `store` (and `chain`) from disk, then persists every later append.
+
+        Both must be empty and `chain`, if given, must not follow the store yet.
+        Returns the number of rows replayed from the WAL.
+        """
+        if len(store) or (chain is not None and len(chain)):
+            raise ValueError("Persistence must be opened on an empty ledger.")
+        os.makedirs(self._path(SEGMENTS_DIR), exist_ok=True)
+        self._store, self._chain = store, chain
+        manifest = self._read_manifest()
+        if manifest["chunk_rows"] != store.chunk_rows:
+            raise ValueError(f"Ledger on disk uses chunks of {manifest['chunk_rows']} rows, store uses {store.chunk_rows}.")
+        if chain is not None and manifest["segments"] and manifest.get("payload_encoding", 1) != PAYLOAD_ENCODING:
+            # Sealed Merkle levels hash the old payloads, the re-hash check would flag every entry
+            raise ValueError(f"Ledger chain on disk uses payload encoding {manifest.get('payload_encoding', 1)}, this version uses {PAYLOAD_ENCODING}.")
+
+        store.restore_vocabularies(manifest["vocabularies"])
+        for segment in manifest["segments"]:
+            self._load_segment(segment)
+        if chain is not None:
+            chain.follow(store)
+
+        tail = self._read_wal_tail()
+        self._wal = open(self._path(WAL_FILE), "ab")
+        replayed = 0
+        if tail is not None:
+            replayed = store.extend(tail)[1] - self.sealed_rows
+        store.add_writer(self._log_append)
+        store.add_listener(self._on_append)
+        self._seal_full_chunks()
+        return replayed
+
+    def close(self):
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+
+    # --- Manifest and segments -------------------------------------------------
+
+    def _read_manifest(self):
+        path = self._path(MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {"chunk_rows": self._store.chunk_rows, "payload_encoding": PAYLOAD_ENCODING, "segments": [], "vocabularies": {}}
+        with open(path, "rb") as handle:
+            return json.loads(handle.read())
+
+    def _write_manifest(self):
+        manifest = {
+            "chunk_rows": self._store.chunk_rows,
+            "payload_encoding": PAYLOAD_ENCODING,
+            "segments": self._segments,
+            "vocabularies": {name: list(vocabulary.values) for name, vocabulary in self._store.vocabularies.items()},
+        }
+        _write_atomic(self._path(MANIFEST_FILE), json.dumps(manifest).encode("utf-8"), self.sync)
+
+    def _segment_files(self, segment_name):
+        directory = self._path(SEGMENTS_DIR, segment_name)
+        return _MappedFile(os.path.join(directory, SEGMENT_COLUMNS_FILE)), _MappedFile(os.path.join(directory, SEGMENT_MERKLE_FILE))
+
+    def _mapped_levels(self, merkle_file):
+        ranges, _ = _merkle_layout(self._store.chunk_rows)
+        return [_SegmentLevel(merkle_file, start, stop) for start, stop in ranges]
+
+    def _load_segment(self, segment):
+        chunk_rows = self._store.chunk_rows
+        columns_file, merkle_file = self._segment_files(segment["name"])
+        self._store.load_sealed_chunk(_SegmentColumns(columns_file, chunk_rows))
+        if self._chain is not None:
+            headers = [bytes.fromhex(header) for header in segment["block_headers"]]
+            self._chain.load_segment(self._mapped_levels(merkle_file), headers, bytes.fromhex(segment["root"]))
+        self._segments.append(segment)
+        self.sealed_rows += chunk_rows
+
+    def _write_pairs(self, segment_name, chunk):
+        pairs = np.unique(counterparty_pairs(chunk["Sending Institution"], chunk["Receiving Institution"]))
+        _write_atomic(self._path(SEGMENTS_DIR, segment_name, SEGMENT_PAIRS_FILE), pairs.tobytes(), self.sync)
+        return pairs
+
+    def counterparty_pairs(self):
+        """Distinct (sender, receiver) pairs of the sealed rows, read from the small per-segment pair files.
+
+        Segments sealed before pair files existed are scanned once and get theirs.
+        """
+        parts = []
+        for index, segment in enumerate(self._segments):
+            path = self._path(SEGMENTS_DIR, segment["name"], SEGMENT_PAIRS_FILE)
+            if os.path.exists(path):
+                parts.append(np.fromfile(path, dtype=np.int64))
+            else:
+                parts.append(self._write_pairs(segment["name"], self._store.chunk(index)))
+        return np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+
+    def _seal_full_chunks(self):
+        store, chunk_rows = self._store, self._store.chunk_rows
+        sealed_any = False
+        while self.sealed_rows + chunk_rows <= len(store):
+            index = self.sealed_rows // chunk_rows
+            name = f"{index:06d}"
+            directory = self._path(SEGMENTS_DIR, name)
+            os.makedirs(directory, exist_ok=True)
+
+            chunk = store.chunk(index)
+            _write_atomic(os.path.join(directory, SEGMENT_COLUMNS_FILE), b"".join(chunk[column].tobytes() for column in LEDGER_COLUMNS), self.sync)
+            self._write_pairs(name, chunk)
+            segment = {"name": name, "rows": chunk_rows, "root": None, "block_headers": []}
+            if self._chain is not None:
+                levels = self._chain.segment_chunks(index)
+                _write_atomic(os.path.join(directory, SEGMENT_MERKLE_FILE), b"".join(bytes(level) for level in levels), self.sync)
+                first_block = self.sealed_rows // BLOCK_ENTRIES
+                last_block = (self.sealed_rows + chunk_rows) // BLOCK_ENTRIES
+                segment["root"] = bytes(levels[-1]).hex()
+                segment["block_headers"] = [header.hex() for header in self._chain.block_headers[first_block:last_block]]
+
+            self._segments.append(segment)
+            self.sealed_rows += chunk_rows
+            self._write_manifest()
+
+            # Serve the sealed chunk from the memory map so its RAM can be released
+            columns_file, merkle_file = self._segment_files(name)
+            store.replace_chunk(index, _SegmentColumns(columns_file, chunk_rows))
+            if self._chain is not None:
+                self._chain.replace_segment_chunks(index, self._mapped_levels(merkle_file))
+            sealed_any = True
+
+        if sealed_any:
+            self._rewrite_wal()
+
+    # --- Write-ahead log ---------------------------------------------------------
+
+    def _encode_record(self, start, columns):
+        """One WAL record of the rows starting at `start`, from their stored column values."""
+        rows = len(columns[LEDGER_COLUMNS[0]])
+        header = {"start": start, "rows": rows, "columns": []}
+        buffers = []
+        for name in LEDGER_COLUMNS:
+            values = columns[name]
+            column = {"name": name}
+            if name in CATEGORY_VOCABULARIES:
+                # Labels are logged with each record so replay does not depend on code assignment
+                codes, local_codes = np.unique(values, return_inverse=True)
+                labels = self._store.vocabulary(name).values
+                column["labels"] = [labels[code] for code in codes]
+                values = local_codes.astype(np.int32)
+            buffers.append(np.ascontiguousarray(values).tobytes())
+            header["columns"].append(column)
+        header_bytes = json.dumps(header).encode("utf-8")
+        body = b"".join(buffers)
+        crc = zlib.crc32(body, zlib.crc32(header_bytes))
+        return _WAL_RECORD_HEADER.pack(_WAL_MAGIC, len(header_bytes), len(body), crc) + header_bytes + body
+
+    def _append_wal(self, data):
+        position = self._wal.tell()
+        try:
+            self._wal.write(data)
+            self._wal.flush()
+            if self.sync:
+                os.fsync(self._wal.fileno())
+        except BaseException:
+            # Cut the log back so the undone rows are never replayed and later records stay readable
+            try:
+                self._wal.close()
+            except OSError:
+                pass
+            os.truncate(self._path(WAL_FILE), position)
+            self._wal = open(self._path(WAL_FILE), "ab")
+            raise
+
+    def _log_append(self, store, start, columns):
+        # A store writer: the rows are logged before they are committed, so a failed write undoes the append
+        self._append_wal(self._encode_record(start, columns))
+
+    def _on_append(self, store, start, stop):
+        self._seal_full_chunks()
+
+    def _rewrite_wal(self):
+        # Keep only the rows that are not part of a sealed segment yet
+        self._wal.close()
+        store, start = self._store, self.sealed_rows
+        tail = self._encode_record(start, {name: store.column(name, start) for name in LEDGER_COLUMNS}) if len(store) > start else b""
+        _write_atomic(self._path(WAL_FILE), tail, self.sync)
+        self._wal = open(self._path(WAL_FILE), "ab")
+
+    def _read_wal_tail(self):
+        """Decodes the WAL records past the sealed rows into one batch of columns (None if empty).
+
+        A torn or corrupt record ends the log; it and anything after it are truncated.
+        """
+        path = self._path(WAL_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as handle:
+            data = handle.read()
+        parts = {name: [] for name in LEDGER_COLUMNS}
+        offset = 0
+        while offset + _WAL_RECORD_HEADER.size <= len(data):
+            magic, header_length, body_length, crc = _WAL_RECORD_HEADER.unpack_from(data, offset)
+            header_start = offset + _WAL_RECORD_HEADER.size
+            body_start = header_start + header_length
+            end = body_start + body_length
+            if magic != _WAL_MAGIC or end > len(data):
+                break
+            header_bytes, body = data[header_start:body_start], data[body_start:end]
+            if zlib.crc32(body, zlib.crc32(header_bytes)) != crc:
+                break
+            header = json.loads(header_bytes)
+            skip = max(0, self.sealed_rows - header["start"]) # Rows sealed before the WAL was cut back
+            position = 0
+            for column in header["columns"]:
+                name = column["name"]
+                dtype = np.dtype(np.int32) if "labels" in column else column_dtype(name)
+                size = header["rows"] * dtype.itemsize
+                values = np.frombuffer(body, dtype=dtype, count=header["rows"], offset=position)
+                position += size
+                if "labels" in column:
+                    values = np.asarray(column["labels"], dtype=object)[values]
+                parts[name].append(values[skip:])
+            offset = end
+
+        if offset < len(data):
+            with open(path, "r+b") as handle:
+                handle.truncate(offset)
+        if not parts[LEDGER_COLUMNS[0]]:
+            return None
+        batch = {name: np.concatenate(values) for name, values in parts.items()}
+        return batch if len(batch[LEDGER_COLUMNS[0]]) else None
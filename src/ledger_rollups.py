@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+
+# Dimensions a rollup cell is keyed by (besides its time bucket). Keeping both
+# institution sides lets "institution on either side" filters be answered exactly.
+ROLLUP_DIMENSIONS = ["Sending Stablecoin", "Corridor", "Sending Institution", "Receiving Institution"]
+ROLLUP_MEASURES = ["Count", "Fee", "Amount Sent", "Amount Received"]
+
+
+class LedgerRollup:
+    """Running totals of ledger measures per (stablecoin, corridor, institutions, time bucket).
+
+    Each cell holds the count, fees, amount sent and amount received of the
+    transactions that fall into it. A single append updates one cell in O(1);
+    batches are grouped once per batch. Queries filter and sum cells, whose number
+    depends on the distinct keys and buckets, not on the ledger size.
+
+    Rows already in the store when the rollup is created (e.g. sealed segments
+    after a restart) are aggregated on the first query rather than at startup.
+
+    As long as entries arrive in time order, cells are created in bucket order,
+    so a time-bounded query binary-searches its buckets and only visits the
+    cells inside its window, however long the history. A backdated entry
+    falls back to filtering every cell.
+    """
+
+    def __init__(self, store, bucket_seconds=86400):
+        self.store = store
+        self.bucket_seconds = bucket_seconds
+        self._slots = {} # Cell key (dimension codes + bucket) -> row in the arrays below
+        self._keys = np.empty((64, len(ROLLUP_DIMENSIONS) + 1), dtype=np.int64)
+        self._totals = np.zeros((64, len(ROLLUP_MEASURES)), dtype=np.float64)
+        self._size = 0
+        self._covered = 0 # Store rows already aggregated
+        self._ready = False
+        self._in_order = True # Cell buckets are non-decreasing in slot order
+        store.add_listener(self._on_append)
+
+    def __len__(self):
+        return self._size
+
+    def _bucket(self, timestamps):
+        return np.asarray(timestamps, dtype="datetime64[s]").astype(np.int64) // self.bucket_seconds
+
+    def _slot(self, key):
+        slot = self._slots.get(key)
+        if slot is None:
+            if self._size == len(self._keys):
+                self._keys = np.resize(self._keys, (2 * self._size, self._keys.shape[1]))
+                self._totals = np.concatenate([self._totals, np.zeros_like(self._totals)])
+            slot = self._slots[key] = self._size
+            if slot and key[-1] < self._keys[slot - 1, -1]:
+                self._in_order = False
+            self._keys[slot] = key
+            self._size += 1
+        return slot
+
+    def _on_append(self, store, start, stop):
+        if self._ready and start == self._covered:
+            self._aggregate(start, stop)
+
+    def _catch_up(self):
+        # Caller holds the store lock
+        if self._covered < len(self.store):
+            self._aggregate(self._covered, len(self.store))
+        self._ready = True
+
+    def _aggregate(self, start, stop):
+        store = self.store
+        if stop - start == 1:
+            key = tuple(int(store.column(name, start, stop)[0]) for name in ROLLUP_DIMENSIONS)
+            key += (int(self._bucket(store.column("Timestamp", start, stop))[0]),)
+            self._totals[self._slot(key)] += (1.0, *(float(store.column(name, start, stop)[0]) for name in ROLLUP_MEASURES[1:]))
+        else:
+            batch = pd.DataFrame({name: store.column(name, start, stop) for name in ROLLUP_DIMENSIONS + ROLLUP_MEASURES[1:]})
+            batch["Bucket"] = self._bucket(store.column("Timestamp", start, stop))
+            batch["Count"] = 1.0
+            grouped = batch.groupby(ROLLUP_DIMENSIONS + ["Bucket"], sort=False)[ROLLUP_MEASURES].sum()
+            slots = np.fromiter((self._slot(key) for key in grouped.index), dtype=np.int64, count=len(grouped))
+            self._totals[slots] += grouped.to_numpy()
+        self._covered = stop
+
+    def aligned(self, start=None, end=None):
+        """True when [start, end] covers whole buckets, i.e. the rollup answers it exactly."""
+        start_ok = start is None or self._bucket(start) * self.bucket_seconds == np.datetime64(start, "s").astype(np.int64)
+        end_ok = end is None or (self._bucket(end) + 1) * self.bucket_seconds - 1 == np.datetime64(end, "s").astype(np.int64)
+        return start_ok and end_ok
+
+    def _cells(self, start, end):
+        """(keys, totals) of the cells that may fall in [start, end]; caller holds the store lock."""
+        low, high = 0, self._size
+        if self._in_order:
+            buckets = self._keys[:self._size, -1]
+            if start is not None:
+                low = np.searchsorted(buckets, self._bucket(start), side="left")
+            if end is not None:
+                high = np.searchsorted(buckets, self._bucket(end), side="right")
+        return self._keys[low:high], self._totals[low:high]
+
+    def _mask(self, keys, institutions, corridors, start, end):
+        store = self.store
+        mask = np.ones(len(keys), dtype=bool)
+        if institutions:
+            codes = store.vocabulary("Sending Institution").lookup(institutions)
+            mask &= np.isin(keys[:, 2], codes) | np.isin(keys[:, 3], codes)
+        if corridors:
+            mask &= np.isin(keys[:, 1], store.vocabulary("Corridor").lookup(corridors))
+        if start is not None:
+            mask &= keys[:, -1] >= self._bucket(start)
+        if end is not None:
+            mask &= keys[:, -1] <= self._bucket(end)
+        return mask
+
+    def totals(self, by=None, institutions=None, corridors=None, start=None, end=None):
+        """Sums the measures of the cells matching the filters.
+
+        `institutions` match either side of a payment, `corridors` any listed
+        corridor, and `start` / `end` select the buckets they fall in (exact when
+        `aligned`). Returns a DataFrame grouped by the dimension `by` (or a single
+        row named "Total"), with the columns in ROLLUP_MEASURES.
+        """
+        store = self.store
+        with store.lock:
+            self._catch_up()
+            keys, totals = self._cells(start, end)
+            mask = self._mask(keys, institutions, corridors, start, end)
+
+            if by is None:
+                return pd.DataFrame([totals[mask].sum(axis=0)], columns=ROLLUP_MEASURES, index=["Total"])
+            dimension = ROLLUP_DIMENSIONS.index(by)
+            labels = store.vocabulary(by).values
+            codes, inverse = np.unique(keys[mask, dimension], return_inverse=True)
+            sums = np.zeros((len(codes), len(ROLLUP_MEASURES)))
+            np.add.at(sums, inverse, totals[mask])
+            return pd.DataFrame(sums, columns=ROLLUP_MEASURES, index=pd.Index([labels[code] for code in codes], name=by))
+
+    def timeline(self, institutions=None, corridors=None, start=None, end=None, bucket_seconds=None):
+        """Sums the measures of the matching cells per time bucket.
+
+        Filters are as in `totals`. `bucket_seconds`, a multiple of the rollup's
+        own, merges its buckets into coarser ones (e.g. hourly cells into days).
+        Returns a DataFrame with the columns in ROLLUP_MEASURES indexed by bucket
+        start time; with both `start` and `end`, every bucket between them is
+        listed, empty ones with zeros.
+        """
+        bucket_seconds = bucket_seconds or self.bucket_seconds
+        if bucket_seconds % self.bucket_seconds:
+            raise ValueError("bucket_seconds must be a multiple of the rollup's bucket size.")
+        factor = bucket_seconds // self.bucket_seconds
+        store = self.store
+        with store.lock:
+            self._catch_up()
+            keys, totals = self._cells(start, end)
+            mask = self._mask(keys, institutions, corridors, start, end)
+            buckets, inverse = np.unique(keys[mask, -1] // factor, return_inverse=True)
+            sums = np.zeros((len(buckets), len(ROLLUP_MEASURES)))
+            np.add.at(sums, inverse, totals[mask])
+        index = pd.DatetimeIndex((buckets * bucket_seconds).astype("datetime64[s]"), name="Bucket")
+        frame = pd.DataFrame(sums, columns=ROLLUP_MEASURES, index=index)
+        if start is not None and end is not None:
+            first, last = self._bucket(start) // factor, self._bucket(end) // factor
+            frame = frame.reindex(pd.DatetimeIndex((np.arange(first, last + 1) * bucket_seconds).astype("datetime64[s]"), name="Bucket"), fill_value=0.0)
+        return frame
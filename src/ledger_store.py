@@ -0,0 +1,309 @@
+import threading
+import numpy as np
+import pandas as pd
+
+# Column order of the transaction ledger (as shown in the Ledger tab and exports)
+LEDGER_COLUMNS = [
+    "Transaction ID", "Timestamp", "Sending Institution", "Receiving Institution",
+    "Corridor", "Amount Sent", "Sending Stablecoin", "Amount Received",
+    "Receiving Stablecoin", "Fee", "Priority", "Status"
+]
+
+# Low-cardinality columns are stored as int32 dictionary codes.
+# Columns mapped to the same vocabulary share codes (e.g. both institution sides).
+CATEGORY_VOCABULARIES = {
+    "Sending Institution": "institution",
+    "Receiving Institution": "institution",
+    "Corridor": "corridor",
+    "Sending Stablecoin": "stablecoin",
+    "Receiving Stablecoin": "stablecoin",
+    "Priority": "priority",
+    "Status": "status",
+}
+AMOUNT_COLUMNS = ["Amount Sent", "Amount Received", "Fee"]
+
+TRANSACTION_ID_LENGTH = 8
+TRANSACTION_ID_DTYPE = f"<U{TRANSACTION_ID_LENGTH}"
+TIMESTAMP_DTYPE = "datetime64[s]"
+DEFAULT_CHUNK_ROWS = 1 << 16 # Must be a power of two
+
+
+def column_dtype(name):
+    """Returns the NumPy dtype a ledger column is stored with."""
+    if name in CATEGORY_VOCABULARIES:
+        return np.dtype(np.int32)
+    if name in AMOUNT_COLUMNS:
+        return np.dtype(np.float64)
+    if name == "Timestamp":
+        return np.dtype(TIMESTAMP_DTYPE)
+    return np.dtype(TRANSACTION_ID_DTYPE)
+
+
+def counterparty_pairs(senders, receivers):
+    """Packs sending and receiving institution codes into one int64 (sender, receiver) pair per entry."""
+    return (np.asarray(senders, dtype=np.int64) << 32) | np.asarray(receivers, dtype=np.int64)
+
+
+class Vocabulary:
+    """Append-only mapping between category labels and integer codes."""
+
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.encode(value)
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, value):
+        """Returns the code of a label, assigning the next free code to new labels."""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+    def encode_many(self, values):
+        """Encodes an array of labels, touching each distinct label only once."""
+        local_codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        mapping = np.array([self.encode(value) for value in uniques], dtype=np.int32)
+        if len(mapping) == 0:
+            return np.empty(len(local_codes), dtype=np.int32)
+        return mapping[local_codes]
+
+    def lookup(self, values):
+        """Returns the codes of known labels, silently skipping unknown ones."""
+        return [self.codes[value] for value in values if value in self.codes]
+
+
+class LedgerListenerError(RuntimeError):
+    """Raised by an append whose rows were committed but at least one listener failed.
+
+    The rows [start, stop) stay in the ledger and every listener was called;
+    `errors` holds the listener exceptions.
+    """
+
+    def __init__(self, start, stop, errors):
+        super().__init__(f"Ledger rows {start}-{stop - 1} were appended, but {len(errors)} listener(s) failed: {errors[0]!r}")
+        self.start, self.stop, self.errors = start, stop, errors
+
+
+class LedgerStore:
+    """Append-only columnar store for ledger entries.
+
+    Rows are written into fixed-size, preallocated column chunks, so an append
+    fills a free slot instead of copying the table. A new chunk is allocated only
+    when the current one is full, which keeps appends amortized O(1).
+    """
+
+    def __init__(self, chunk_rows=DEFAULT_CHUNK_ROWS):
+        if chunk_rows <= 0 or chunk_rows & (chunk_rows - 1):
+            raise ValueError("chunk_rows must be a positive power of two.")
+        self.chunk_rows = chunk_rows
+        self._shift = chunk_rows.bit_length() - 1
+        self._chunks = []
+        self._rows = 0
+        self.version = 0 # Incremented on every append, used to invalidate cached views
+        self.vocabularies = {name: Vocabulary() for name in sorted(set(CATEGORY_VOCABULARIES.values()))}
+        self.lock = threading.RLock()
+        self._writers = []
+        self._listeners = []
+        self._frame_cache = (None, None)
+
+    def __len__(self):
+        return self._rows
+
+    @property
+    def empty(self):
+        return self._rows == 0
+
+    def vocabulary(self, column):
+        """Returns the vocabulary backing a categorical column."""
+        return self.vocabularies[CATEGORY_VOCABULARIES[column]]
+
+    def add_writer(self, callback):
+        """Registers callback(store, start, columns), called before new rows are committed.
+
+        `columns` maps every column to the stored values of the rows starting at
+        `start`. If a writer raises (e.g. a failed write-ahead log append), the
+        append is undone and the error re-raised; no listener sees the rows.
+        """
+        with self.lock:
+            self._writers.append(callback)
+
+    def add_listener(self, callback):
+        """Registers callback(store, start, stop), called after rows [start, stop) are appended."""
+        with self.lock:
+            self._listeners.append(callback)
+
+    def restore_vocabularies(self, vocabularies):
+        """Replaces the (still empty) vocabularies, e.g. with those saved alongside sealed chunks."""
+        with self.lock:
+            for name, values in vocabularies.items():
+                if len(self.vocabularies[name]) > len(values):
+                    raise ValueError(f"Vocabulary '{name}' would lose codes already in use.")
+                self.vocabularies[name] = Vocabulary(values)
+
+    def load_sealed_chunk(self, chunk):
+        """Appends a full, read-only chunk (e.g. memory-mapped from disk) without notifying listeners."""
+        with self.lock:
+            if self._rows != len(self._chunks) * self.chunk_rows:
+                raise ValueError("Sealed chunks can only be loaded at a chunk boundary.")
+            self._chunks.append(chunk)
+            self._rows += self.chunk_rows
+            self.version += 1
+
+    def chunk(self, index):
+        """Returns the column dict of chunk `index`."""
+        return self._chunks[index]
+
+    def replace_chunk(self, index, chunk):
+        """Swaps a full chunk for an equal-content one, e.g. its memory-mapped sealed copy."""
+        with self.lock:
+            if (index + 1) * self.chunk_rows > self._rows:
+                raise ValueError("Only full chunks can be replaced.")
+            self._chunks[index] = chunk
+
+    def _allocate_chunk(self):
+        chunk = {name: np.empty(self.chunk_rows, dtype=column_dtype(name)) for name in LEDGER_COLUMNS}
+        self._chunks.append(chunk)
+        return chunk
+
+    def _encode_value(self, name, value):
+        if name in CATEGORY_VOCABULARIES:
+            return self.vocabulary(name).encode(value)
+        if name == "Timestamp":
+            return np.datetime64(value, "s")
+        return value
+
+    def _encode_column(self, name, values):
+        if name in CATEGORY_VOCABULARIES:
+            return self.vocabulary(name).encode_many(values)
+        if name == "Timestamp":
+            return pd.to_datetime(np.asarray(values)).values.astype(TIMESTAMP_DTYPE)
+        return np.asarray(values, dtype=column_dtype(name))
+
+    def _commit(self, start, count, columns, chunk_count):
+        try:
+            for callback in self._writers:
+                callback(self, start, columns)
+        except BaseException:
+            del self._chunks[chunk_count:] # Drop the chunks allocated for the undone rows
+            raise
+        self._rows = start + count
+        self.version += 1
+        # The rows are committed: every listener sees them even if an earlier one fails
+        errors = []
+        for callback in self._listeners:
+            try:
+                callback(self, start, start + count)
+            except Exception as exc:
+                errors.append(exc)
+        if errors:
+            raise LedgerListenerError(start, start + count, errors)
+
+    def append(self, entry):
+        """Appends one ledger entry (a dict as built by create_ledger_entry) and returns its row id."""
+        with self.lock:
+            row = self._rows
+            chunk_count = len(self._chunks)
+            offset = row & (self.chunk_rows - 1)
+            chunk = self._allocate_chunk() if row == chunk_count * self.chunk_rows else self._chunks[-1]
+            for name in LEDGER_COLUMNS:
+                chunk[name][offset] = self._encode_value(name, entry[name])
+            columns = {name: chunk[name][offset:offset + 1] for name in LEDGER_COLUMNS} if self._writers else None
+            self._commit(row, 1, columns, chunk_count)
+            return row
+
+    def extend(self, batch):
+        """Appends a batch of entries given as a DataFrame or a dict of equal-length columns.
+
+        Each column is encoded once for the whole batch and copied into the chunks
+        slice by slice. Returns the (start, stop) row range of the new entries.
+        """
+        with self.lock:
+            encoded = {name: self._encode_column(name, batch[name]) for name in LEDGER_COLUMNS}
+            count = len(encoded[LEDGER_COLUMNS[0]])
+            start = self._rows
+            chunk_count = len(self._chunks)
+            written = 0
+            while written < count:
+                row = start + written
+                offset = row & (self.chunk_rows - 1)
+                chunk = self._allocate_chunk() if row == len(self._chunks) * self.chunk_rows else self._chunks[-1]
+                size = min(self.chunk_rows - offset, count - written)
+                for name in LEDGER_COLUMNS:
+                    chunk[name][offset:offset + size] = encoded[name][written:written + size]
+                written += size
+            if count:
+                self._commit(start, count, encoded, chunk_count)
+            return start, start + count
+
+    def column(self, name, start=0, stop=None):
+        """Returns the stored (encoded) values of rows [start, stop).
+
+        Ranges inside a single chunk are returned as views without copying.
+        """
+        stop = self._rows if stop is None else min(stop, self._rows)
+        if start >= stop:
+            return np.empty(0, dtype=column_dtype(name))
+        first, last = start >> self._shift, (stop - 1) >> self._shift
+        mask = self.chunk_rows - 1
+        if first == last:
+            return self._chunks[first][name][start & mask:((stop - 1) & mask) + 1]
+        parts = [self._chunks[first][name][start & mask:]]
+        parts.extend(self._chunks[i][name] for i in range(first + 1, last))
+        parts.append(self._chunks[last][name][:((stop - 1) & mask) + 1])
+        return np.concatenate(parts)
+
+    def take(self, name, rows):
+        """Returns the stored values of the given row ids, gathering chunk by chunk."""
+        rows = np.asarray(rows, dtype=np.int64)
+        out = np.empty(len(rows), dtype=column_dtype(name))
+        if len(rows) == 0:
+            return out
+        chunk_ids = rows >> self._shift
+        offsets = rows & (self.chunk_rows - 1)
+        for chunk_id in np.unique(chunk_ids):
+            hits = chunk_ids == chunk_id
+            out[hits] = self._chunks[chunk_id][name][offsets[hits]]
+        return out
+
+    def _values(self, name, rows):
+        return self.column(name) if rows is None else self.take(name, rows)
+
+    def decode(self, name, values):
+        """Turns stored values of a column into displayable ones (categoricals for coded columns)."""
+        if name in CATEGORY_VOCABULARIES:
+            return pd.Categorical.from_codes(values, categories=list(self.vocabulary(name).values))
+        return values
+
+    def to_dataframe(self, rows=None):
+        """Returns a DataFrame view of the ledger, or of the given row ids.
+
+        The full view is cached until the next append, so Streamlit reruns
+        without new payments do not rebuild it.
+        """
+        with self.lock:
+            if rows is None and self._frame_cache[0] == self.version:
+                return self._frame_cache[1]
+            frame = pd.DataFrame({name: self.decode(name, self._values(name, rows)) for name in LEDGER_COLUMNS})
+            if rows is None:
+                self._frame_cache = (self.version, frame)
+            return frame
+
+    def to_arrow(self, rows=None):
+        """Returns the ledger (or the given row ids) as a pyarrow Table with dictionary-encoded categories."""
+        import pyarrow as pa
+
+        with self.lock:
+            arrays = []
+            for name in LEDGER_COLUMNS:
+                values = self._values(name, rows)
+                if name in CATEGORY_VOCABULARIES:
+                    arrays.append(pa.DictionaryArray.from_arrays(values, pa.array(self.vocabulary(name).values, type=pa.string())))
+                else:
+                    arrays.append(pa.array(values))
+            return pa.Table.from_arrays(arrays, names=LEDGER_COLUMNS)
@@ -0,0 +1,219 @@
+import numpy as np
+from src.liquidity_forecast import FIT_WINDOW, DEFAULT_VOLATILITY, TrendFit
+
+DEFAULT_EWM_ALPHA = 0.1 # Weight of the newest daily change in the exponentially weighted volatility
+
+
+class OnlineTrendEstimators:
+    """Per-series online trend and volatility estimates that follow a LiquidityStore.
+
+    For each series the latest `window` points are kept with their running
+    sums (sum of y, of x * y, of the daily changes and of their squares), so a
+    new point updates the least-squares trend and the sample volatility of
+    the window in O(1) by adding it and retiring the oldest point. The sums
+    are recomputed from the window every `window` updates, which bounds the
+    floating-point drift at amortized O(1). An exponentially weighted
+    volatility (Welford-style update) is kept alongside.
+
+    The estimates equal TrendFit on the same window. State is held in
+    arrays with one row per series, so a tick across many series is a single
+    vectorized update (`update_rows`).
+    """
+
+    def __init__(self, store=None, window=FIT_WINDOW, alpha=DEFAULT_EWM_ALPHA):
+        self.window = window
+        self.alpha = alpha
+        self._rows = {} # Series key -> row in the arrays below
+        self._size = 0
+        self._allocate(64)
+        if store is not None:
+            with store.lock:
+                for key in store.keys():
+                    _, values = store.window(key)
+                    self.reset(self.row(key), values)
+                store.add_listener(self._on_append, self._on_batch)
+
+    def _allocate(self, capacity):
+        previous = getattr(self, "_state", None)
+        window = self.window
+        self._state = {
+            "ring": np.zeros((capacity, window)), # Latest points, circular per row
+            "head": np.zeros(capacity, dtype=np.int64), # Slot of the next point
+            "count": np.zeros(capacity, dtype=np.int64), # Points in the window
+            "offset": np.zeros(capacity, dtype=np.int64), # x of the next point (x of the oldest is offset - count)
+            "sum_y": np.zeros(capacity), "sum_xy": np.zeros(capacity),
+            "sum_d": np.zeros(capacity), "sum_dd": np.zeros(capacity), # Daily changes inside the window
+            "last": np.full(capacity, np.nan),
+            "ewm_mean": np.zeros(capacity), "ewm_var": np.zeros(capacity), "ewm_count": np.zeros(capacity, dtype=np.int64),
+        }
+        if previous is not None:
+            for name, values in previous.items():
+                self._state[name][:len(values)] = values
+
+    def __len__(self):
+        return self._size
+
+    def row(self, key):
+        """Returns the row of a series, adding it if needed."""
+        row = self._rows.get(key)
+        if row is None:
+            if self._size == len(self._state["head"]):
+                self._allocate(2 * self._size)
+            row = self._rows[key] = self._size
+            self._size += 1
+        return row
+
+    def _on_append(self, store, key, timestamps, values):
+        row = self.row(key)
+        if self._state["count"][row] == 0 or len(values) >= self.window:
+            # A new series or a batch covering the whole window: start from the batch's points
+            self.reset(row, values)
+        else:
+            for value in values:
+                self.update_rows(np.array([row]), np.array([value]))
+
+    def _on_batch(self, store, keys, rows, timestamps, values):
+        batch_rows = np.array([self.row(key) for key in keys], dtype=np.int64)[rows]
+        # update_rows takes distinct rows: apply the batch in rounds, the i-th point of every series in round i
+        order = np.argsort(batch_rows, kind="stable")
+        sorted_rows = batch_rows[order]
+        starts = np.flatnonzero(np.concatenate([[True], sorted_rows[1:] != sorted_rows[:-1]]))
+        ranks = np.arange(len(order)) - np.repeat(starts, np.diff(np.append(starts, len(order))))
+        for rank in range(int(ranks.max()) + 1 if len(ranks) else 0):
+            points = order[ranks == rank]
+            self.update_rows(batch_rows[points], values[points])
+
+    def reset(self, row, values):
+        """Restarts a series' window from its latest points (the EW volatility is replayed over them)."""
+        state = self._state
+        values = np.asarray(values, dtype=np.float64)
+        recent = values[-self.window:]
+        state["ring"][row] = 0.0
+        state["ring"][row, :len(recent)] = recent
+        state["head"][row] = len(recent) % self.window
+        state["count"][row] = len(recent)
+        state["last"][row] = recent[-1] if len(recent) else np.nan
+        self._resum(np.array([row]))
+        mean = variance = 0.0
+        for count, change in enumerate(np.diff(values).tolist()):
+            if count == 0:
+                mean = change
+            else:
+                deviation = change - mean
+                mean += self.alpha * deviation
+                variance = (1 - self.alpha) * (variance + self.alpha * deviation ** 2)
+        state["ewm_mean"][row], state["ewm_var"][row] = mean, variance
+        state["ewm_count"][row] = max(len(values) - 1, 0)
+
+    def _window_values(self, rows):
+        """(rows, window) matrix of each row's points, oldest first, NaN-padded on the left."""
+        state, window = self._state, self.window
+        # Reading from the head onwards puts the points last, oldest first (until a row is full its head is its count)
+        order = (state["head"][rows, None] + np.arange(window)) % window
+        values = np.take_along_axis(state["ring"][rows], order, axis=1)
+        values[np.arange(window) < window - state["count"][rows, None]] = np.nan
+        return values
+
+    def _resum(self, rows):
+        state = self._state
+        values = self._window_values(rows)
+        valid = ~np.isnan(values)
+        counts = state["count"][rows]
+        x = np.arange(self.window) - (self.window - counts[:, None]) # 0..count-1 over each row's points
+        y = np.where(valid, values, 0.0)
+        state["sum_y"][rows] = y.sum(axis=1)
+        state["sum_xy"][rows] = np.where(valid, x * y, 0.0).sum(axis=1)
+        changes = np.diff(values, axis=1)
+        state["sum_d"][rows] = np.nansum(changes, axis=1)
+        state["sum_dd"][rows] = np.nansum(changes ** 2, axis=1)
+        state["offset"][rows] = counts
+
+    def _ewm_update(self, rows, changes):
+        state, alpha = self._state, self.alpha
+        first = state["ewm_count"][rows] == 0
+        deviation = changes - state["ewm_mean"][rows]
+        state["ewm_var"][rows] = np.where(first, 0.0, (1 - alpha) * (state["ewm_var"][rows] + alpha * deviation ** 2))
+        state["ewm_mean"][rows] = np.where(first, changes, state["ewm_mean"][rows] + alpha * deviation)
+        state["ewm_count"][rows] += 1
+
+    def update_rows(self, rows, values):
+        """Adds one new point to each of the given (distinct) rows in a single vectorized step."""
+        state, window = self._state, self.window
+        rows = np.asarray(rows, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        counts, head = state["count"][rows], state["head"][rows]
+        full = counts == window
+
+        # Retire the oldest point (and the change after it) of full windows
+        oldest = state["ring"][rows, head]
+        following = state["ring"][rows, (head + 1) % window]
+        oldest_x = state["offset"][rows] - counts
+        state["sum_y"][rows] -= np.where(full, oldest, 0.0)
+        state["sum_xy"][rows] -= np.where(full, oldest_x * oldest, 0.0)
+        retired_change = np.where(full & (window > 1), following - oldest, 0.0)
+        state["sum_d"][rows] -= retired_change
+        state["sum_dd"][rows] -= retired_change ** 2
+
+        # Add the new point and its change from the previous one
+        has_previous = counts > 0
+        change = np.where(has_previous, values - state["last"][rows], 0.0)
+        state["sum_d"][rows] += change
+        state["sum_dd"][rows] += change ** 2
+        state["sum_y"][rows] += values
+        state["sum_xy"][rows] += state["offset"][rows] * values
+        state["ring"][rows, head] = values
+        state["head"][rows] = (head + 1) % window
+        state["count"][rows] = np.minimum(counts + 1, window)
+        state["offset"][rows] += 1
+        state["last"][rows] = values
+        if has_previous.any():
+            self._ewm_update(rows[has_previous], change[has_previous])
+
+        # Re-anchor x and recompute the sums once every `window` updates per row
+        stale = rows[state["offset"][rows] >= 2 * window]
+        if len(stale):
+            self._resum(stale)
+
+    def update(self, key, value):
+        """Adds one new point to a series."""
+        self.update_rows(np.array([self.row(key)]), np.array([value]))
+
+    def _estimates(self, rows):
+        state = self._state
+        counts = state["count"][rows]
+        n = counts.astype(np.float64)
+        start_x = state["offset"][rows] - counts # Shift x so the oldest point of the window is 0
+        sum_y = state["sum_y"][rows]
+        sum_xy = state["sum_xy"][rows] - start_x * sum_y
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        changes = n - 1
+        with np.errstate(invalid="ignore", divide="ignore"):
+            slope = np.where(counts >= 2, (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x ** 2), 0.0)
+            intercept = np.where(counts >= 1, (sum_y - slope * sum_x) / n, np.nan)
+            variance = (state["sum_dd"][rows] - state["sum_d"][rows] ** 2 / changes) / (changes - 1)
+        volatility = np.sqrt(np.maximum(variance, 0.0))
+        volatility = np.where((counts >= 3) & np.isfinite(volatility), volatility, DEFAULT_VOLATILITY)
+        return counts, slope, intercept, volatility
+
+    def rows_for(self, keys):
+        return np.array([self._rows[key] for key in keys], dtype=np.int64)
+
+    def fit(self, keys=None):
+        """Returns a TrendFit of the given series (all by default) straight from the running sums."""
+        rows = np.arange(self._size) if keys is None else self.rows_for(keys)
+        counts, slope, intercept, volatility = self._estimates(rows)
+        return TrendFit.from_estimates(counts, slope, intercept, volatility, self._state["last"][rows].copy())
+
+    def trend(self, key):
+        """Returns the current per-day trend (least-squares slope over the window) of a series."""
+        return float(self._estimates(self.rows_for([key]))[1][0])
+
+    def volatility(self, key):
+        """Returns the sample volatility of the window's daily changes of a series."""
+        return float(self._estimates(self.rows_for([key]))[3][0])
+
+    def ewm_volatility(self, key):
+        """Returns the exponentially weighted volatility of a series' daily changes."""
+        row = self._rows[key]
+        return float(np.sqrt(self._state["ewm_var"][row])) if self._state["ewm_count"][row] > 1 else DEFAULT_VOLATILITY
@@ -0,0 +1,61 @@
+import datetime
+import numpy as np
+import pandas as pd
+
+LIQUIDITY_COLUMNS = ["Timestamp", "Institution", "Corridor", "Stablecoin", "Net Position"]
+TRIPLET_COLUMNS = ["Institution", "Stablecoin", "Corridor", "base", "trend_per_day", "volatility"]
+DEFAULT_TRIPLET_CONFIG = {"base": 0, "trend_per_day": 0, "volatility": 1000} # For triplets without a configuration
+DEFAULT_CHUNK_ROWS = 1 << 20
+
+
+def liquidity_triplets(stablecoin_corridors, positions_and_trends):
+    """Flattens the institution -> stablecoin -> corridors mapping into one row per triplet.
+
+    Each row carries the triplet's base, trend_per_day and volatility from
+    `positions_and_trends` (DEFAULT_TRIPLET_CONFIG when missing), in the order
+    the mapping lists them.
+    """
+    rows = []
+    for institution, coins in stablecoin_corridors.items():
+        for coin, corridors in coins.items():
+            for corridor in corridors:
+                config = positions_and_trends.get((institution, coin, corridor), DEFAULT_TRIPLET_CONFIG)
+                rows.append((institution, coin, corridor, config["base"], config["trend_per_day"], config["volatility"]))
+    return pd.DataFrame(rows, columns=TRIPLET_COLUMNS)
+
+
+def iter_liquidity_chunks(start_date, num_days, triplets, seed=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yields a synthetic daily liquidity panel as DataFrames of about `chunk_rows` rows.
+
+    Rows are ordered by date, then by triplet. Each Net Position is
+    base + trend_per_day * day + N(0, volatility), computed for a block of days
+    at once by broadcasting the triplet parameters; labels are categoricals, so no
+    Python object is created per row. Chunks hold whole days (at least one).
+    The noise is drawn in row order from one seeded Generator, so the same seed
+    gives the same panel whatever the chunk size.
+    """
+    rng = np.random.default_rng(seed)
+    labels = {name: pd.Categorical(triplets[name]) for name in ["Institution", "Corridor", "Stablecoin"]}
+    base = triplets["base"].to_numpy(dtype=np.float64)
+    trend = triplets["trend_per_day"].to_numpy(dtype=np.float64)
+    volatility = triplets["volatility"].to_numpy(dtype=np.float64)
+    first_day = np.datetime64(start_date, "D")
+    days_per_chunk = max(1, chunk_rows // max(len(triplets), 1))
+
+    for first in range(0, num_days, days_per_chunk):
+        days = np.arange(first, min(first + days_per_chunk, num_days))
+        positions = base + trend * days[:, None] + rng.standard_normal((len(days), len(triplets))) * volatility
+        yield pd.DataFrame({
+            "Timestamp": np.repeat(first_day + days, len(triplets)).astype("datetime64[ns]"),
+            **{name: pd.Categorical.from_codes(np.tile(values.codes, len(days)), dtype=values.dtype) for name, values in labels.items()},
+            "Net Position": np.round(positions.ravel(), 2),
+        }, columns=LIQUIDITY_COLUMNS)
+
+
+def generate_liquidity_history(end_date, num_days, triplets, seed=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Returns the `num_days` of synthetic liquidity history ending on `end_date` as one DataFrame."""
+    start_date = end_date - datetime.timedelta(days=num_days - 1)
+    chunks = list(iter_liquidity_chunks(start_date, num_days, triplets, seed, chunk_rows))
+    if not chunks:
+        return pd.DataFrame(columns=LIQUIDITY_COLUMNS)
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
@@ -0,0 +1,244 @@
+import numpy as np
+
+SMOOTHING_ALPHAS = np.linspace(0.1, 0.9, 9) # Level smoothing factors searched by the fit
+SMOOTHING_BETAS = np.array([0.0, 0.05, 0.1, 0.2, 0.3, 0.5]) # Trend smoothing factors (Holt only)
+DEFAULT_ARIMA_ORDER = (1, 1, 1)
+MAX_COEFFICIENT_SUM = 0.99 # Bound on sum(|phi|) and sum(|theta|): keeps fits stationary and invertible
+RIDGE = 1e-9 # Ridge term, relative to each coefficient's scale, keeping the batched normal equations solvable
+
+
+class ExponentialSmoothing:
+    """Simple (trend=False) or Holt linear (trend=True) exponential smoothing of a batch of series.
+
+    The smoothing factors are chosen per series from a grid by one-step-ahead
+    squared error. Every grid candidate is filtered at once: the recursion
+    runs over time and each step is one vectorized update of a
+    (candidates, series) state, so fitting a batch costs as many NumPy steps
+    as the window has points. The states and error sums of all candidates
+    are kept, so `update` warm-starts the fit when a point is appended: one
+    step of the same recursion gives exactly the fit over the longer history.
+    """
+
+    def __init__(self, trend=True, alphas=SMOOTHING_ALPHAS, betas=SMOOTHING_BETAS):
+        self.trend = trend
+        alpha_grid, beta_grid = np.meshgrid(alphas, betas if trend else [0.0], indexing="ij")
+        self.alphas = alpha_grid.ravel()[:, None] # (candidates, 1), broadcast against series
+        self.betas = beta_grid.ravel()[:, None]
+
+    def fit(self, values):
+        """Fits a (series, time) matrix, right-aligned and NaN-padded on the left (see stack_windows)."""
+        values = np.asarray(values, dtype=np.float64)
+        shape = (len(self.alphas), len(values))
+        self.level = np.full(shape, np.nan)
+        self.slope = np.zeros(shape)
+        self.sse = np.zeros(shape)
+        self.counts = np.zeros(len(values), dtype=np.int64)
+        for column in values.T:
+            self.update(column)
+        return self
+
+    def update(self, values):
+        """Appends one point per series (NaN to skip a series) and advances every candidate's state."""
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+        if valid.all() and self.counts.min() >= 2:
+            # Every series past its start: the plain recursion, in place
+            error = values - self.level - self.slope
+            self.sse += error ** 2
+            error *= self.alphas
+            self.level += self.slope + error
+            self.slope += self.betas * error # beta * (new level - old level - old trend)
+            self.counts += 1
+            return self
+        first = valid & (self.counts == 0)
+        second = valid & (self.counts == 1)
+        later = valid & (self.counts >= 2)
+
+        # One-step-ahead errors of the fitted part of the history
+        prediction = self.level + self.slope
+        error = values - prediction
+        self.sse += np.where(later, error ** 2, 0.0)
+        level = prediction + self.alphas * error
+        slope = self.slope + self.betas * (level - self.level - self.slope)
+
+        # The first point sets the level; the second one sets the trend (Holt) or is smoothed (simple)
+        start_slope = values - self.level if self.trend else self.slope
+        start_level = values if self.trend else level
+        self.level = np.where(first, values, np.where(second, start_level, np.where(later, level, self.level)))
+        self.slope = np.where(second, start_slope, np.where(later, slope, self.slope))
+        self.counts += valid
+        return self
+
+    def best(self):
+        """Index of each series' candidate with the lowest error so far."""
+        return np.argmin(self.sse, axis=0)
+
+    def parameters(self):
+        """Returns the chosen (alpha, beta) of each series."""
+        best = self.best()
+        return self.alphas[best, 0], self.betas[best, 0]
+
+    def residual_std(self):
+        """Standard deviation of the chosen candidates' one-step errors (NaN until two errors exist)."""
+        best = self.best()
+        errors = self.counts - 2
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sqrt(self.sse[best, np.arange(len(best))] / np.where(errors > 1, errors - 1, np.nan))
+
+    def forecast(self, horizon):
+        """(series, horizon) point forecasts: level + h * trend of the chosen candidates."""
+        best, series = self.best(), np.arange(len(self.counts))
+        steps = np.arange(1, horizon + 1)
+        return self.level[best, series][:, None] + self.slope[best, series][:, None] * steps
+
+
+def _batched_lstsq(design, target, mask):
+    """Per-series normal equations (gram, moment) of (series, rows, k) designs, ignoring masked-out rows."""
+    design = np.where(mask[:, :, None], design, 0.0)
+    target = np.where(mask, target, 0.0)
+    gram = np.einsum("srk,srl->skl", design, design)
+    moment = np.einsum("srk,sr->sk", design, target)
+    return gram, moment
+
+
+def _solve(gram, moment):
+    diagonal = np.einsum("skk->sk", gram)
+    regularized = gram + np.eye(gram.shape[1]) * (RIDGE * diagonal + RIDGE)[:, :, None]
+    return np.linalg.solve(regularized, moment[:, :, None])[:, :, 0]
+
+
+def _lagged(values, lags, start):
+    """(series, rows, lags) matrix of values[t - 1 .. t - lags] for t = start .. end."""
+    return np.stack([values[:, start - lag:values.shape[1] - lag] for lag in range(1, lags + 1)], axis=2) if lags else \
+        np.empty((values.shape[0], values.shape[1] - start, 0))
+
+
+class ARIMAModel:
+    """ARIMA(p, d, q) with a constant, fitted to a batch of series by least squares.
+
+    The series are differenced d times and the ARMA part is fitted in two
+    least-squares stages (Hannan-Rissanen): a long autoregression estimates
+    the innovations, then the differenced values are regressed on their p
+    lags and the q lagged innovations. Each stage solves every series' normal
+    equations in one batched call. The AR and MA coefficients are each scaled
+    so their absolute values sum to at most MAX_COEFFICIENT_SUM, a sufficient
+    condition for a stationary, invertible model (otherwise an over-differenced
+    series makes the innovations recursion diverge). The innovations are then recomputed
+    recursively with the fitted coefficients (conditional sum of squares).
+
+    `update` warm-starts the fit when a point is appended: the new row is
+    added to the stored normal equations (a rank-one update) and the small
+    per-series systems are re-solved, without revisiting the history.
+    """
+
+    def __init__(self, order=DEFAULT_ARIMA_ORDER):
+        self.p, self.d, self.q = order
+
+    @property
+    def order(self):
+        return self.p, self.d, self.q
+
+    def fit(self, values):
+        """Fits a (series, time) matrix, right-aligned and NaN-padded on the left (see stack_windows)."""
+        values = np.asarray(values, dtype=np.float64)
+        p, d, q = self.order
+        # Last value of each differencing level, to integrate forecasts back
+        self.tails = []
+        differenced = values
+        for _ in range(d):
+            self.tails.append(differenced[:, -1].copy())
+            differenced = np.diff(differenced, axis=1)
+        series, length = differenced.shape
+
+        innovations = np.zeros_like(differenced)
+        if q:
+            # Stage 1: long autoregression, its residuals stand in for the innovations
+            lags = min(max(p + q, 3), max(length // 3, 1))
+            design = np.concatenate([np.ones((series, length - lags, 1)), _lagged(differenced, lags, lags)], axis=2)
+            target = differenced[:, lags:]
+            mask = ~np.isnan(target) & ~np.isnan(design).any(axis=2)
+            coefficients = _solve(*_batched_lstsq(design, target, mask))
+            residuals = target - np.einsum("srk,sk->sr", np.nan_to_num(design), coefficients)
+            innovations[:, lags:] = np.where(mask, residuals, 0.0)
+
+        # Stage 2: regress on p lags of the series and q lags of the innovations
+        start = max(p, q)
+        design = np.concatenate([
+            np.ones((series, length - start, 1)), _lagged(differenced, p, start), _lagged(innovations, q, start),
+        ], axis=2)
+        target = differenced[:, start:]
+        mask = ~np.isnan(target) & ~np.isnan(design).any(axis=2)
+        self.gram, self.moment = _batched_lstsq(design, target, mask)
+        self.coefficients = self._constrain(_solve(self.gram, self.moment))
+
+        # Conditional innovations of the fitted model, oldest first
+        self.history = np.full((series, p), np.nan) # Latest p differenced values, most recent first
+        self.errors = np.zeros((series, q)) # Latest q innovations, most recent first
+        self.sse = np.zeros(series)
+        self.counts = np.zeros(series, dtype=np.int64)
+        for column in differenced.T:
+            self._step(column, learn=False)
+        return self
+
+    def _constrain(self, coefficients):
+        for part in (slice(1, 1 + self.p), slice(1 + self.p, None)):
+            total = np.abs(coefficients[:, part]).sum(axis=1)
+            coefficients[:, part] *= np.minimum(1.0, MAX_COEFFICIENT_SUM / np.maximum(total, 1e-300))[:, None]
+        return coefficients
+
+    def _predict(self):
+        constant = self.coefficients[:, 0]
+        ar = self.coefficients[:, 1:1 + self.p]
+        ma = self.coefficients[:, 1 + self.p:]
+        return constant + (ar * self.history).sum(axis=1) + (ma * self.errors).sum(axis=1)
+
+    def _step(self, value, learn):
+        valid = ~np.isnan(value)
+        prediction = self._predict()
+        ready = valid & ~np.isnan(prediction)
+        error = np.where(ready, value - prediction, 0.0)
+        if learn and ready.any():
+            row = np.concatenate([np.ones((len(value), 1)), self.history, self.errors], axis=1)
+            row = np.where(ready[:, None], row, 0.0)
+            self.gram += row[:, :, None] * row[:, None, :]
+            self.moment += row * np.where(ready, value, 0.0)[:, None]
+            self.coefficients = self._constrain(_solve(self.gram, self.moment))
+        self.sse += error ** 2
+        self.counts += ready
+        if self.p:
+            shifted = np.concatenate([value[:, None], self.history[:, :-1]], axis=1)
+            self.history = np.where(valid[:, None], shifted, self.history)
+        if self.q:
+            shifted = np.concatenate([error[:, None], self.errors[:, :-1]], axis=1)
+            self.errors = np.where(valid[:, None], shifted, self.errors)
+
+    def update(self, values):
+        """Appends one point per series (NaN to skip a series) and refits from the updated normal equations."""
+        value = np.asarray(values, dtype=np.float64)
+        for level in range(self.d):
+            difference = value - self.tails[level]
+            self.tails[level] = np.where(np.isnan(value), self.tails[level], value)
+            value = difference
+        self._step(value, learn=True)
+        return self
+
+    def residual_std(self):
+        """Standard deviation of the one-step innovations (NaN until two exist)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sqrt(self.sse / np.where(self.counts > 1, self.counts - 1, np.nan))
+
+    def forecast(self, horizon):
+        """(series, horizon) point forecasts: the ARMA recursion with future innovations at zero, integrated d times."""
+        history, errors = self.history.copy(), self.errors.copy()
+        constant = self.coefficients[:, 0]
+        ar, ma = self.coefficients[:, 1:1 + self.p], self.coefficients[:, 1 + self.p:]
+        forecasts = np.empty((len(constant), horizon))
+        for step in range(horizon):
+            forecasts[:, step] = constant + (ar * history).sum(axis=1) + (ma * errors).sum(axis=1)
+            if self.p:
+                history = np.concatenate([forecasts[:, step:step + 1], history[:, :-1]], axis=1)
+            if self.q:
+                errors = np.concatenate([np.zeros((len(constant), 1)), errors[:, :-1]], axis=1)
+        for tail in reversed(self.tails):
+            forecasts = tail[:, None] + np.cumsum(forecasts, axis=1)
+        return forecasts
@@ -0,0 +1,119 @@
+import concurrent.futures
+import numpy as np
+from src.config_base import LIQUIDITY_SHORTFALL_THRESHOLD, LIQUIDITY_SURPLUS_THRESHOLD
+from src.liquidity_forecast import simulate_paths
+
+FAN_QUANTILES = (0.05, 0.5, 0.95)
+SKETCH_BINS = 1024
+SKETCH_SPREAD = 8.0 # Sketch range: trend line +/- this many standard deviations of the day's position
+CHUNK_ELEMENTS = 1 << 22 # Simulated positions held in memory at once (series x paths x horizon)
+
+
+def apply_haircut(values, haircut):
+    """Stress adjustment of the Liquidity tab: every position loses `haircut` of its absolute value."""
+    if haircut:
+        values -= np.abs(values) * haircut
+    return values
+
+
+class PathSketch:
+    """Fixed-size histogram of simulated positions per (series, day), plus threshold crossing counts.
+
+    Bins span a per-(series, day) range set in advance from the trend fit, so
+    paths can be added in chunks and discarded: memory depends on series x
+    horizon x bins, not on the number of paths. Sketches of the same range merge
+    by adding counts. Quantiles are interpolated within a bin, so their error is
+    at most one bin width (range / SKETCH_BINS); positions outside the range
+    are counted in the edge bins.
+    """
+
+    def __init__(self, low, high, bins=SKETCH_BINS, shortfall=LIQUIDITY_SHORTFALL_THRESHOLD, surplus=LIQUIDITY_SURPLUS_THRESHOLD):
+        self.low = np.asarray(low, dtype=np.float64)
+        self.width = (np.asarray(high, dtype=np.float64) - self.low) / bins
+        self.bins = bins
+        # Scalars or one threshold per series
+        self.shortfall = np.broadcast_to(np.asarray(shortfall, dtype=np.float64), self.low.shape[:1])[:, None, None]
+        self.surplus = np.broadcast_to(np.asarray(surplus, dtype=np.float64), self.low.shape[:1])[:, None, None]
+        self.counts = np.zeros(self.low.shape + (bins,), dtype=np.int64)
+        self.shortfall_counts = np.zeros(self.low.shape, dtype=np.int64)
+        self.surplus_counts = np.zeros(self.low.shape, dtype=np.int64)
+        self.paths = 0
+
+    def add(self, paths):
+        """Adds a (series, paths, horizon) chunk of simulated positions."""
+        series, count, horizon = paths.shape
+        bins = ((paths - self.low[:, None, :]) / self.width[:, None, :]).astype(np.int64)
+        np.clip(bins, 0, self.bins - 1, out=bins)
+        cells = (np.arange(series)[:, None, None] * horizon + np.arange(horizon)) * self.bins + bins
+        self.counts += np.bincount(cells.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        self.shortfall_counts += (paths < self.shortfall).sum(axis=1)
+        self.surplus_counts += (paths > self.surplus).sum(axis=1)
+        self.paths += count
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.shortfall_counts += other.shortfall_counts
+        self.surplus_counts += other.surplus_counts
+        self.paths += other.paths
+        return self
+
+    def quantiles(self, levels=FAN_QUANTILES):
+        """Returns a (levels, series, horizon) array of quantiles, interpolated within their bin."""
+        cumulative = np.cumsum(self.counts, axis=-1)
+        result = np.empty((len(levels),) + self.low.shape)
+        for position, level in enumerate(levels):
+            rank = level * self.paths
+            bin_index = np.minimum((cumulative < rank).sum(axis=-1), self.bins - 1)[..., None]
+            inside = np.take_along_axis(self.counts, bin_index, axis=-1)[..., 0]
+            below = np.take_along_axis(cumulative, bin_index, axis=-1)[..., 0] - inside
+            fraction = np.where(inside > 0, (rank - below) / np.maximum(inside, 1), 0.5)
+            result[position] = self.low + self.width * (bin_index[..., 0] + fraction)
+        return result
+
+    def shortfall_probability(self):
+        return self.shortfall_counts / max(self.paths, 1)
+
+    def surplus_probability(self):
+        return self.surplus_counts / max(self.paths, 1)
+
+
+def sketch_range(fit, horizon, haircut=0.0):
+    """Per-(series, day) sketch range: the trend line +/- SKETCH_SPREAD standard deviations, stressed like the paths."""
+    days = np.arange(horizon)
+    center = fit.start_values()[:, None] + fit.slope[:, None] * days
+    spread = SKETCH_SPREAD * np.maximum(fit.volatility[:, None] * np.sqrt(np.maximum(days, 1)), 1.0)
+    # The haircut is monotonic, so it maps the range bounds onto the stressed range
+    return apply_haircut(center - spread, haircut), apply_haircut(center + spread, haircut)
+
+
+def _sketch_chunks(fit, horizon, chunks, seeds, haircut, low, high, bins, shortfall, surplus):
+    sketch = PathSketch(low, high, bins, shortfall, surplus)
+    for paths, seed in zip(chunks, seeds):
+        sketch.add(apply_haircut(simulate_paths(fit, horizon, paths, seed, dtype=np.float64), haircut))
+    return sketch
+
+
+def monte_carlo_forecast(fit, horizon, num_paths=10_000, seed=None, haircut=0.0, chunk_paths=None, workers=None, bins=SKETCH_BINS,
+                         shortfall=LIQUIDITY_SHORTFALL_THRESHOLD, surplus=LIQUIDITY_SURPLUS_THRESHOLD):
+    """Runs `num_paths` seeded forecast paths per series of a TrendFit and returns their PathSketch.
+
+    Paths are simulated `chunk_paths` at a time (by default as many as fit in
+    CHUNK_ELEMENTS), stressed by `haircut`, added to the sketch and dropped.
+    Each chunk draws from its own child of the seed's SeedSequence, so results
+    are reproducible whether the chunks run in this process or are spread over
+    `workers` processes (each sketching its share, merged at the end).
+    `shortfall` / `surplus` are scalars or one threshold per series.
+    """
+    low, high = sketch_range(fit, horizon, haircut)
+    chunk_paths = chunk_paths or max(1, CHUNK_ELEMENTS // max(len(fit) * horizon, 1))
+    chunks = [min(chunk_paths, num_paths - start) for start in range(0, num_paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    if not workers or workers < 2 or len(chunks) < 2:
+        return _sketch_chunks(fit, horizon, chunks, seeds, haircut, low, high, bins, shortfall, surplus)
+    workers = min(workers, len(chunks))
+    sketch = PathSketch(low, high, bins, shortfall, surplus)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        shares = [pool.submit(_sketch_chunks, fit, horizon, chunks[worker::workers], seeds[worker::workers], haircut, low, high, bins, shortfall, surplus) for worker in range(workers)]
+        for share in shares:
+            sketch.merge(share.result())
+    return sketch
@@ -0,0 +1,148 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+from src.config_base import LIQUIDITY_ALERT_PROBABILITY, LIQUIDITY_SCAN_INTERVAL_SECONDS, liquidity_thresholds
+from src.liquidity_forecast import TrendFit, stack_windows
+
+ALERT_COLUMNS = [
+    "Institution", "Stablecoin", "Corridor", "Alert", "Earliest Breach", "Day",
+    "Probability", "Magnitude", "Threshold", "Net Position", "First Seen",
+]
+ALERT_TYPES = ("Shortfall", "Surplus")
+
+
+def normal_cdf(z):
+    """Standard normal CDF, vectorized (Abramowitz-Stegun 7.1.26, absolute error below 1e-7)."""
+    z = np.asarray(z, dtype=np.float64)
+    x = np.abs(z) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-x * x)
+    return 0.5 * (1.0 + np.sign(z) * erf)
+
+
+def breach_probabilities(fit, horizon, shortfall, surplus):
+    """Per-(series, day) probabilities of ending below `shortfall` and above `surplus`.
+
+    Uses the distribution simulate_paths samples from: on forecast day j a
+    series is normal around its trend line with standard deviation
+    volatility * sqrt(j), so the probabilities are exact and need no paths.
+    Returns (expected, below, above), each (series, horizon).
+    """
+    days = np.arange(horizon)
+    expected = fit.start_values()[:, None] + fit.slope[:, None] * days
+    volatility = np.where(fit.counts < 2, 0.0, fit.volatility) # Flat paths for too-short series
+    spread = volatility[:, None] * np.sqrt(days)
+    shortfall, surplus = shortfall[:, None], surplus[:, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        below = np.where(spread > 0, normal_cdf((shortfall - expected) / spread), expected < shortfall)
+        above = np.where(spread > 0, 1.0 - normal_cdf((surplus - expected) / spread), expected > surplus)
+    return expected, below, above
+
+
+class LiquidityScanner:
+    """Periodic early-warning scan of every series in a LiquidityStore.
+
+    A scan fits all series (from their online estimators when given), gets
+    each day's shortfall / surplus probability against the institution's
+    thresholds in one vectorized pass, and keeps one alert per series and
+    alert type: its earliest day at LIQUIDITY_ALERT_PROBABILITY or above, the
+    peak probability and the largest expected breach. Alerts are ranked by
+    probability, then earliest day, then magnitude, and keep the time they
+    were first seen across scans. `maybe_scan` only rescans once the store
+    has changed and `interval` seconds have passed.
+    """
+
+    def __init__(self, store, estimators=None, horizon=7, interval=LIQUIDITY_SCAN_INTERVAL_SECONDS):
+        self.store = store
+        self.estimators = estimators
+        self.horizon = horizon
+        self.interval = interval
+        self.alerts = pd.DataFrame(columns=ALERT_COLUMNS)
+        self.scanned_at = None
+        self.scan_seconds = 0.0
+        self.series_scanned = 0
+        self._dirty = True
+        self._first_seen = {} # (series key, alert type) -> time the alert was first raised
+        self._threshold_keys = []
+        self._thresholds = (np.empty(0), np.empty(0))
+        self._lock = threading.Lock()
+        store.add_listener(self._on_append, self._on_batch)
+
+    def _on_append(self, store, key, timestamps, values):
+        self._dirty = True
+
+    def _on_batch(self, store, keys, rows, timestamps, values):
+        self._dirty = True
+
+    def thresholds(self, keys):
+        """(shortfall, surplus) arrays for the keys; store keys are only ever added, so only new ones are looked up."""
+        known = len(self._threshold_keys)
+        if keys[:known] != self._threshold_keys:
+            known = 0
+            self._threshold_keys, self._thresholds = [], (np.empty(0), np.empty(0))
+        if len(keys) > known:
+            added = np.array([liquidity_thresholds(key[0]) for key in keys[known:]], dtype=np.float64).reshape(-1, 2)
+            self._thresholds = (np.concatenate([self._thresholds[0], added[:, 0]]), np.concatenate([self._thresholds[1], added[:, 1]]))
+            self._threshold_keys = list(keys)
+        return self._thresholds
+
+    def maybe_scan(self, now=None):
+        """Rescans if the store changed and the scan interval has elapsed; returns the current alerts."""
+        now = time.time() if now is None else now
+        if self.scanned_at is None or (self._dirty and now - self.scanned_at >= self.interval):
+            return self.scan(now)
+        return self.alerts
+
+    def scan(self, now=None):
+        """Scans every series now and returns the ranked alert table."""
+        now = time.time() if now is None else now
+        started = time.perf_counter()
+        with self._lock:
+            self._dirty = False
+            with self.store.lock: # Consistent with points being appended meanwhile
+                keys, _, last_times = stack_windows(self.store, window=1)
+                if self.estimators is not None:
+                    fit = self.estimators.fit(keys)
+                else:
+                    fit = TrendFit(stack_windows(self.store, keys)[1])
+            shortfall, surplus = self.thresholds(keys)
+            expected, below, above = breach_probabilities(fit, self.horizon, shortfall, surplus)
+
+            frames, seen = [], {}
+            for alert, probability, threshold, excess in (
+                ("Shortfall", below, shortfall, shortfall[:, None] - expected),
+                ("Surplus", above, surplus, expected - surplus[:, None]),
+            ):
+                breached = probability >= LIQUIDITY_ALERT_PROBABILITY
+                rows = np.flatnonzero(breached.any(axis=1))
+                if not len(rows):
+                    continue
+                day = breached[rows].argmax(axis=1) # Earliest breach day
+                first_seen = []
+                for row in rows.tolist():
+                    seen_key = (keys[row], alert)
+                    seen[seen_key] = self._first_seen.get(seen_key, now)
+                    first_seen.append(seen[seen_key])
+                frames.append(pd.DataFrame({
+                    "Institution": [keys[row][0] for row in rows],
+                    "Stablecoin": [keys[row][1] for row in rows],
+                    "Corridor": [keys[row][2] for row in rows],
+                    "Alert": alert,
+                    "Earliest Breach": last_times[rows] + (day + 1) * np.timedelta64(1, "D"),
+                    "Day": day + 1,
+                    "Probability": probability[rows].max(axis=1),
+                    "Magnitude": np.maximum(excess[rows].max(axis=1), 0.0),
+                    "Threshold": threshold[rows],
+                    "Net Position": fit.last_values[rows],
+                    "First Seen": pd.to_datetime(first_seen, unit="s"),
+                }, columns=ALERT_COLUMNS))
+            self._first_seen = seen # Alerts that cleared are forgotten
+
+            alerts = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=ALERT_COLUMNS)
+            self.alerts = alerts.sort_values(["Probability", "Day", "Magnitude"], ascending=[False, True, False], ignore_index=True)
+            self.scanned_at = now
+            self.series_scanned = len(keys)
+            self.scan_seconds = time.perf_counter() - started
+            return self.alerts
@@ -0,0 +1,226 @@
+import threading
+import numpy as np
+import pandas as pd
+from src.liquidity_generator import LIQUIDITY_COLUMNS
+
+DEFAULT_SERIES_CAPACITY = 1024 # Points retained per series unless set otherwise
+
+
+class SeriesBuffer:
+    """Fixed-capacity buffer of the latest (timestamp, net position) points of one series.
+
+    Points are appended to arrays of twice the capacity; once they are full,
+    the latest points move to fresh arrays (one extra copy per point on
+    average, as the mirrored writes of a ring buffer). A written slot is never
+    written again, so a window is a view that does not change afterwards:
+    readers take it without the store lock and without copying. The arrays,
+    end and size are published together as one tuple, after the points.
+    """
+
+    def __init__(self, capacity=DEFAULT_SERIES_CAPACITY):
+        self.capacity = capacity
+        # (times, values, end, size, version): the latest `size` points are [end - size, end);
+        # version counts the points ever appended and changes with every append
+        self._state = (np.empty(2 * capacity, dtype="datetime64[ns]"), np.empty(2 * capacity, dtype=np.float64), 0, 0, 0)
+
+    def __len__(self):
+        return self._state[3]
+
+    @property
+    def size(self):
+        return self._state[3]
+
+    @property
+    def version(self):
+        return self._state[4]
+
+    def _room(self, times, values, end, size, count):
+        """Arrays with room for `count` more points after `end`, moving the latest points still needed to fresh ones."""
+        if end + count <= len(values):
+            return times, values, end
+        keep = min(size, self.capacity - count)
+        fresh_times, fresh_values = np.empty_like(times), np.empty_like(values)
+        fresh_times[:keep], fresh_values[:keep] = times[end - keep:end], values[end - keep:end]
+        return fresh_times, fresh_values, keep
+
+    def append(self, timestamp, value):
+        times, values, end, size, version = self._state
+        if end == len(values):
+            times, values, end = self._room(times, values, end, size, 1)
+        times[end] = timestamp
+        values[end] = value
+        self._state = (times, values, end + 1, min(size + 1, self.capacity), version + 1)
+
+    def extend(self, timestamps, values):
+        """Appends points in order; only the last `capacity` of them are written."""
+        timestamps = np.asarray(timestamps, dtype="datetime64[ns]")[-self.capacity:]
+        new_values = np.asarray(values, dtype=np.float64)[-self.capacity:]
+        count = len(new_values)
+        times, values, end, size, version = self._state
+        times, values, end = self._room(times, values, end, size, count)
+        times[end:end + count] = timestamps
+        values[end:end + count] = new_values
+        self._state = (times, values, end + count, min(size + count, self.capacity), version + count)
+
+    def window(self, length=None):
+        """Returns views of the timestamps and values of the latest `length` points (all by default)."""
+        times, values, end, size, _ = self._state
+        length = size if length is None else min(length, size)
+        return times[end - length:end], values[end - length:end]
+
+    def resized(self, capacity):
+        """Returns a buffer of a new capacity holding the latest points of this one."""
+        buffer = SeriesBuffer(capacity)
+        buffer.extend(*self.window(capacity))
+        times, values, end, size, _ = buffer._state
+        buffer._state = (times, values, end, size, self.version + 1) # Its window may have shrunk
+        return buffer
+
+
+class LiquidityStore:
+    """Liquidity positions keyed by (institution, stablecoin, corridor), one ring buffer per series.
+
+    Appending a point and reading a series' latest window are O(1) and do not
+    touch other series; each series keeps its own retention (number of points),
+    so a busy series never evicts another one's history. DataFrames are only
+    built on request, for plotting and exports.
+
+    Writers are serialized by `lock`; readers of one series (window, last,
+    series, version) take no lock and get views that later appends never
+    change, so one store can be shared by every session of the app. Hold the
+    lock to read several series at the same point in time.
+    """
+
+    def __init__(self, capacity=DEFAULT_SERIES_CAPACITY):
+        self.capacity = capacity # Retention of series without their own setting
+        self._series = {}
+        self._listeners = []
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return sum(len(buffer) for buffer in list(self._series.values()))
+
+    def __contains__(self, key):
+        return key in self._series
+
+    def keys(self):
+        """Returns the (institution, stablecoin, corridor) keys of all series, in insertion order."""
+        return list(self._series)
+
+    def add_listener(self, callback, batch_callback=None):
+        """Registers callback(store, key, timestamps, values), called after points are appended to a series.
+
+        `batch_callback(store, keys, rows, timestamps, values)`, if given, is called
+        once per `append_many` batch instead of `callback` once per series.
+        """
+        with self.lock:
+            self._listeners.append((callback, batch_callback))
+
+    def _notify(self, key, timestamps, values):
+        for callback, _ in self._listeners:
+            callback(self, key, timestamps, values)
+
+    def _buffer(self, key):
+        buffer = self._series.get(key)
+        if buffer is None:
+            buffer = self._series[key] = SeriesBuffer(self.capacity)
+        return buffer
+
+    def set_retention(self, key, capacity):
+        """Sets how many points a series keeps, keeping its latest points."""
+        with self.lock:
+            buffer = self._series.get(key)
+            self._series[key] = buffer.resized(capacity) if buffer is not None else SeriesBuffer(capacity)
+
+    def retention(self, key):
+        buffer = self._series.get(key)
+        return buffer.capacity if buffer is not None else self.capacity
+
+    def version(self, key):
+        """Version counter of a series: changes whenever its points change (0 for unknown series)."""
+        buffer = self._series.get(key)
+        return buffer.version if buffer is not None else 0
+
+    def append(self, key, timestamp, net_position):
+        """Appends one point to a series, evicting its oldest point once the series is full."""
+        timestamp = np.datetime64(timestamp, "ns")
+        with self.lock:
+            self._buffer(key).append(timestamp, net_position)
+            if self._listeners:
+                self._notify(key, np.array([timestamp]), np.array([net_position], dtype=np.float64))
+
+    def extend(self, frame):
+        """Appends the rows of a DataFrame with the LIQUIDITY_COLUMNS, series by series, in row order."""
+        with self.lock:
+            groups = frame.groupby(["Institution", "Stablecoin", "Corridor"], sort=False, observed=True).indices
+            timestamps = pd.to_datetime(frame["Timestamp"]).to_numpy(dtype="datetime64[ns]")
+            positions = frame["Net Position"].to_numpy(dtype=np.float64)
+            for key, rows in groups.items():
+                self._buffer(key).extend(timestamps[rows], positions[rows])
+                if self._listeners:
+                    self._notify(key, timestamps[rows], positions[rows])
+
+    def append_many(self, keys, rows, timestamps, values):
+        """Appends a batch of points across many series: point i goes to series keys[rows[i]].
+
+        Points of the same series keep their batch order. The batch is grouped
+        by series with one stable sort, and listeners see it as a whole.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        timestamps = np.asarray(timestamps, dtype="datetime64[ns]")
+        values = np.asarray(values, dtype=np.float64)
+        order = np.argsort(rows, kind="stable")
+        sorted_rows = rows[order]
+        bounds = np.flatnonzero(np.diff(sorted_rows)) + 1
+        groups = list(zip(np.concatenate([[0], bounds]).tolist(), np.concatenate([bounds, [len(rows)]]).tolist()))
+        with self.lock:
+            if not len(rows):
+                return
+            for start, stop in groups:
+                buffer = self._buffer(keys[sorted_rows[start]])
+                if stop - start == 1:
+                    point = order[start]
+                    buffer.append(timestamps[point], values[point])
+                else:
+                    points = order[start:stop]
+                    buffer.extend(timestamps[points], values[points])
+            for callback, batch_callback in self._listeners:
+                if batch_callback is not None:
+                    batch_callback(self, keys, rows, timestamps, values)
+                else:
+                    for start, stop in groups:
+                        points = order[start:stop]
+                        callback(self, keys[sorted_rows[start]], timestamps[points], values[points])
+
+    def window(self, key, length=None):
+        """Returns views of the latest `length` timestamps and net positions of a series (empty if unknown).
+
+        Read without the lock; the views are a snapshot that later appends do
+        not modify, so they can be kept without copying.
+        """
+        buffer = self._series.get(key)
+        if buffer is None:
+            return np.empty(0, dtype="datetime64[ns]"), np.empty(0, dtype=np.float64)
+        return buffer.window(length)
+
+    def last(self, key):
+        """Returns the latest net position of a series, or None if it has no points."""
+        _, values = self.window(key, 1)
+        return float(values[0]) if len(values) else None
+
+    def series(self, key, length=None):
+        """Returns a series' latest points as a pandas Series indexed by Timestamp (backed by the buffer views)."""
+        timestamps, values = self.window(key, length)
+        return pd.Series(values, index=pd.DatetimeIndex(timestamps, name="Timestamp"), name="Net Position", copy=False)
+
+    def to_dataframe(self):
+        """Returns every retained point as one DataFrame with the LIQUIDITY_COLUMNS."""
+        with self.lock:
+            frames = []
+            for (institution, stablecoin, corridor), buffer in self._series.items():
+                timestamps, values = buffer.window()
+                frames.append(pd.DataFrame({
+                    "Timestamp": timestamps, "Institution": institution, "Corridor": corridor,
+                    "Stablecoin": stablecoin, "Net Position": values,
+                }, columns=LIQUIDITY_COLUMNS))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=LIQUIDITY_COLUMNS)
@@ -0,0 +1,160 @@
+import concurrent.futures
+import itertools
+import numpy as np
+import pandas as pd
+from src.config_base import (
+    FX_RATES, STRESS_OUTFLOW_SHOCKS, STRESS_VOLATILITY_MULTIPLIERS, STRESS_FX_SHOCKS, STRESS_CORRIDOR_SHUTDOWNS,
+    STRESS_REPORTING_CURRENCY, STRESS_CONFIDENCE, liquidity_thresholds
+)
+from src.fx_engine import FXEngine
+from src.liquidity_forecast import TrendFit, simulate_paths, stack_windows
+from src.liquidity_monte_carlo import CHUNK_ELEMENTS, apply_haircut
+
+STRESS_PATHS = 1_000 # Paths per scenario
+
+
+class StressScenario:
+    """One stress scenario: outflow shock, volatility multiplier, FX shocks and shut corridors.
+
+    `fx_shocks` maps (sending, receiving) pairs of FX_RATES to relative moves
+    (-0.10 = the rate falls 10%); the inverse pair moves accordingly. Positive
+    balances in shut corridors are trapped, so they count as zero.
+    """
+
+    def __init__(self, outflow_shock=0.0, volatility_multiplier=1.0, fx_shocks=None, shutdowns=(), name=None):
+        self.outflow_shock = outflow_shock
+        self.volatility_multiplier = volatility_multiplier
+        self.fx_shocks = dict(fx_shocks or {})
+        self.shutdowns = tuple(shutdowns)
+        self.name = name or self.describe()
+
+    def describe(self):
+        parts = [f"Outflow {self.outflow_shock:.0%}", f"Vol x{self.volatility_multiplier:g}"]
+        parts += [f"FX {sending}/{receiving} {shock:+.0%}" for (sending, receiving), shock in self.fx_shocks.items()]
+        parts += [f"Shut {corridor}" for corridor in self.shutdowns]
+        return " / ".join(parts)
+
+    def rates(self, base_rates=FX_RATES):
+        """Returns the FX table with this scenario's shocks applied (and mirrored onto inverse quotes)."""
+        rates = dict(base_rates)
+        for (sending, receiving), shock in self.fx_shocks.items():
+            rate = base_rates[(sending, receiving)] * (1 + shock)
+            rates[(sending, receiving)] = rate
+            if (receiving, sending) in rates:
+                rates[(receiving, sending)] = 1 / rate
+        return rates
+
+
+def stress_grid(outflow_shocks=STRESS_OUTFLOW_SHOCKS, volatility_multipliers=STRESS_VOLATILITY_MULTIPLIERS,
+                fx_shocks=STRESS_FX_SHOCKS, corridor_shutdowns=STRESS_CORRIDOR_SHUTDOWNS):
+    """Every combination of the given shocks, as a list of StressScenario."""
+    return [
+        StressScenario(outflow, multiplier, fx, shutdowns)
+        for outflow, multiplier, fx, shutdowns in itertools.product(outflow_shocks, volatility_multipliers, fx_shocks, corridor_shutdowns)
+    ]
+
+
+def _evaluate(scenarios, inputs, horizon, chunks, seeds):
+    """Worst-case positions and breach days of each scenario, for every institution.
+
+    Every scenario draws the same random numbers (one seed per path chunk):
+    scenarios differ only by their shocks, which keeps comparisons between
+    them stable.
+    """
+    blocks, shortfall = inputs["blocks"], inputs["shortfall"][:, None, None]
+    num_paths = sum(chunks)
+    results = []
+    for scenario in scenarios:
+        fit = TrendFit.from_estimates(
+            inputs["counts"], inputs["slope"], inputs["intercept"],
+            inputs["volatility"] * scenario.volatility_multiplier, inputs["last_values"],
+        )
+        engine = FXEngine.from_rates(scenario.rates())
+        fx = engine.rates(inputs["stablecoins"], np.full(len(inputs["stablecoins"]), STRESS_REPORTING_CURRENCY, dtype=object))
+        cap = np.where(np.isin(inputs["corridors"], scenario.shutdowns), 0.0, np.inf)[:, None, None]
+        minima, breach_counts = [], np.zeros((len(inputs["institutions"]), horizon), dtype=np.int64)
+        for paths, seed in zip(chunks, seeds):
+            positions = apply_haircut(simulate_paths(fit, horizon, paths, seed, dtype=np.float64), scenario.outflow_shock)
+            np.minimum(positions, cap, out=positions) # Trapped balances
+            breach_counts += _per_institution(positions < shortfall, blocks, np.any).sum(axis=1)
+            positions *= fx[:, None, None]
+            minima.append(_per_institution(positions, blocks, np.sum).min(axis=2)) # Each path's lowest institution total
+        worst = np.quantile(np.concatenate(minima, axis=1), 1 - STRESS_CONFIDENCE, axis=1)
+        breached = breach_counts / num_paths >= 1 - STRESS_CONFIDENCE
+        breach_day = np.where(breached.any(axis=1), breached.argmax(axis=1) + 1.0, np.nan)
+        results.append((worst, breach_day))
+    return results
+
+
+def _per_institution(values, blocks, reduce):
+    """Reduces per-series rows to per-institution rows (see stress_inputs for the row layout)."""
+    return np.concatenate([
+        reduce(values[start:stop].reshape((-1, size) + values.shape[1:]), axis=1) for start, stop, size in blocks
+    ])
+
+
+def stress_inputs(keys, fit):
+    """Arrays the scenario evaluation needs.
+
+    Series are sorted by their institution's series count, then institution,
+    so the institutions with k series form one contiguous block of rows that
+    reshapes to (institutions, k, ...): per-institution totals are then plain
+    sums over an axis, several times faster than ufunc.reduceat.
+    """
+    institutions = np.array([key[0] for key in keys], dtype=object)
+    names, codes, sizes = np.unique(institutions, return_inverse=True, return_counts=True)
+    order = np.lexsort((codes, sizes[codes]))
+    institution_order = np.lexsort((np.arange(len(names)), sizes))
+    blocks, start = [], 0
+    for size in np.unique(sizes):
+        stop = start + size * int((sizes == size).sum())
+        blocks.append((start, stop, int(size)))
+        start = stop
+    return {
+        "institutions": names[institution_order], "blocks": blocks,
+        "counts": fit.counts[order], "slope": fit.slope[order], "intercept": fit.intercept[order],
+        "volatility": fit.volatility[order], "last_values": fit.last_values[order],
+        "stablecoins": np.array([keys[row][1] for row in order], dtype=object),
+        "corridors": np.array([keys[row][2] for row in order], dtype=object),
+        "shortfall": np.array([liquidity_thresholds(keys[row][0])[0] for row in order], dtype=np.float64),
+    }
+
+
+def run_stress_pack(store, scenarios=None, horizon=14, num_paths=STRESS_PATHS, seed=0, estimators=None, workers=None):
+    """Evaluates every scenario against every series of a LiquidityStore.
+
+    Returns two scenario x institution DataFrames: the worst-case total net
+    position in STRESS_REPORTING_CURRENCY (the 1 - STRESS_CONFIDENCE quantile of
+    each path's lowest total over the horizon) and the first forecast day on
+    which any of the institution's series breaches its shortfall threshold
+    with probability 1 - STRESS_CONFIDENCE or more (NaN if none). Paths are
+    simulated in chunks of about CHUNK_ELEMENTS positions; with `workers`,
+    the scenarios are sharded over a process pool.
+    """
+    scenarios = stress_grid() if scenarios is None else list(scenarios)
+    if estimators is not None:
+        with store.lock:
+            keys = store.keys()
+            fit = estimators.fit(keys)
+    else:
+        keys, values, _ = stack_windows(store)
+        fit = TrendFit(values)
+    inputs = stress_inputs(keys, fit)
+    chunk_paths = max(1, CHUNK_ELEMENTS // max(len(keys) * horizon, 1))
+    chunks = [min(chunk_paths, num_paths - start) for start in range(0, num_paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+
+    if not workers or workers < 2 or len(scenarios) < 2:
+        results = _evaluate(scenarios, inputs, horizon, chunks, seeds)
+    else:
+        workers = min(workers, len(scenarios))
+        results = [None] * len(scenarios)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            shares = [pool.submit(_evaluate, scenarios[worker::workers], inputs, horizon, chunks, seeds) for worker in range(workers)]
+            for worker, share in enumerate(shares):
+                results[worker::workers] = share.result()
+
+    index = pd.Index([scenario.name for scenario in scenarios], name="Scenario")
+    worst_case = pd.DataFrame([worst for worst, _ in results], index=index, columns=inputs["institutions"])
+    breach_days = pd.DataFrame([days for _, days in results], index=index, columns=inputs["institutions"])
+    return worst_case.sort_index(axis=1), breach_days.sort_index(axis=1)
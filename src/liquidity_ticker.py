@@ -0,0 +1,174 @@
+import queue
+import threading
+import time
+import numpy as np
+from src.config_base import base_positions_and_trends
+from src.liquidity_generator import DEFAULT_TRIPLET_CONFIG
+
+DEFAULT_TICK_RATE = 10 # Ticks per second across all series
+TICK_BATCH_SECONDS = 0.1 # The producer emits one batch per interval
+MAX_PENDING_BATCHES = 8 # Batches queued for the store before the producer is held back
+NOISE_SCALE = 1.5 # Noise of a tick relative to the series' configured volatility (as generate_new_liquidity_point)
+POSITION_LIMIT = 500000 # Ticks are kept within +/- this position
+
+
+class LiquidityTicker:
+    """Background simulator streaming ticks for every series of a LiquidityStore.
+
+    A producer thread emits one batch of ticks per TICK_BATCH_SECONDS at the
+    target `rate`, visiting the series round-robin, each tick being
+    generate_new_liquidity_point computed for the whole batch with NumPy (last
+    position + trend + noise). A consumer thread drains every queued batch and
+    writes them to the store with one `append_many`, so listeners (estimators,
+    scanner) see one update per drain however high the rate.
+
+    The queue between them is bounded: when the store falls behind, the
+    producer blocks on it (backpressure) and the achieved rate drops instead
+    of memory growing; time spent blocked is counted in `stats()`. After a
+    stall the producer resumes its schedule from now rather than bursting to
+    catch up. Series added to the store after `start` are ticked after the
+    next restart.
+    """
+
+    def __init__(self, store, rate=DEFAULT_TICK_RATE, batch_seconds=TICK_BATCH_SECONDS, max_pending=MAX_PENDING_BATCHES,
+                 trends=None, seed=None):
+        self.store = store
+        self.rate = rate
+        self.batch_seconds = batch_seconds
+        self.trends = trends # Optional {series key: {"trend_per_day", "volatility"}}; the config's by default
+        self._queue = queue.Queue(max_pending)
+        self._rng = np.random.default_rng(seed)
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self.produced = 0
+        self.applied = 0
+        self.batches = 0 # append_many calls
+        self.stalls = 0
+        self.stalled_seconds = 0.0
+        self.started_at = None
+        self.stopped_at = None
+
+    @property
+    def running(self):
+        return bool(self._threads)
+
+    def start(self):
+        """Starts the producer and consumer threads (idempotent)."""
+        with self._lock:
+            if self._threads:
+                return self
+            self._load_series()
+            self._stop.clear()
+            self.started_at, self.stopped_at = time.perf_counter(), None
+            self.produced = self.applied = self.batches = self.stalls = 0
+            self.stalled_seconds = 0.0
+            self._threads = [
+                threading.Thread(target=self._produce, name="liquidity-ticker-producer", daemon=True),
+                threading.Thread(target=self._consume, name="liquidity-ticker-consumer", daemon=True),
+            ]
+            for thread in self._threads:
+                thread.start()
+        return self
+
+    def stop(self):
+        """Stops both threads; batches already queued are still written to the store."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        self._stop.set()
+        for thread in threads:
+            thread.join()
+        if threads:
+            self.stopped_at = time.perf_counter()
+
+    def _load_series(self):
+        trends = self.trends if self.trends is not None else base_positions_and_trends
+        with self.store.lock:
+            self._keys = self.store.keys()
+            last = [self.store.last(key) for key in self._keys]
+        self._last = np.array([0.0 if value is None else value for value in last])
+        configs = [trends.get(key, DEFAULT_TRIPLET_CONFIG) for key in self._keys]
+        self._trend = np.array([config["trend_per_day"] for config in configs], dtype=np.float64)
+        self._noise = np.array([config["volatility"] for config in configs], dtype=np.float64) * NOISE_SCALE
+        self._schedule = self._rng.permutation(len(self._keys)) # Round-robin order over the series
+        self._cursor = 0
+
+    def _next_batch(self, count):
+        """(rows, values) of the next `count` ticks; rows index the keys loaded at start."""
+        series = len(self._keys)
+        rows = self._schedule[(self._cursor + np.arange(count)) % series]
+        self._cursor = (self._cursor + count) % series
+        values = np.empty(count)
+        # Each round of `series` ticks visits every series once, so positions build on the previous round
+        for start in range(0, count, series):
+            round_rows = rows[start:start + series]
+            positions = self._last[round_rows] + self._trend[round_rows] + self._rng.standard_normal(len(round_rows)) * self._noise[round_rows]
+            positions = np.clip(positions, -POSITION_LIMIT, POSITION_LIMIT).round(2)
+            self._last[round_rows] = positions
+            values[start:start + series] = positions
+        return rows, values
+
+    def _produce(self):
+        if not self._keys:
+            return
+        deadline = time.perf_counter()
+        carry = 0.0 # Fractional ticks owed to the next batch
+        while not self._stop.is_set():
+            carry += self.rate * self.batch_seconds
+            count = int(carry)
+            carry -= count
+            if count:
+                rows, values = self._next_batch(count)
+                batch = (rows, np.datetime64(time.time_ns(), "ns"), values)
+                try:
+                    self._queue.put_nowait(batch)
+                except queue.Full:
+                    # Backpressure: wait for the consumer instead of growing the queue
+                    self.stalls += 1
+                    blocked = time.perf_counter()
+                    while not self._stop.is_set():
+                        try:
+                            self._queue.put(batch, timeout=self.batch_seconds)
+                            break
+                        except queue.Full:
+                            pass
+                    self.stalled_seconds += time.perf_counter() - blocked
+                self.produced += count
+            deadline += self.batch_seconds
+            now = time.perf_counter()
+            if now > deadline + self.batch_seconds:
+                deadline = now # Behind schedule: skip the missed batches instead of bursting
+            else:
+                self._stop.wait(max(0.0, deadline - now))
+
+    def _consume(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                batches = [self._queue.get(timeout=self.batch_seconds)]
+            except queue.Empty:
+                continue
+            while True: # Coalesce everything queued meanwhile into one store update
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = np.concatenate([rows for rows, _, _ in batches])
+            timestamps = np.concatenate([np.full(len(rows), timestamp) for rows, timestamp, _ in batches])
+            values = np.concatenate([values for _, _, values in batches])
+            # Only the series in this update are passed on, indexed by their position among them
+            unique_rows, batch_rows = np.unique(rows, return_inverse=True)
+            self.store.append_many([self._keys[row] for row in unique_rows.tolist()], batch_rows, timestamps, values)
+            self.applied += len(rows)
+            self.batches += 1
+
+    def stats(self):
+        """Returns tick counters, the achieved rate and the current queue depth."""
+        if self.started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.stopped_at or time.perf_counter()) - self.started_at
+        return {
+            "running": self.running, "rate": self.rate, "produced": self.produced, "applied": self.applied,
+            "batches": self.batches, "queued": self._queue.qsize(), "stalls": self.stalls,
+            "stalled_seconds": self.stalled_seconds, "ticks_per_second": self.applied / elapsed if elapsed else 0.0,
+        }
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+NET_POSITION_COLUMNS = ["Institution", "Stablecoin", "Net Position"]
+NET_TRANSFER_COLUMNS = ["Stablecoin", "From Institution", "To Institution", "Amount"]
+
+
+def _window(store, name, rows, start, stop):
+    return store.column(name, start, stop) if rows is None else store.take(name, rows)
+
+
+def net_position_cents(store, rows=None, start=0, stop=None):
+    """Net position of every (institution, stablecoin) over a window of ledger rows, in integer cents.
+
+    Each payment is an obligation of the sending institution to the receiving
+    one, denominated in the receiving stablecoin: the amount is "Amount
+    Received", i.e. "Amount Sent" converted at the FX rate in force when the
+    payment settled, so cross-coin legs net in the coin the receiver is owed. The
+    window is the row range [start, stop) or the given row ids (e.g. a
+    LedgerIndex query). Returns an (institution code x stablecoin code) int64
+    array; positive means the institution is owed funds. Each column sums to 0.
+    """
+    with store.lock:
+        senders = _window(store, "Sending Institution", rows, start, stop)
+        receivers = _window(store, "Receiving Institution", rows, start, stop)
+        coins = _window(store, "Receiving Stablecoin", rows, start, stop)
+        # Received amounts are rounded to cents, so integer cents net exactly
+        cents = np.rint(_window(store, "Amount Received", rows, start, stop) * 100).astype(np.int64)
+        institution_count = len(store.vocabulary("Sending Institution"))
+        coin_count = len(store.vocabulary("Receiving Stablecoin"))
+
+    cells = institution_count * coin_count
+    owed = np.bincount(receivers.astype(np.int64) * coin_count + coins, weights=cents, minlength=cells)
+    owing = np.bincount(senders.astype(np.int64) * coin_count + coins, weights=cents, minlength=cells)
+    # bincount sums in float64, which is exact for cent totals below 2**53
+    return (owed - owing).astype(np.int64).reshape(institution_count, coin_count)
+
+
+def settlement_transfers(positions):
+    """Turns one stablecoin's net positions (cents, summing to 0) into settlement transfers.
+
+    Debtors and creditors are each ordered by size and matched along their
+    cumulative totals, so every transfer closes at least one position. This
+    yields at most (debtors + creditors - 1) transfers, never more than the
+    number of institutions with a non-zero position minus one.
+    Returns (debtor indexes, creditor indexes, amounts in cents).
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    debtors = np.flatnonzero(positions < 0)
+    creditors = np.flatnonzero(positions > 0)
+    debtors = debtors[np.argsort(positions[debtors], kind="stable")]
+    creditors = creditors[np.argsort(-positions[creditors], kind="stable")]
+    paid = np.cumsum(-positions[debtors])
+    received = np.cumsum(positions[creditors])
+    # Every break point of either running total ends one transfer
+    breaks = np.union1d(paid, received)
+    amounts = np.diff(breaks, prepend=0)
+    return debtors[np.searchsorted(paid, breaks)], creditors[np.searchsorted(received, breaks)], amounts
+
+
+def net_settlement(store, rows=None, start=0, stop=None):
+    """Multilaterally nets a window of ledger entries.
+
+    Returns (positions, transfers): the non-zero net position per institution
+    and stablecoin, and the settlement transfers that clear them, both as
+    DataFrames (NET_POSITION_COLUMNS / NET_TRANSFER_COLUMNS, amounts in coin units).
+    """
+    cents = net_position_cents(store, rows, start, stop)
+    institutions = np.array(store.vocabulary("Sending Institution").values, dtype=object)
+    coins = np.array(store.vocabulary("Receiving Stablecoin").values, dtype=object)
+
+    institution_codes, coin_codes = np.nonzero(cents)
+    positions = pd.DataFrame({
+        "Institution": institutions[institution_codes],
+        "Stablecoin": coins[coin_codes],
+        "Net Position": cents[institution_codes, coin_codes] / 100,
+    }, columns=NET_POSITION_COLUMNS)
+
+    transfers = []
+    for coin_code in np.flatnonzero(cents.any(axis=0)):
+        debtors, creditors, amounts = settlement_transfers(cents[:, coin_code])
+        transfers.append(pd.DataFrame({
+            "Stablecoin": coins[coin_code],
+            "From Institution": institutions[debtors],
+            "To Institution": institutions[creditors],
+            "Amount": amounts / 100,
+        }, columns=NET_TRANSFER_COLUMNS))
+    transfers = pd.concat(transfers, ignore_index=True) if transfers else pd.DataFrame(columns=NET_TRANSFER_COLUMNS)
+    return positions, transfers
@@ -0,0 +1,340 @@
+import collections
+import re
+import threading
+import time
+import unicodedata
+import numpy as np
+import pandas as pd
+from src.config_base import SANCTIONS_EDIT_RATIO, SANCTIONS_MAX_EDITS, SANCTIONS_NAME_STOPWORDS
+
+WATCHLIST_COLUMNS = ["Entry ID", "Name", "List"] # An alias is one more row with the same Entry ID
+SCREENING_COLUMNS = ["Name", "Entry ID", "Watchlist Name", "List", "Distance", "Score"]
+GRAM = 4 # Characters per n-gram (longer grams are rarer, so fewer candidates; shorter ones tolerate more edits)
+SIGNATURE_BITS = 256 # Per watchlist name, one bit per gram (modulo)
+VECTORIZED_VERIFY_CANDIDATES = 24 # From this many candidates, edit distances are computed as array operations
+SCREENING_CACHE_SIZE = 10_000 # Recently screened names whose result is kept
+_PAD = " " * (GRAM - 1)
+_GRAM_HASH = np.int64(1_000_003)
+_BYTE_BITS = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+_ACCENTS = re.compile(r"[\u0300-\u036f]") # Combining marks left by NFKD decomposition
+_SEPARATORS = re.compile(r"[\W_]+")
+_STOPWORDS = frozenset(SANCTIONS_NAME_STOPWORDS)
+
+
+def normalize_name(name):
+    """Case- and accent-folded name with punctuation and legal-form words (Ltd, Inc, ...) removed."""
+    name = str(name)
+    if not name.isascii():
+        name = _ACCENTS.sub("", unicodedata.normalize("NFKD", name))
+    return " ".join(token for token in _SEPARATORS.sub(" ", name.casefold()).split() if token not in _STOPWORDS)
+
+
+def normalize_names(names):
+    """normalize_name over a whole column of names; missing names normalize to an empty string."""
+    return [normalize_name(name) for name in pd.Series(names, dtype=object).fillna("")]
+
+
+def _gram_codes(chars):
+    """Codes of every n-gram of an array of code points.
+
+    A polynomial hash (wrapping int64 arithmetic): two grams sharing a code
+    only make the filters looser, never hide a match.
+    """
+    codes = np.zeros(len(chars) - GRAM + 1, dtype=np.int64)
+    for position in range(GRAM):
+        codes = codes * _GRAM_HASH + chars[position:len(chars) - GRAM + 1 + position]
+    return codes
+
+
+def _gather(offsets, values, items):
+    """Concatenation of the CSR ranges values[offsets[item]:offsets[item + 1]] of `items`, and each range's length."""
+    starts = offsets[items]
+    counts = offsets[items + 1] - starts
+    ends = np.cumsum(counts)
+    return values[np.arange(ends[-1] if len(ends) else 0) + np.repeat(starts - (ends - counts), counts)], counts
+
+
+def _popcount(words):
+    """Set bits per row of a 2-D uint64 array (np.bitwise_count on NumPy 2, a byte table on NumPy 1.x)."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    return _BYTE_BITS[np.ascontiguousarray(words).view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+def _chars(text):
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+
+
+def bounded_edit_distance(a, b, limit):
+    """Levenshtein distance of a and b, or limit + 1 as soon as it is known to exceed `limit`.
+
+    Only the diagonal band of width 2 * limit + 1 is computed.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if a == b:
+        return 0
+    beyond = limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        current = [beyond] * (len(b) + 1)
+        current[0] = i if i <= limit else beyond
+        best = current[0]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (char != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < best:
+                best = cost
+        if best > limit:
+            return beyond
+        previous = current
+    return min(previous[len(b)], beyond)
+
+
+def edit_distances(query, texts):
+    """Levenshtein distances of `query` (at most 64 characters) to many texts at once.
+
+    Myers' bit-parallel algorithm, vectorized over the texts: the query's
+    columns of the DP matrix are bits of one uint64 per text, and each
+    character position of the texts is a few array operations.
+    """
+    counts = np.array([len(text) for text in texts], dtype=np.int64)
+    width = int(counts.max(initial=0))
+    chars = _chars("".join(text.ljust(width, "\0") for text in texts)).reshape(len(texts), width)
+    # Bit i of a character's mask is set where query[i] is that character
+    alphabet = sorted(set(query))
+    masks = np.zeros(len(alphabet), dtype=np.uint64)
+    for position, char in enumerate(query):
+        masks[alphabet.index(char)] |= np.uint64(1 << position)
+    alphabet = _chars("".join(alphabet))
+    slots = np.minimum(np.searchsorted(alphabet, chars), len(alphabet) - 1)
+    equal = np.where(alphabet[slots] == chars, masks[slots], np.uint64(0))
+
+    one, last = np.uint64(1), np.uint64(1 << (len(query) - 1))
+    positive = np.full(len(texts), np.uint64((1 << len(query)) - 1)) # Vertical +1 deltas
+    negative = np.zeros(len(texts), dtype=np.uint64) # Vertical -1 deltas
+    score = np.full(len(texts), len(query), dtype=np.int64)
+    distances = np.where(counts == 0, len(query), 0)
+    for column in range(width):
+        match = equal[:, column]
+        diagonal = (((match & positive) + positive) ^ positive) | match | negative
+        horizontal_positive = negative | ~(diagonal | positive)
+        horizontal_negative = positive & diagonal
+        score += (horizontal_positive & last) != 0
+        score -= (horizontal_negative & last) != 0
+        horizontal_positive = (horizontal_positive << one) | one
+        horizontal_negative = horizontal_negative << one
+        positive = horizontal_negative | ~(diagonal | horizontal_positive)
+        negative = horizontal_positive & diagonal
+        ending = counts == column + 1
+        distances[ending] = score[ending]
+    return distances
+
+
+def read_watchlist(file, file_name=None):
+    """Reads a watchlist from a CSV or Parquet file (path or file-like object) with the WATCHLIST_COLUMNS."""
+    file_name = file_name or getattr(file, "name", None) or str(file)
+    watchlist = pd.read_parquet(file) if file_name.lower().endswith((".parquet", ".pq")) else pd.read_csv(file, dtype=str)
+    if "Name" not in watchlist.columns:
+        raise ValueError("Watchlist file is missing the required Name column.")
+    if "Entry ID" not in watchlist.columns:
+        watchlist["Entry ID"] = [f"WL{row + 1:07d}" for row in range(len(watchlist))]
+    if "List" not in watchlist.columns:
+        watchlist["List"] = "Watchlist"
+    return watchlist[WATCHLIST_COLUMNS].dropna(subset=["Name"]).reset_index(drop=True)
+
+
+class ScreeningIndex:
+    """Fuzzy name index over a watchlist: character n-gram postings plus bounded edit-distance verification.
+
+    Names are normalized, padded and cut into GRAM-character grams. A name
+    matches an entry within k edits, where k grows with the name's length
+    (SANCTIONS_EDIT_RATIO, at most SANCTIONS_MAX_EDITS). One edit destroys
+    at most GRAM of a name's grams, so a match has a length within k and
+    shares at least |grams| - GRAM * k grams, hence one of any GRAM * k + 1.
+    Postings are kept per (gram, name length), so a query reads only the
+    entries of possible lengths, and only for its GRAM * k + 1 rarest grams
+    at each length. The shared grams of those candidates are bounded from a
+    per-name bit signature, then counted exactly from each name's own gram
+    list, and the edit distance is computed on the few left. Entries sharing
+    a normalized name are indexed once; all arrays are CSR, built in a few
+    vectorized passes.
+    """
+
+    def __init__(self, watchlist, chunk_entries=200_000):
+        started = time.perf_counter()
+        self.entry_ids = watchlist["Entry ID"].astype(str).to_numpy(dtype=object)
+        self.names = watchlist["Name"].astype(str).to_numpy(dtype=object)
+        self.lists = watchlist["List"].astype(str).to_numpy(dtype=object)
+        # Entries sharing a normalized name (aliases, duplicates across lists) are indexed and verified once
+        names, self.normalized = pd.factorize(pd.Series(normalize_names(self.names), dtype=object))
+        self.normalized = self.normalized.tolist()
+        self.name_rows = np.argsort(names, kind="stable")
+        self.name_offsets = np.r_[0, np.cumsum(np.bincount(names, minlength=len(self.normalized)))].astype(np.int64)
+        self.lengths = np.array([len(name) for name in self.normalized], dtype=np.int64)
+        self.length_slots = int(self.lengths.max(initial=0)) + 1
+
+        codes, entries = [], []
+        for start in range(0, len(self.normalized), chunk_entries):
+            chunk = [_PAD + name + _PAD if name else "" for name in self.normalized[start:start + chunk_entries]]
+            padded = np.array([len(name) for name in chunk], dtype=np.int64)
+            chars = _chars("".join(chunk))
+            if len(chars) < GRAM:
+                continue
+            # A gram is kept when it starts far enough from the end of its own name
+            owner = np.repeat(np.arange(start, start + len(chunk)), padded)[:len(chars) - GRAM + 1]
+            offset = np.arange(len(chars) - GRAM + 1) - np.repeat(np.cumsum(padded) - padded, padded)[:len(chars) - GRAM + 1]
+            keep = offset <= padded[owner - start] - GRAM
+            codes.append(_gram_codes(chars)[keep])
+            entries.append(owner[keep].astype(np.int32))
+        codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.int64)
+        entries = np.concatenate(entries) if entries else np.empty(0, dtype=np.int32)
+
+        # Dense gram ids, numbered in code order so a query gram is found by binary search
+        grams, gram_codes = pd.factorize(codes)
+        order = np.argsort(gram_codes)
+        self.gram_codes = gram_codes[order]
+        grams = np.argsort(order).astype(np.int32)[grams]
+        del codes
+
+        # Postings per (gram, length) key, entries ascending within each (stable sort of entry-ordered grams)
+        keys = grams.astype(np.int64) * self.length_slots + self.lengths[entries]
+        order = np.argsort(keys, kind="stable")
+        keys, postings = keys[order], entries[order]
+        # Drop a gram repeated within one name
+        repeated = np.zeros(len(keys), dtype=bool)
+        repeated[1:] = (keys[1:] == keys[:-1]) & (postings[1:] == postings[:-1])
+        keys, self.postings = keys[~repeated], postings[~repeated]
+        first = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, dtype=np.int64)
+        self.keys = keys[first]
+        self.offsets = np.r_[first, len(keys)].astype(np.int64)
+        # Each entry's own grams, for counting the grams a candidate shares with a query (already grouped by entry)
+        kept = np.ones(len(entries), dtype=bool)
+        kept[order[repeated]] = False
+        self.entry_grams, entries = grams[kept], entries[kept]
+        self.entry_offsets = np.r_[0, np.cumsum(np.bincount(entries, minlength=len(self.normalized)))].astype(np.int64)
+        # And a SIGNATURE_BITS-bit signature of them: a cheap upper bound on the grams a candidate can share
+        self.signatures = np.zeros((len(self.normalized), SIGNATURE_BITS // 64), dtype=np.uint64)
+        bits = self.entry_grams % SIGNATURE_BITS
+        np.bitwise_or.at(self.signatures, (entries, bits // 64), np.left_shift(np.uint64(1), (bits % 64).astype(np.uint64)))
+        self._recent = collections.OrderedDict() # Normalized name -> best match of the latest screened names (counterparties repeat)
+        self._recent_lock = threading.Lock() # The index is shared by every session of the app
+        self.build_seconds = time.perf_counter() - started
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_file(cls, file, file_name=None):
+        return cls(read_watchlist(file, file_name))
+
+    def search(self, name, limit=5):
+        """Returns up to `limit` watchlist entries matching `name`, best first, as (row, distance, score) tuples."""
+        return self._search(normalize_name(name), limit)
+
+    def _search(self, query, limit=5):
+        if not query or not len(self.gram_codes):
+            return []
+        edits = min(SANCTIONS_MAX_EDITS, int(len(query) * SANCTIONS_EDIT_RATIO))
+        codes = np.unique(_gram_codes(_chars(_PAD + query + _PAD)))
+        grams = np.minimum(np.searchsorted(self.gram_codes, codes), len(self.gram_codes) - 1)
+        grams = grams[self.gram_codes[grams] == codes] # Grams of the index only
+        required = max(len(codes) - GRAM * edits, 1)
+        if len(grams) < required:
+            return []
+
+        # Postings of every (gram, possible length)
+        lengths = np.arange(max(len(query) - edits, 1), min(len(query) + edits + 1, self.length_slots))
+        probes = grams[:, None].astype(np.int64) * self.length_slots + lengths[None, :]
+        slots = np.minimum(np.searchsorted(self.keys, probes), len(self.keys) - 1)
+        sizes = np.where(self.keys[slots] == probes, self.offsets[slots + 1] - self.offsets[slots], 0)
+
+        # Prefix filter: a match holds at least one of any len(codes) - required + 1 of the query's grams, so for
+        # each length only the rarest of them are read; grams missing from the index count among them
+        rarest = np.argsort(sizes, axis=0, kind="stable")[:len(grams) - required + 1]
+        slots = np.take_along_axis(slots, rarest, axis=0)[np.take_along_axis(sizes, rarest, axis=0) > 0]
+        if not len(slots):
+            return []
+        candidates = np.unique(_gather(self.offsets, self.postings, slots)[0])
+        if required > 1:
+            # Shared grams: bounded from the signatures first, then counted exactly on the candidates left
+            # (query grams sharing a bit are counted once by the popcount, so they are added back)
+            signature = np.zeros(SIGNATURE_BITS // 64, dtype=np.uint64)
+            bits = grams % SIGNATURE_BITS
+            np.bitwise_or.at(signature, bits // 64, np.left_shift(np.uint64(1), (bits % 64).astype(np.uint64)))
+            collisions = len(grams) - int(_popcount(signature[None, :])[0])
+            possible = _popcount(self.signatures[candidates] & signature) + collisions
+            candidates = candidates[possible >= required]
+            if len(candidates):
+                candidate_grams, counts = _gather(self.entry_offsets, self.entry_grams, candidates)
+                query_grams = np.zeros(len(self.gram_codes), dtype=bool)
+                query_grams[grams] = True
+                shared = np.add.reduceat(query_grams[candidate_grams], np.cumsum(counts) - counts, dtype=np.int64)
+                candidates = candidates[shared >= required]
+
+        lengths = self.lengths[candidates]
+        if len(candidates) >= VECTORIZED_VERIFY_CANDIDATES and len(query) <= 64:
+            distances = edit_distances(query, [self.normalized[name] for name in candidates.tolist()])
+        else:
+            distances = np.array([bounded_edit_distance(query, self.normalized[name], edits) for name in candidates.tolist()], dtype=np.int64)
+        close = distances <= edits
+        scores = 1 - distances[close] / np.maximum(lengths[close], len(query))
+        matches = []
+        for name, distance, score in sorted(zip(candidates[close].tolist(), distances[close].tolist(), scores.tolist()), key=lambda match: (-match[2], match[0])):
+            rows = self.name_rows[self.name_offsets[name]:self.name_offsets[name + 1]]
+            matches.extend((row, distance, score) for row in rows.tolist()[:limit - len(matches)])
+            if len(matches) >= limit:
+                break
+        return matches
+
+    def screen(self, name):
+        """Best watchlist match of one name as a dict of the SCREENING_COLUMNS, or None."""
+        query = normalize_name(name)
+        with self._recent_lock:
+            match = self._recent.get(query, False)
+        if match is False:
+            matches = self._search(query, limit=1) # Outside the lock: other sessions' lookups do not wait for it
+            match = matches[0] if matches else None
+            with self._recent_lock:
+                self._recent[query] = match
+                if len(self._recent) > SCREENING_CACHE_SIZE:
+                    self._recent.popitem(last=False) # Oldest first
+        if match is None:
+            return None
+        row, distance, score = match
+        return {"Name": name, "Entry ID": self.entry_ids[row], "Watchlist Name": self.names[row],
+                "List": self.lists[row], "Distance": distance, "Score": round(score, 3)}
+
+    def screen_names(self, names):
+        """Screens a column of names and returns the best match of each matching one (SCREENING_COLUMNS).
+
+        Each distinct normalized name is screened once.
+        """
+        names = pd.Series(pd.unique(pd.Series(names, dtype=object).dropna().astype(str)), dtype=object)
+        normalized, distinct = pd.factorize(pd.Series(normalize_names(names), dtype=object))
+        matches = []
+        for query in distinct.tolist():
+            found = self._search(query, limit=1)
+            matches.append(found[0] if found else None)
+        return pd.DataFrame([
+            (name, self.entry_ids[match[0]], self.names[match[0]], self.lists[match[0]], match[1], round(match[2], 3))
+            for name, match in zip(names.tolist(), (matches[code] for code in normalized.tolist())) if match is not None
+        ], columns=SCREENING_COLUMNS)
+
+
+def screen_payments(payments, index):
+    """Screens both parties of every payment; returns each payment's screening error ("" when both are clear)."""
+    parties = ["Sending Institution", "Receiving Institution"]
+    hits = index.screen_names(pd.concat([payments[party] for party in parties])).set_index("Name")
+    errors = pd.Series("", index=payments.index, dtype=object)
+    for party in reversed(parties): # A payment is reported against its sending party first
+        names = payments[party].astype(str)
+        matched = names.isin(hits.index)
+        errors[matched] = (party + " '" + names[matched] + "' matches watchlist entry '" + names[matched].map(hits["Watchlist Name"])
+                           + "' (" + names[matched].map(hits["List"]) + ", " + names[matched].map(hits["Entry ID"]) + ").")
+    return errors.to_numpy()
@@ -0,0 +1,147 @@
+import asyncio
+import collections
+import itertools
+import threading
+import numpy as np
+from src.ledger_store import LedgerListenerError
+
+PENDING_STATUS = "Pending"
+SETTLED_STATUS = "Settled Instantly"
+FAILED_STATUS = "Failed" # Followed by the error, e.g. "Failed: ..."
+
+
+class LatencyModel:
+    """Log-normal settlement latency, parameterised by its mean in seconds.
+
+    `sigma` is the spread of the underlying normal distribution; 0 gives a fixed latency.
+    """
+
+    def __init__(self, mean_seconds=2.0, sigma=0.25, seed=None):
+        self.mean_seconds = mean_seconds
+        self.sigma = sigma
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+
+    def sample(self):
+        """Draws one latency in seconds."""
+        if self.mean_seconds <= 0:
+            return 0.0
+        mu = np.log(self.mean_seconds) - self.sigma ** 2 / 2 # Keeps the mean at mean_seconds
+        with self._lock:
+            return float(self._rng.lognormal(mu, self.sigma))
+
+
+class SettlementEngine:
+    """Headless settlement engine running on a background asyncio event loop.
+
+    Payments are submitted from any thread and settle concurrently after a
+    latency drawn from the latency model. Callers poll `status()` / `recent()`
+    instead of blocking; each settled entry is passed to `on_settled`, e.g.
+    LedgerStore.append. If that raises, the payment is marked "Failed: <error>"
+    instead of settled, unless the ledger committed the entry and only a
+    listener failed (LedgerListenerError): the entry is in the ledger, so the
+    payment is settled and the error counted in `listener_errors`. Nothing
+    here depends on Streamlit.
+    """
+
+    def __init__(self, on_settled=None, latency_model=None, max_tracked=10_000):
+        self.on_settled = on_settled
+        self.latency_model = latency_model or LatencyModel()
+        self.max_tracked = max_tracked # Number of settled or failed payments whose status is remembered
+        self._statuses = collections.OrderedDict() # Transaction ID -> status, in submission order
+        self._pending = {} # Transaction ID -> entry awaiting settlement
+        self._settled_order = collections.deque() # Settled or failed Transaction IDs, oldest first
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._loop = None
+        self._thread = None
+        self.settled_count = 0
+        self.failed_count = 0
+        self.listener_errors = 0
+
+    def start(self):
+        """Starts the event loop thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run_loop, name="settlement-engine", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def stop(self):
+        """Stops the event loop; payments still pending are not settled."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def submit(self, entry):
+        """Queues a ledger entry for settlement and returns its Transaction ID without waiting."""
+        self.start()
+        tx_id = entry["Transaction ID"]
+        entry = dict(entry, Status=PENDING_STATUS)
+        latency = self.latency_model.sample()
+        with self._lock:
+            self._pending[tx_id] = entry
+            self._statuses[tx_id] = PENDING_STATUS
+        self._loop.call_soon_threadsafe(self._schedule, entry, latency)
+        return tx_id
+
+    def _schedule(self, entry, latency):
+        # A timer per payment rather than a task: settlements overlap freely and
+        # the loop only pays for a heap push and pop per payment
+        self._loop.call_later(latency, self._settle, entry)
+
+    def _settle(self, entry):
+        status = SETTLED_STATUS
+        if self.on_settled is not None:
+            try:
+                self.on_settled(dict(entry, Status=SETTLED_STATUS))
+            except LedgerListenerError: # Committed to the ledger, only a follower of it failed
+                with self._lock:
+                    self.listener_errors += 1
+            except Exception as exc: # E.g. a write-ahead log error: the ledger undid the append
+                status = f"{FAILED_STATUS}: {exc}"
+        with self._lock:
+            tx_id = entry["Transaction ID"]
+            entry["Status"] = status
+            self._pending.pop(tx_id, None)
+            self._statuses[tx_id] = status
+            self._settled_order.append(tx_id)
+            if status == SETTLED_STATUS:
+                self.settled_count += 1
+            else:
+                self.failed_count += 1
+            # Forget the oldest finished payments once more than max_tracked are remembered
+            while len(self._settled_order) > self.max_tracked:
+                self._statuses.pop(self._settled_order.popleft(), None)
+            if not self._pending:
+                self._idle.notify_all()
+
+    def status(self, tx_id):
+        """Returns "Pending", "Settled Instantly", "Failed: <error>", or None for unknown IDs."""
+        with self._lock:
+            return self._statuses.get(tx_id)
+
+    def pending(self):
+        """Returns copies of the entries still awaiting settlement."""
+        with self._lock:
+            return [dict(entry) for entry in self._pending.values()]
+
+    def recent(self, limit=10):
+        """Returns the latest submissions as (Transaction ID, status) pairs, newest first."""
+        with self._lock:
+            return list(itertools.islice(reversed(self._statuses.items()), limit))
+
+    def wait_idle(self, timeout=None):
+        """Blocks until no payment is pending; returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
@@ -1,13 +1,26 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import os
 import uuid
 import datetime
 from src.config_base import FX_RATES # Import FX_RATES from config_base
+from src.fx_engine import FXEngine
+from src.ledger_store import TRANSACTION_ID_LENGTH, TRANSACTION_ID_DTYPE
 
-def get_fx_rate(sending_stablecoin, receiving_stablecoin):
-    """Retrieves the FX rate between two stablecoins."""
-    return FX_RATES.get((sending_stablecoin, receiving_stablecoin), 1.0)
+# Process-wide FX rate history, seeded with the static FX_RATES table; publish() adds newer snapshots
+fx_engine = FXEngine.from_rates(FX_RATES)
+
+def get_fx_rate(sending_stablecoin, receiving_stablecoin, timestamp=None):
+    """Retrieves the FX rate between two stablecoins as of `timestamp` (latest by default)."""
+    rate = fx_engine.rate(sending_stablecoin, receiving_stablecoin, timestamp)
+    if np.isnan(rate):
+        raise ValueError(f"No FX rate available for {sending_stablecoin} to {receiving_stablecoin}.")
+    return rate
+
+def get_fx_rates(sending_stablecoins, receiving_stablecoins, timestamps=None):
+    """Vectorized get_fx_rate over columns of stablecoins (and timestamps); unknown pairs give NaN."""
+    return fx_engine.rates(sending_stablecoins, receiving_stablecoins, timestamps)
 
 def calculate_fee(amount, priority):
     """Calculates the transaction fee based on amount and priority."""
@@ -17,6 +30,17 @@ def calculate_fee(amount, priority):
         fee *= 1.5 # 50% increase
     return max(fee, 0.01) # Minimum fee
 
+def calculate_fees(amounts, priorities):
+    """Vectorized calculate_fee over columns of amounts and priorities."""
+    fees = np.asarray(amounts, dtype=np.float64) * 0.0001 # 0.01%
+    fees = np.where(np.asarray(priorities) == "High Priority", fees * 1.5, fees) # 50% increase
+    return np.maximum(fees, 0.01) # Minimum fee
+
+def generate_transaction_ids(count):
+    """Generates `count` random transaction IDs from a single call to the OS random source."""
+    hex_digits = os.urandom(count * TRANSACTION_ID_LENGTH // 2).hex().upper()
+    return np.frombuffer(hex_digits.encode("ascii"), dtype=f"S{TRANSACTION_ID_LENGTH}").astype(TRANSACTION_ID_DTYPE)
+
 def create_ledger_entry(
     sending_institution, receiving_institution, corridor, amount_sent,
     sending_stablecoin, receiving_stablecoin, priority, fee
@@ -1,7 +1,67 @@
 import streamlit as st
 import pandas as pd
+import datetime
 import plotly.graph_objects as go
-from src.config_base import mock_compliance_alerts, dummy_volume_data, dummy_institution_activity
+from src.alert_store import ALERT_STATUSES, ALERT_PAGE_SIZE
+from src.aml_rules import RULE_SEVERITY
+
+# Chart windows: (length, bar width) in seconds, answered from the hourly compliance rollup
+COMPLIANCE_WINDOWS = {
+    "Last 24 Hours": (86400, 3600),
+    "Last 7 Days": (7 * 86400, 86400),
+    "Last 30 Days": (30 * 86400, 86400),
+}
+ACTIVITY_TOP_INSTITUTIONS = 8 # Smaller senders are grouped as "Others" in the activity chart
+
+def compliance_window(window_name, now=None):
+    """Returns the (start, end, bucket_seconds) of a chart window, whole buckets up to the current one."""
+    length, bucket_seconds = COMPLIANCE_WINDOWS[window_name]
+    now = now or datetime.datetime.now()
+    end_bucket = int(pd.Timestamp(now).timestamp()) // bucket_seconds # Naive timestamps, as stored in the ledger
+    start = pd.Timestamp((end_bucket + 1) * bucket_seconds - length, unit="s")
+    end = pd.Timestamp((end_bucket + 1) * bucket_seconds - 1, unit="s")
+    return start, end, bucket_seconds
+
+def render_alert_queue(corridor):
+    """Shows one corridor's alerts page by page from the indexed alert store, with status counts and review actions."""
+    aml_engine = st.session_state['aml_engine']
+    alerts = aml_engine.alerts
+    status_metrics = st.container() # Filled last, so the counts include a status update made below
+
+    col_filter1, col_filter2, col_filter3 = st.columns(3)
+    with col_filter1:
+        statuses = st.multiselect("Status", ALERT_STATUSES, default=[], placeholder="All statuses", key="alert_statuses")
+    with col_filter2:
+        severities = st.multiselect("Severity", sorted(set(RULE_SEVERITY.values())), default=[], placeholder="All severities", key="alert_severities")
+    with col_filter3:
+        rules = st.multiselect("Rule", list(RULE_SEVERITY), default=[], placeholder="All rules", key="alert_rules")
+    filters = dict(corridors=[corridor], statuses=statuses, severities=severities, rules=rules)
+
+    matching_rows = alerts.query(**filters) # Queried once, for the page count and the page
+    pages = max(1, -(-len(matching_rows) // ALERT_PAGE_SIZE))
+    page_number = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key="alert_page") if pages > 1 else 1
+    # Only the rows of the page are gathered from the store
+    alerts_page, total = alerts.page(page_number - 1, ALERT_PAGE_SIZE, rows=matching_rows)
+    if not alerts_page.empty:
+        st.dataframe(alerts_page, use_container_width=True, hide_index=True)
+        st.caption(f"Showing {len(alerts_page):,} of {total:,} matching alerts, newest first (page {page_number} of {pages}).")
+
+        col_review1, col_review2, col_review3 = st.columns([3, 1, 1])
+        with col_review1:
+            selected_ids = st.multiselect("Alerts to update", alerts_page["Alert ID"].tolist(), default=[], placeholder="Select alerts on this page...", key="alert_selection")
+        with col_review2:
+            new_status = st.selectbox("New Status", ALERT_STATUSES, index=1, key="alert_new_status")
+        with col_review3:
+            st.write("") # Align the button with the inputs
+            if st.button("Update Status", disabled=not selected_ids):
+                updated = alerts.set_status([alerts.row(alert_id) for alert_id in selected_ids], new_status)
+                st.success(f"{updated} alert(s) set to {new_status}.")
+    else:
+        st.info(f"No compliance alerts for {corridor} match the selected filters.")
+    status_counts = alerts.status_counts("Corridor", corridor) # Maintained counters, no scan
+    for column, status in zip(status_metrics.columns(len(ALERT_STATUSES)), ALERT_STATUSES):
+        column.metric(status, f"{status_counts[status]:,}")
+    st.caption(f"{aml_engine.processed:,} transactions screened by the velocity, structuring, large-value and new-counterparty rules.")
 
 def render_compliance_tab():
     """Renders the Compliance Analytics tab UI and handles analysis."""
@@ -12,47 +72,44 @@ def render_compliance_tab():
         # Restricted corridors
         compliance_corridor = st.selectbox("Select Corridor", ["USD-MXN", "EUR-NGN"], help="Select the corridor for analysis.")
         analysis_type = st.radio("Analysis Type", ["Transaction Volume", "Compliance Alerts", "Institution Activity"], help="Choose the type of compliance analysis.")
+        window_name = st.selectbox("Window", list(COMPLIANCE_WINDOWS), index=1, help="Time window of the volume and activity charts.")
 
         run_analysis_button = st.form_submit_button("Run Analysis")
 
     if run_analysis_button:
+        st.session_state['compliance_analysis_run'] = True # Keep the view while its own widgets (alert paging) rerun the page
+    if st.session_state.get('compliance_analysis_run'):
         if analysis_type == "Transaction Volume":
-            st.subheader(f"Daily Transaction Volume for {compliance_corridor}")
-            volume_data = dummy_volume_data.get(compliance_corridor, [0] * 7)
-            days = list(range(1, len(volume_data) + 1))
-            fig = go.Figure(data=go.Bar(x=[f"Day {d}" for d in days], y=volume_data))
-            fig.update_layout(title=f"Simulated Daily Transaction Volume - {compliance_corridor}", xaxis_title="Day", yaxis_title="Number of Transactions")
+            start, end, bucket_seconds = compliance_window(window_name)
+            granularity = "Hourly" if bucket_seconds == 3600 else "Daily"
+            st.subheader(f"{granularity} Transaction Volume for {compliance_corridor}")
+            # Summed from the rollup's cells: the cost does not depend on the ledger size
+            volume = st.session_state['compliance_rollup'].timeline(corridors=[compliance_corridor], start=start, end=end, bucket_seconds=bucket_seconds)
+            fig = go.Figure(data=go.Bar(x=volume.index, y=volume["Count"], customdata=volume["Amount Sent"],
+                                        hovertemplate="%{x}<br>%{y:,.0f} transactions<br>%{customdata:,.2f} sent<extra></extra>"))
+            fig.update_layout(title=f"{granularity} Transaction Volume - {compliance_corridor} ({window_name})", xaxis_title="Time", yaxis_title="Number of Transactions")
             st.plotly_chart(fig, use_container_width=True)
-            st.caption("Visualizing transaction flow to identify patterns.")
+            st.caption(f"{int(volume['Count'].sum()):,} transactions, {volume['Amount Sent'].sum():,.2f} sent. Visualizing transaction flow to identify patterns.")
 
         elif analysis_type == "Compliance Alerts":
-            st.subheader("Simulated Compliance Alerts")
-            alerts_df = pd.DataFrame(mock_compliance_alerts)
-            # Filter alerts relevant to selected corridor (simplified for demo)
-            if compliance_corridor == "USD-MXN":
-                filtered_alerts = alerts_df[alerts_df['Details'].str.contains("USD-MXN", na=False)]
-            elif compliance_corridor == "EUR-NGN":
-                filtered_alerts = alerts_df[alerts_df['Details'].str.contains("EUR-NGN", na=False)]
-            else:
-                filtered_alerts = pd.DataFrame() # Empty if no alerts for corridor
-
-            if not filtered_alerts.empty:
-                st.dataframe(filtered_alerts, use_container_width=True)
-            else:
-                st.info(f"No simulated compliance alerts for {compliance_corridor} at this time.")
+            st.subheader("AML Compliance Alerts")
+            render_alert_queue(compliance_corridor)
             st.caption("Monitoring transactions for suspicious activity.")
 
         elif analysis_type == "Institution Activity":
             st.subheader(f"Institution Transaction Share in {compliance_corridor}")
-            activity_data = dummy_institution_activity.get(compliance_corridor, {})
-            if activity_data:
-                labels = list(activity_data.keys())
-                values = list(activity_data.values())
-                fig = go.Figure(data=[go.Pie(labels=labels, values=values, hole=.3)])
-                fig.update_layout(title=f"Simulated Institution Transaction Share - {compliance_corridor}")
+            start, end, _ = compliance_window(window_name)
+            activity = st.session_state['compliance_rollup'].totals(by="Sending Institution", corridors=[compliance_corridor], start=start, end=end)["Count"]
+            activity = activity[activity > 0].sort_values(ascending=False)
+            if not activity.empty:
+                if len(activity) > ACTIVITY_TOP_INSTITUTIONS:
+                    others = activity.iloc[ACTIVITY_TOP_INSTITUTIONS:].sum()
+                    activity = pd.concat([activity.iloc[:ACTIVITY_TOP_INSTITUTIONS], pd.Series({"Others": others})])
+                fig = go.Figure(data=[go.Pie(labels=list(activity.index), values=activity.to_numpy(), hole=.3)])
+                fig.update_layout(title=f"Institution Transaction Share - {compliance_corridor} ({window_name})")
                 st.plotly_chart(fig, use_container_width=True)
             else:
-                st.info(f"No simulated institution activity data for {compliance_corridor}.")
+                st.info(f"No transactions in {compliance_corridor} over the {window_name.lower()}.")
             st.caption("Analyzing participant activity within corridors.")
 
         st.markdown("<div class='card'>", unsafe_allow_html=True)
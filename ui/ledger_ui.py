@@ -1,40 +1,60 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import datetime
+from src.ledger_chain import EMPTY_HASH, entry_payloads, hash_leaf, verify_inclusion
+from src.ledger_export import EXPORT_FORMATS, export_to_file
+from src.netting import net_settlement
+
+LEDGER_DISPLAY_ROWS = 10_000 # Rows rendered in the ledger table; metrics and exports cover all matches
 
 def render_ledger_tab():
     """Renders the Ledger tab UI and displays transactions."""
     st.header("Immutable Transaction Ledger")
     st.write("Every payment is logged for transparency and compliance.")
 
-    if 'transactions' in st.session_state and not st.session_state['transactions'].empty:
-        # Filter Widget
-        all_institutions = sorted(list(set(st.session_state['transactions']['Sending Institution'].tolist() + st.session_state['transactions']['Receiving Institution'].tolist())))
+    if 'ledger_store' in st.session_state and not st.session_state['ledger_store'].empty:
+        store = st.session_state['ledger_store']
+        ledger_index = st.session_state['ledger_index']
+
+        # Filter Widget (institutions come from the store's vocabulary, not a column scan)
+        all_institutions = sorted(store.vocabulary('Sending Institution').values)
         selected_institutions = st.multiselect("Filter by Institution", all_institutions, default=[], placeholder="Select institutions...")
 
         # Restricted corridors
         all_corridors = ["USD-MXN", "EUR-NGN"]
         selected_corridors = st.multiselect("Filter by Corridor", all_corridors, default=[], placeholder="Select corridors...")
 
+        first_timestamp, last_timestamp = ledger_index.time_bounds()
+        first_date, last_date = first_timestamp.astype(datetime.datetime).date(), last_timestamp.astype(datetime.datetime).date()
+        selected_dates = st.date_input("Filter by Date", value=(first_date, last_date), min_value=first_date, max_value=last_date)
+        start_time = end_time = None
+        if len(selected_dates) == 2 and selected_dates != (first_date, last_date):
+            start_time = datetime.datetime.combine(selected_dates[0], datetime.time.min)
+            end_time = datetime.datetime.combine(selected_dates[1], datetime.time.max)
 
-        filtered_df = st.session_state['transactions']
-        if selected_institutions:
-            filtered_df = filtered_df[
-                filtered_df['Sending Institution'].isin(selected_institutions) |
-                filtered_df['Receiving Institution'].isin(selected_institutions)
-            ]
-        if selected_corridors:
-            filtered_df = filtered_df[filtered_df['Corridor'].isin(selected_corridors)]
-
+        # Indexed lookup of the matching rows (None means no filter)
+        matching_rows = ledger_index.query(selected_institutions, selected_corridors, start_time, end_time)
+        matching_count = len(store) if matching_rows is None else len(matching_rows)
 
-        st.dataframe(filtered_df, use_container_width=True)
+        # Only the rows actually rendered are gathered from the store
+        if matching_rows is None:
+            display_rows = np.arange(max(0, len(store) - LEDGER_DISPLAY_ROWS), len(store))
+        else:
+            display_rows = matching_rows[-LEDGER_DISPLAY_ROWS:]
+        st.dataframe(store.to_dataframe(display_rows), use_container_width=True)
+        if matching_count > LEDGER_DISPLAY_ROWS:
+            st.caption(f"Showing the latest {LEDGER_DISPLAY_ROWS:,} of {matching_count:,} matching transactions.")
 
-        # Summary Metrics
-        total_transactions = len(filtered_df)
-        # Calculate total fees per stablecoin in the filtered data
-        if not filtered_df.empty:
-             fee_summary = filtered_df.groupby('Sending Stablecoin')['Fee'].sum().reset_index() # Fee is in Sending Stablecoin
-             fee_text_parts = [f"{row['Fee']:.4f} {row['Sending Stablecoin']}" for index, row in fee_summary.iterrows()]
-             fee_text = ", ".join(fee_text_parts)
+        # Summary Metrics, answered from the running rollups (date filters cover whole days, so they are exact)
+        fee_summary = st.session_state['ledger_rollup'].totals(
+            by='Sending Stablecoin', # Fee is in Sending Stablecoin
+            institutions=selected_institutions, corridors=selected_corridors, start=start_time, end=end_time
+        )
+        total_transactions = int(fee_summary['Count'].sum())
+        fee_summary = fee_summary[fee_summary['Count'] > 0]
+        if not fee_summary.empty:
+             fee_text = ", ".join(f"{fee:.4f} {coin}" for coin, fee in fee_summary['Fee'].items())
         else:
              fee_text = "0.0000 USD"
 
@@ -46,13 +66,77 @@ def render_ledger_tab():
              st.metric("Total Fees Collected (Shown)", fee_text)
 
 
-        # CSV Export
-        csv = filtered_df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="Export Ledger to CSV",
-            data=csv,
-            file_name='stablenet_ledger.csv',
-            mime='text/csv',
-        )
+        # Export, built only on request and streamed into a spooled file chunk by chunk
+        col_export1, col_export2 = st.columns(2)
+        with col_export1:
+            export_format = st.radio("Export Format", list(EXPORT_FORMATS), horizontal=True, help="Parquet is compact and keeps column types.")
+        with col_export2:
+            prepare_export = st.button("Prepare Export", help="Builds the export of the transactions matching the current filters.")
+        if prepare_export:
+            with st.spinner("Exporting ledger..."):
+                export_file, stats = export_to_file(store, export_format, matching_rows)
+            st.caption(f"Exported {stats.rows:,} transactions, {stats.bytes / 1e6:.1f} MB in {stats.seconds:.2f} s ({stats.bytes_per_second / 1e6:.1f} MB/s).")
+            with export_file: # Read once for the button of this run only, then the spooled file is freed
+                st.download_button(
+                    label=f"Export Ledger to {export_format}",
+                    data=export_file.read(),
+                    file_name=f"stablenet_ledger.{EXPORT_FORMATS[export_format]['extension']}",
+                    mime=EXPORT_FORMATS[export_format]['mime'],
+                    on_click="ignore", # Downloading does not rerun the page, so the button stays until the next interaction
+                )
+
+        filters_key = (tuple(selected_institutions), tuple(selected_corridors), start_time, end_time)
+        render_net_settlement(store, matching_rows, matching_count, filters_key)
+        render_ledger_integrity()
     else:
-        st.info("No transactions recorded yet. Submit a payment to see it appear here.") 
\ No newline at end of file
+        st.info("No transactions recorded yet. Submit a payment to see it appear here.")
+
+def render_net_settlement(store, matching_rows, matching_count, filters_key):
+    """Nets the filtered transactions multilaterally (on request) and shows the transfers that would settle them."""
+    with st.expander("Multilateral Netting"):
+        st.write("Net obligations per institution and stablecoin across all counterparties of the transactions shown.")
+        # Netting reads every matching row: run on request only, kept while the filters and ledger size stay the same
+        netting_key = (filters_key, len(store))
+        if st.button("Net Transactions", help="Nets the transactions matching the current filters."):
+            st.session_state['ledger_netting'] = (netting_key, matching_count) + net_settlement(store, rows=matching_rows)
+        elif st.session_state.get('ledger_netting', (None,))[0] != netting_key:
+            st.session_state.pop('ledger_netting', None)
+        if 'ledger_netting' in st.session_state:
+            _, gross_count, positions, transfers = st.session_state['ledger_netting']
+            col_netting1, col_netting2 = st.columns(2)
+            with col_netting1:
+                st.metric("Gross Settlements", f"{gross_count:,}")
+            with col_netting2:
+                st.metric("Netted Transfers", f"{len(transfers):,}")
+            st.dataframe(transfers, use_container_width=True, hide_index=True)
+            st.dataframe(positions, use_container_width=True, hide_index=True)
+
+def render_ledger_integrity():
+    """Shows the ledger's Merkle commitment and verifies inclusion proofs for single transactions."""
+    chain = st.session_state['ledger_chain']
+    with st.expander("Ledger Integrity"):
+        col_chain1, col_chain2 = st.columns(2)
+        with col_chain1:
+            st.metric("Chained Entries", len(chain))
+        with col_chain2:
+            st.metric("Sealed Blocks", len(chain.block_headers))
+        st.code(f"Merkle root: {chain.root().hex()}")
+
+        transaction_id = st.text_input("Verify Transaction ID", placeholder="e.g., 1A2B3C4D", help="Check that a transaction is included in the current Merkle root.")
+        if transaction_id:
+            store = st.session_state['ledger_store']
+            row = st.session_state['ledger_index'].find(transaction_id.strip().upper())
+            if row is None:
+                st.error(f"Transaction {transaction_id} is not in the ledger.")
+            else:
+                with store.lock: # Proof, root and entry from the same ledger size
+                    proof, root = chain.inclusion_proof(row), chain.root()
+                    # Re-hash the entry as stored now: a changed row no longer matches its chained leaf
+                    previous_leaf = chain.leaf(row - 1) if row else EMPTY_HASH
+                    leaf = hash_leaf(previous_leaf, entry_payloads(store, row, row + 1)[0])
+                if leaf != proof["leaf"]:
+                    st.error(f"Transaction {transaction_id} does not match its hash in the ledger chain: the entry was modified.")
+                elif verify_inclusion(proof, root):
+                    st.success(f"Transaction {transaction_id} is included in the ledger (proof of {len(proof['siblings']) + len(proof['peaks'])} hashes).")
+                else:
+                    st.error(f"Inclusion proof for transaction {transaction_id} failed verification.")
@@ -1,63 +1,165 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import datetime
-from src.config_base import institution_stablecoin_corridors
+from src.config_base import (
+    institution_stablecoin_corridors, LIQUIDITY_SHORTFALL_THRESHOLD, LIQUIDITY_SURPLUS_THRESHOLD,
+    LIQUIDITY_ALERT_PROBABILITY, STRESS_OUTFLOW_HAIRCUT, STRESS_REPORTING_CURRENCY, STRESS_CONFIDENCE, liquidity_thresholds
+)
 from src.data_manager import refresh_liquidity_data
+from src.liquidity_forecast import FIT_WINDOW, TrendFit, forecast_portfolio, forecast_dates as forecast_dates_after
+from src.liquidity_models import ExponentialSmoothing, ARIMAModel, DEFAULT_ARIMA_ORDER
+from src.liquidity_monte_carlo import monte_carlo_forecast, apply_haircut
+from src.liquidity_stress import run_stress_pack, stress_grid
 import numpy as np
-@st.cache_data
-def calculate_simulated_forecast_paths(data_series, forecast_horizon=7, num_paths=3):
+
+FORECAST_MODES = ["Monte Carlo Fan Chart", "EMA / ARIMA Models"]
+MONTE_CARLO_PATH_OPTIONS = [10_000, 25_000, 50_000, 100_000]
+MONTE_CARLO_SEED = 0 # Fixed seed: the same data and settings always give the same bands
+LIVE_TICK_RATES = [10, 100, 1_000, 10_000] # Ticks per second offered for the live feed, across all series
+LIVE_FEED_POINTS = 60 # Latest points of the selected series shown in the live feed
+
+def cached_forecast(series_key, version, params, compute):
+    """Looks a forecast up in the shared forecast cache, keyed by the version of the series it is computed from."""
+    return st.session_state['forecast_cache'].get_or_compute(series_key, version, params, compute)
+
+def series_snapshot(series_key):
+    """Returns a series' points, its trend fit from the online estimators and its version, read together.
+
+    The ticker updates the estimators several arrays at a time inside the
+    store lock, so reading under it gives a fit of whole ticks that matches
+    the points and the version a forecast is cached under.
+    """
+    liquidity_store = st.session_state['liquidity_store']
+    with liquidity_store.lock:
+        return liquidity_store.series(series_key), st.session_state['liquidity_estimators'].fit([series_key]), liquidity_store.version(series_key)
+
+def calculate_model_forecasts(data_series, forecast_horizon=7):
+    """Fits Holt exponential smoothing and ARIMA to a series' recent window.
+
+    Returns {model name: forecast Series} of point forecasts over the horizon.
     """
-    Calculates simulated forecast paths based on recent trend and historical volatility.
-    This is a simulation, not a true ARIMA model.
+    if data_series.empty:
+        return {}
+
+    recent_data = data_series.sort_index().tail(FIT_WINDOW)
+    values = recent_data.to_numpy()[None, :]
+    forecast_dates = forecast_dates_after(recent_data.index.max(), forecast_horizon)
+    arima = ARIMAModel(DEFAULT_ARIMA_ORDER)
+    models = {"EMA (Holt)": ExponentialSmoothing(trend=True), f"ARIMA{arima.order}": arima}
+    return {name: pd.Series(model.fit(values).forecast(forecast_horizon)[0], index=forecast_dates) for name, model in models.items()}
+
+def summarize_portfolio_forecast(liquidity_store, forecast_horizon, num_paths=1000, estimators=None):
+    """Forecasts every liquidity series in one batch and summarizes the simulated paths per series."""
+    keys, fit, paths, last_times = forecast_portfolio(liquidity_store, horizon=forecast_horizon, num_paths=num_paths, estimators=estimators)
+    return pd.DataFrame({
+        "Institution": [key[0] for key in keys],
+        "Stablecoin": [key[1] for key in keys],
+        "Corridor": [key[2] for key in keys],
+        "Net Position": fit.last_values,
+        "Trend / Day": fit.slope,
+        "Volatility": fit.volatility,
+        f"Projected in {forecast_horizon} Days": paths[:, :, -1].mean(axis=1),
+    })
+
+def calculate_monte_carlo_bands(data_series, forecast_horizon, num_paths, haircut=0.0, fit=None,
+                                thresholds=(LIQUIDITY_SHORTFALL_THRESHOLD, LIQUIDITY_SURPLUS_THRESHOLD)):
+    """Runs a seeded Monte Carlo forecast of one series (from `fit` when given, else refitted on its recent window).
+
+    Returns a DataFrame indexed by forecast date with the P5 / P50 / P95 bands and
+    the probability of being below the shortfall or above the surplus threshold
+    (`thresholds` = (shortfall, surplus)).
     """
-    if data_series.empty or len(data_series) < 2:
-        return [pd.Series()] * num_paths
-
-    recent_data = data_series.sort_index().tail(30)
-
-    if len(recent_data) < 2:
-        last_value = recent_data.iloc[-1] if not recent_data.empty else 0
-        forecast_values = [last_value] * forecast_horizon
-        last_historical_date = recent_data.index.max()
-        if not isinstance(last_historical_date, datetime.datetime) and not isinstance(last_historical_date, pd.Timestamp):
-            last_historical_date = datetime.datetime.combine(last_historical_date, datetime.datetime.min.time())
-        forecast_dates = pd.date_range(start=last_historical_date + pd.Timedelta(days=1), periods=forecast_horizon, freq='D')
-        flat_series = pd.Series(forecast_values, index=forecast_dates)
-        return [flat_series] * num_paths
-
-    x = np.arange(len(recent_data))
-    y = recent_data.values
-    try:
-        m, c = np.polyfit(x, y, 1)
-    except np.linalg.LinAlgError:
-        m, c = 0, y[-1]
-
-    daily_changes = recent_data.diff().dropna()
-    volatility = daily_changes.std() if not daily_changes.empty else 1000
-
-    last_historical_index = len(recent_data) - 1
-    primary_forecast_values = [m * (last_historical_index + 1 + i) + c for i in range(forecast_horizon)]
-
-    last_historical_date = recent_data.index.max()
-    if not isinstance(last_historical_date, datetime.datetime) and not isinstance(last_historical_date, pd.Timestamp):
-        last_historical_date = datetime.datetime.combine(last_historical_date, datetime.datetime.min.time())
-    forecast_dates = pd.date_range(start=last_historical_date + pd.Timedelta(days=1), periods=forecast_horizon, freq='D')
-
-    forecast_paths = []
-    for _ in range(num_paths):
-        path_values = []
-        current_value = primary_forecast_values[0]
-        path_values.append(current_value)
-
-        for i in range(1, forecast_horizon):
-            step_noise = np.random.normal(0, volatility)
-            current_value = path_values[-1] + m + step_noise
-            path_values.append(current_value)
-
-        forecast_paths.append(pd.Series(path_values, index=forecast_dates))
-
-    return forecast_paths
+    recent_data = data_series.sort_index().tail(FIT_WINDOW)
+    fit = fit if fit is not None else TrendFit(recent_data.to_numpy()[None, :])
+    shortfall, surplus = thresholds
+    sketch = monte_carlo_forecast(fit, forecast_horizon, num_paths, seed=MONTE_CARLO_SEED, haircut=haircut, shortfall=shortfall, surplus=surplus)
+    p5, p50, p95 = sketch.quantiles()[:, 0, :]
+    return pd.DataFrame({
+        "P5": p5, "P50": p50, "P95": p95,
+        "Shortfall Probability": sketch.shortfall_probability()[0],
+        "Surplus Probability": sketch.surplus_probability()[0],
+    }, index=forecast_dates_after(recent_data.index.max(), forecast_horizon))
+
+def render_monte_carlo_forecast(data_series, fit, version, institution, corridor, stablecoin, forecast_horizon, num_paths, simulate_stress):
+    """Draws the Monte Carlo fan chart of one series and recommends from its threshold probabilities."""
+    haircut = STRESS_OUTFLOW_HAIRCUT if simulate_stress else 0.0
+    shortfall_threshold, surplus_threshold = liquidity_thresholds(institution)
+    with st.spinner(f"Simulating {num_paths:,} liquidity paths..."):
+        bands = cached_forecast(
+            (institution, stablecoin, corridor), version, ("monte_carlo", forecast_horizon, num_paths, haircut, shortfall_threshold, surplus_threshold),
+            lambda: calculate_monte_carlo_bands(data_series, forecast_horizon, num_paths, haircut,
+                                                fit=fit,
+                                                thresholds=(shortfall_threshold, surplus_threshold))
+        )
+
+    historical_data_view = data_series.tail(30)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=historical_data_view.index, y=historical_data_view.values, mode='lines+markers', name='Historical Data', line=dict(color='blue'), marker=dict(size=5)))
+    fig.add_trace(go.Scatter(x=bands.index, y=bands['P95'], mode='lines', name='P95', line=dict(width=0), showlegend=False))
+    fig.add_trace(go.Scatter(x=bands.index, y=bands['P5'], mode='lines', name='P5 - P95', line=dict(width=0), fill='tonexty', fillcolor='rgba(255, 0, 0, 0.2)'))
+    fig.add_trace(go.Scatter(x=bands.index, y=bands['P50'], mode='lines', name='Median (P50)', line=dict(color='red', dash='dash')))
+    fig.add_hline(y=shortfall_threshold, line_dash="dash", line_color="darkred", annotation_text=f"Shortfall Threshold ({shortfall_threshold:,})", annotation_position="bottom right")
+    fig.add_hline(y=surplus_threshold, line_dash="dash", line_color="darkgreen", annotation_text=f"Surplus Threshold ({surplus_threshold:,})", annotation_position="bottom right")
+    fig.update_layout(
+        title=f"Liquidity Fan Chart - {institution} in {corridor} ({stablecoin}), {num_paths:,} paths",
+        xaxis_title="Date",
+        yaxis_title=f"Net Position ({stablecoin})",
+        hovermode="x unified",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    st.subheader("AI Recommendations")
+    recommendations = []
+    for day, (date, row) in enumerate(bands.iterrows(), start=1):
+        if row['Shortfall Probability'] >= LIQUIDITY_ALERT_PROBABILITY:
+            recommendations.append(f"{row['Shortfall Probability']:.0%} probability of a shortfall below {shortfall_threshold:,} for {institution} in {corridor} ({stablecoin}) on **{date:%Y-%m-%d}** (Day {day}, median {row['P50']:,.0f}). **Recommendation:** Source {stablecoin} or adjust flows.")
+        elif row['Surplus Probability'] >= LIQUIDITY_ALERT_PROBABILITY:
+            recommendations.append(f"{row['Surplus Probability']:.0%} probability of a surplus above {surplus_threshold:,} for {institution} in {corridor} ({stablecoin}) on **{date:%Y-%m-%d}** (Day {day}, median {row['P50']:,.0f}). **Recommendation:** Offer short-term lending on StableNet.")
+    if recommendations:
+        for rec in recommendations:
+            st.warning(rec)
+    else:
+        st.info(f"No shortfall or surplus reaches {LIQUIDITY_ALERT_PROBABILITY:.0%} probability for {institution} in {corridor} ({stablecoin}) over the next {forecast_horizon} days.")
+    st.dataframe(bands.style.format({"P5": "{:,.0f}", "P50": "{:,.0f}", "P95": "{:,.0f}", "Shortfall Probability": "{:.1%}", "Surplus Probability": "{:.1%}"}), use_container_width=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+def render_live_feed(series_key):
+    """Starts or stops the shared tick simulator (for every session) and shows the selected series as it streams."""
+    with st.expander("Live Feed (Simulated Ticks)", expanded=st.session_state['liquidity_ticker'].running):
+        ticker = st.session_state['liquidity_ticker']
+        col_live1, col_live2 = st.columns(2)
+        with col_live1:
+            streaming = st.toggle("Stream live ticks", value=ticker.running, help="Simulated ticks for every series, written to the store in batches from a background thread.")
+        with col_live2:
+            ticker.rate = st.select_slider("Ticks per second", options=LIVE_TICK_RATES, value=ticker.rate if ticker.rate in LIVE_TICK_RATES else LIVE_TICK_RATES[0])
+        if streaming and not ticker.running:
+            ticker.start()
+        elif not streaming and ticker.running:
+            ticker.stop()
+        render_live_series(series_key)
+
+@st.fragment(run_every=1)
+def render_live_series(series_key):
+    """Polls the store for the series' latest points; only this fragment reruns while ticks stream in."""
+    ticker = st.session_state['liquidity_ticker']
+    stats = ticker.stats()
+    # A snapshot read: no lock and no copy, the ticker's later appends leave these views unchanged
+    liquidity_store = st.session_state['liquidity_store']
+    times, values = liquidity_store.window(series_key, LIVE_FEED_POINTS)
+    if len(values):
+        with liquidity_store.lock: # The estimators are updated by the ticker thread, several arrays per tick
+            trend = st.session_state['liquidity_estimators'].trend(series_key)
+        col_live1, col_live2, col_live3 = st.columns(3)
+        col_live1.metric("Latest Net Position", f"{values[-1]:,.0f}")
+        col_live2.metric("Trend per Tick", f"{trend:,.0f}")
+        col_live3.metric("Ticks Applied", f"{stats['applied']:,}")
+        st.line_chart(pd.Series(values, index=pd.DatetimeIndex(times), name="Net Position"))
+    status = "Streaming" if stats['running'] else "Stopped"
+    st.caption(f"{status}: {stats['ticks_per_second']:,.0f} ticks/s applied of {stats['rate']:,} requested, "
+               f"{stats['batches']:,} store updates, {stats['queued']} batches queued, "
+               f"{stats['stalls']} backpressure stalls ({stats['stalled_seconds']:.1f} s).")
 
 def render_liquidity_tab():
     """Renders the Liquidity Forecast tab UI and handles forecasting."""
@@ -84,7 +186,10 @@ def render_liquidity_tab():
         liquidity_corridor = st.selectbox("Corridor", available_corridors, index=current_corridor_index, help="Select the relevant corridor.", key='liquidity_corridor_state')
 
         forecast_horizon = st.slider("Forecast Horizon (Days)", 3, 14, 7, help="Select the number of days to forecast liquidity.")
-        simulate_stress = st.checkbox("Simulate Stress Scenario (20% increased outflows)", help="Toggle to see impact of a stress scenario on liquidity.")
+        simulate_stress = st.checkbox(f"Simulate Stress Scenario ({STRESS_OUTFLOW_HAIRCUT:.0%} increased outflows)", help="Toggle to see impact of a stress scenario on liquidity.")
+        run_stress = st.checkbox("Run Stress Pack (all scenarios, all series)", help="Outflow shocks x volatility multipliers x FX shocks x corridor shutdowns, evaluated for every institution.")
+        forecast_mode = st.radio("Forecast Mode", FORECAST_MODES, horizontal=True, help="Monte Carlo runs thousands of seeded paths and shows quantile bands with threshold probabilities.")
+        monte_carlo_paths = st.select_slider("Monte Carlo Paths", options=MONTE_CARLO_PATH_OPTIONS, value=MONTE_CARLO_PATH_OPTIONS[0], help="Number of simulated paths in Monte Carlo mode.")
 
         col_liq_buttons1, col_liq_buttons2 = st.columns(2)
         with col_liq_buttons1:
@@ -99,34 +204,35 @@ def render_liquidity_tab():
     # Generate and Display Forecast
     if generate_forecast_button or refresh_data_button:
         if liquidity_institution and liquidity_stablecoin and liquidity_corridor:
-            filtered_data_for_plot = st.session_state['liquidity_data'][
-                (st.session_state['liquidity_data']['Institution'] == liquidity_institution) &
-                (st.session_state['liquidity_data']['Corridor'] == liquidity_corridor) &
-                (st.session_state['liquidity_data']['Stablecoin'] == liquidity_stablecoin)
-            ].sort_values(by='Timestamp').set_index('Timestamp')['Net Position']
+            # Direct lookup of the series' ring buffer; points are already in time order
+            filtered_data_for_plot, series_fit, series_version = series_snapshot(
+                (liquidity_institution, liquidity_stablecoin, liquidity_corridor)
+            )
 
-            st.session_state['last_filtered_liquidity_data_for_plot'] = filtered_data_for_plot
+            st.session_state['last_filtered_liquidity_data_for_plot'] = filtered_data_for_plot # Buffer views are never rewritten, so no copy is kept
             st.session_state['last_liq_institution'] = liquidity_institution
             st.session_state['last_liq_corridor'] = liquidity_corridor
             st.session_state['last_liq_stablecoin'] = liquidity_stablecoin
 
-            if not filtered_data_for_plot.empty:
+            if not filtered_data_for_plot.empty and forecast_mode == FORECAST_MODES[0]:
+                render_monte_carlo_forecast(
+                    filtered_data_for_plot, series_fit, series_version, liquidity_institution, liquidity_corridor, liquidity_stablecoin,
+                    forecast_horizon, monte_carlo_paths, simulate_stress
+                )
+            elif not filtered_data_for_plot.empty:
                 with st.spinner("Generating AI insights..."):
-                    forecast_paths = calculate_simulated_forecast_paths(
-                        filtered_data_for_plot,
-                        forecast_horizon=forecast_horizon,
-                        num_paths=2
+                    model_forecasts = cached_forecast(
+                        (liquidity_institution, liquidity_stablecoin, liquidity_corridor), series_version, ("models", forecast_horizon),
+                        lambda: calculate_model_forecasts(filtered_data_for_plot, forecast_horizon=forecast_horizon)
                     )
 
                     forecast_paths_adjusted = []
-                    path_names = ['Simulated EMA', 'Simulated ARIMA']
-
-                    for i, path_series in enumerate(forecast_paths):
-                        path_values_adjusted = list(path_series.values)
+                    for name, path_series in model_forecasts.items():
+                        path_values_adjusted = path_series.to_numpy(dtype=float, copy=True)
                         if simulate_stress:
-                            path_values_adjusted = [d - (abs(d) * 0.20) for d in path_values_adjusted]
+                            apply_haircut(path_values_adjusted, STRESS_OUTFLOW_HAIRCUT)
                         forecast_paths_adjusted.append({
-                            'name': path_names[i] if i < len(path_names) else f'Simulated Forecast Path {i+1}',
+                            'name': name,
                             'series': pd.Series(path_values_adjusted, index=path_series.index)
                         })
 
@@ -157,8 +263,9 @@ def render_liquidity_tab():
                             opacity=1.0 if 'EMA' in path_info['name'] else 0.8
                         ))
 
-                    fig.add_hline(y=-10000, line_dash="dash", line_color="darkred", annotation_text="Shortfall Threshold (-10k)", annotation_position="bottom right")
-                    fig.add_hline(y=50000, line_dash="dash", line_color="darkgreen", annotation_text="Surplus Threshold (50k)", annotation_position="bottom right")
+                    shortfall_threshold, surplus_threshold = liquidity_thresholds(liquidity_institution)
+                    fig.add_hline(y=shortfall_threshold, line_dash="dash", line_color="darkred", annotation_text=f"Shortfall Threshold ({shortfall_threshold:,})", annotation_position="bottom right")
+                    fig.add_hline(y=surplus_threshold, line_dash="dash", line_color="darkgreen", annotation_text=f"Surplus Threshold ({surplus_threshold:,})", annotation_position="bottom right")
 
                     fig.update_layout(
                         title=f"Liquidity Forecast - {liquidity_institution} in {liquidity_corridor} ({liquidity_stablecoin})",
@@ -180,13 +287,15 @@ def render_liquidity_tab():
                             average_forecast_series = combined_paths_df.mean(axis=1)
 
                             recommendations = []
-                            for i in range(forecast_horizon):
-                                forecasted_balance = average_forecast_series.iloc[i]
+                            balances = average_forecast_series.to_numpy()
+                            # Only breach days are formatted; the threshold tests run on the whole horizon at once
+                            for i in np.flatnonzero((balances < shortfall_threshold) | (balances > surplus_threshold)):
+                                forecasted_balance = balances[i]
                                 date = average_forecast_series.index[i].strftime('%Y-%m-%d')
 
-                                if forecasted_balance < -10000:
+                                if forecasted_balance < shortfall_threshold:
                                     recommendations.append(f"Projected average shortfall of {abs(forecasted_balance):,.0f} for {liquidity_institution} in {liquidity_corridor} ({liquidity_stablecoin}) on **{date}** (Day {i+1}). **Recommendation:** Source {liquidity_stablecoin} or adjust flows.")
-                                elif forecasted_balance > 50000:
+                                else:
                                     recommendations.append(f"Projected average surplus of {forecasted_balance:,.0f} for {liquidity_institution} in {liquidity_corridor} ({liquidity_stablecoin}) on **{date}** (Day {i+1}). **Recommendation:** Offer short-term lending on StableNet.")
 
                             if recommendations:
@@ -203,4 +312,50 @@ def render_liquidity_tab():
             else:
                 st.info("Select an Institution, Stablecoin, and Corridor with available historical data to generate a forecast.")
         else:
-            st.info("Please select Institution, Stablecoin, and Corridor to generate a forecast.") 
\ No newline at end of file
+            st.info("Please select Institution, Stablecoin, and Corridor to generate a forecast.")
+
+        # Early warnings across every series, rescanned at most once per scan interval
+        with st.expander("Early Warnings (All Series)", expanded=True):
+            scanner = st.session_state['liquidity_scanner']
+            alerts = scanner.maybe_scan()
+            if alerts.empty:
+                st.info(f"No series reaches {LIQUIDITY_ALERT_PROBABILITY:.0%} probability of a shortfall or surplus over the next {scanner.horizon} days.")
+            else:
+                st.dataframe(alerts.style.format({"Probability": "{:.1%}", "Magnitude": "{:,.0f}", "Threshold": "{:,.0f}", "Net Position": "{:,.0f}",
+                                                  "Earliest Breach": "{:%Y-%m-%d}", "First Seen": "{:%Y-%m-%d %H:%M}"}),
+                             use_container_width=True, hide_index=True)
+            st.caption(f"Scanned {scanner.series_scanned} series in {scanner.scan_seconds * 1e3:.1f} ms; "
+                       f"rescanned after changes, at most every {scanner.interval} s.")
+
+        # Portfolio-wide view: every series fitted and simulated in one batch
+        with st.expander("Portfolio Forecast (All Series)"):
+            liquidity_store = st.session_state['liquidity_store']
+            portfolio_version = tuple(liquidity_store.version(key) for key in liquidity_store.keys())
+            portfolio_forecast = st.session_state['forecast_cache'].get_or_compute(
+                "portfolio", portfolio_version, ("portfolio", forecast_horizon),
+                lambda: summarize_portfolio_forecast(liquidity_store, forecast_horizon, estimators=st.session_state['liquidity_estimators'])
+            )
+            st.dataframe(portfolio_forecast.style.format(precision=0), use_container_width=True, hide_index=True)
+
+        if run_stress:
+            # Every scenario of the configured grid against every series, one batched run
+            with st.expander("Stress Pack (All Series)", expanded=True):
+                liquidity_store = st.session_state['liquidity_store']
+                scenarios = stress_grid()
+                portfolio_version = tuple(liquidity_store.version(key) for key in liquidity_store.keys())
+                with st.spinner(f"Running {len(scenarios)} stress scenarios..."):
+                    worst_case, breach_days = st.session_state['forecast_cache'].get_or_compute(
+                        "stress", portfolio_version, ("stress", forecast_horizon),
+                        lambda: run_stress_pack(liquidity_store, scenarios, horizon=forecast_horizon, estimators=st.session_state['liquidity_estimators'])
+                    )
+                st.markdown(f"**Worst-case net position ({STRESS_REPORTING_CURRENCY}, {1 - STRESS_CONFIDENCE:.0%} quantile)**")
+                st.dataframe(worst_case.style.format("{:,.0f}"), use_container_width=True)
+                st.markdown(f"**First shortfall breach day ({1 - STRESS_CONFIDENCE:.0%} probability)**")
+                st.dataframe(breach_days.style.format("{:.0f}", na_rep="-"), use_container_width=True)
+
+        cache_stats = st.session_state['forecast_cache'].stats()
+        st.caption(f"Forecast cache: {cache_stats['entries']} entries, {cache_stats['bytes'] / 2**20:.1f} of {cache_stats['max_bytes'] / 2**20:.0f} MiB, "
+                   f"{cache_stats['hits']} hits / {cache_stats['misses']} misses / {cache_stats['evictions']} evictions.")
+
+    # Live data: the fragment reruns on its own, the rest of the page only on interaction
+    render_live_feed((liquidity_institution, liquidity_stablecoin, liquidity_corridor))
@@ -1,9 +1,9 @@
 import streamlit as st
 import pandas as pd
-import time
-import uuid 
-from src.utils import calculate_fee, create_ledger_entry # Assuming .utils for relative import
-from src.config_base import FX_RATES # Assuming .config_base for relative import
+import numpy as np
+from src.utils import calculate_fee, create_ledger_entry, fx_engine # Assuming .utils for relative import
+from src.batch_ingest import read_payment_file, ingest_payment_batch, PAYMENT_BATCH_COLUMNS
+from src.settlement_engine import PENDING_STATUS
 
 def render_payments_tab():
     """Renders the Payments tab UI and handles payment submission."""
@@ -54,49 +54,46 @@ def render_payments_tab():
              errors.append("Invalid Receiving Stablecoin selected.")
 
         # Check if FX rate exists for the selected stablecoin pair
-        if (sending_stablecoin, receiving_stablecoin) not in FX_RATES:
+        if np.isnan(fx_engine.rate(sending_stablecoin, receiving_stablecoin)):
              errors.append(f"No FX rate available for {sending_stablecoin} to {receiving_stablecoin}.")
 
 
         if submit_button:
+            screening_index = st.session_state['screening_index']
+            if not errors and screening_index is not None:
+                # Both parties are screened against the watchlist before the payment reaches the settlement engine
+                for party, name in (("Sending Institution", sending_institution), ("Receiving Institution", receiving_institution)):
+                    match = screening_index.screen(name)
+                    if match:
+                        errors.append(f"{party} '{name}' matches watchlist entry '{match['Watchlist Name']}' ({match['List']}, {match['Entry ID']}, "
+                                      f"score {match['Score']:.2f}). The payment is blocked pending compliance review.")
             if errors:
                 for error in errors:
                     st.error(error)
             else:
-                # Simulate processing
-                with st.spinner("Processing payment on StableNet Ledger..."):
-                    # Simulate network latency
-                    time.sleep(2)
-
-                    # Calculate fee
-                    fee = calculate_fee(amount_to_send, transaction_priority)
-                    st.success(f"Payment settled instantly! Transaction ID: {uuid.uuid4().hex[:8].upper()}")
-
-                    # Show fee comparison - Fee is calculated on amount_sent, but displayed in Receiving Stablecoin's equivalent value
-                    # Let's calculate fee in sending stablecoin for simplicity in calculation,
-                    # but the comparison is against a USD value.
-                    # We'll display the fee in the sending stablecoin units.
-                    st.metric(label="StableNet Fee", value=f"{fee:.4f} {sending_stablecoin}", delta=f"vs. CBS Fee: ~{amount_to_send*0.01}-{amount_to_send*0.05} USD (estimated)", delta_color="inverse")
-
-
-                    # Add transaction to ledger
-                    new_transaction = create_ledger_entry(
-                        sending_institution=sending_institution,
-                        receiving_institution=receiving_institution,
-                        corridor=corridor,
-                        amount_sent=amount_to_send,
-                        sending_stablecoin=sending_stablecoin,
-                        receiving_stablecoin=receiving_stablecoin,
-                        priority=transaction_priority,
-                        fee=fee # Fee recorded in sending stablecoin units
-                    )
-                    # Convert to DataFrame and concatenate, handling potential empty initial state
-                    new_transaction_df = pd.DataFrame([new_transaction])
-                    if 'transactions' in st.session_state:
-                        st.session_state['transactions'] = pd.concat([st.session_state['transactions'], new_transaction_df], ignore_index=True)
-                    else:
-                         st.session_state['transactions'] = new_transaction_df
-
+                # Calculate fee
+                fee = calculate_fee(amount_to_send, transaction_priority)
+
+                new_transaction = create_ledger_entry(
+                    sending_institution=sending_institution,
+                    receiving_institution=receiving_institution,
+                    corridor=corridor,
+                    amount_sent=amount_to_send,
+                    sending_stablecoin=sending_stablecoin,
+                    receiving_stablecoin=receiving_stablecoin,
+                    priority=transaction_priority,
+                    fee=fee # Fee recorded in sending stablecoin units
+                )
+                # Hand the payment to the settlement engine; it is appended to the ledger
+                # once settled, while this script run returns immediately
+                tx_id = st.session_state['settlement_engine'].submit(new_transaction)
+                st.success(f"Payment submitted to StableNet Ledger! Transaction ID: {tx_id}")
+
+                # Show fee comparison - Fee is calculated on amount_sent, but displayed in Receiving Stablecoin's equivalent value
+                # Let's calculate fee in sending stablecoin for simplicity in calculation,
+                # but the comparison is against a USD value.
+                # We'll display the fee in the sending stablecoin units.
+                st.metric(label="StableNet Fee", value=f"{fee:.4f} {sending_stablecoin}", delta=f"vs. CBS Fee: ~{amount_to_send*0.01}-{amount_to_send*0.05} USD (estimated)", delta_color="inverse")
 
                 st.balloons()
 
@@ -109,4 +106,35 @@ def render_payments_tab():
                 # | Speed        | Instant                   | 2-5 Days                 |
                 # | Cost         | Very Low (e.g., 0.01%)    | High (e.g., 30-50 USD)   |
                 # | Transparency | Full, Immutable Ledger    | Limited Visibility       |
-                # """) 
\ No newline at end of file
+                # """)
+
+    render_settlement_status()
+    render_batch_upload()
+
+@st.fragment(run_every=1)
+def render_settlement_status():
+    """Polls the settlement engine and shows the status of recent submissions."""
+    engine = st.session_state['settlement_engine']
+    recent = engine.recent(limit=10)
+    if recent:
+        pending_count = sum(1 for _, status in recent if status == PENDING_STATUS)
+        st.caption(f"Recent submissions ({pending_count} pending)")
+        st.dataframe(pd.DataFrame(recent, columns=["Transaction ID", "Status"]), use_container_width=True, hide_index=True)
+
+def render_batch_upload():
+    """Renders the bulk payment upload and settles the whole file in one vectorized batch."""
+    with st.expander("Bulk Payment Upload"):
+        st.write(f"Upload a CSV or Parquet file with columns: {', '.join(PAYMENT_BATCH_COLUMNS)} (optional: Priority).")
+        uploaded_file = st.file_uploader("Payment batch file", type=["csv", "parquet"], key="payment_batch_file")
+        if uploaded_file is not None and st.button("Settle Batch"):
+            try:
+                payments = read_payment_file(uploaded_file, uploaded_file.name)
+                with st.spinner("Settling payment batch on StableNet Ledger..."):
+                    settled, rejected = ingest_payment_batch(payments, st.session_state['ledger_store'], st.session_state['screening_index'])
+            except (ValueError, OSError) as exc:
+                st.error(f"Could not process payment file: {exc}")
+                return
+            st.success(f"Settled {len(settled):,} payments in one batch.")
+            if not rejected.empty:
+                st.warning(f"{len(rejected):,} payments were rejected.")
+                st.dataframe(rejected, use_container_width=True)
@@ -0,0 +1,13 @@
+import streamlit as st
+
+
+@st.fragment(run_every=2)
+def render_change_notice():
+    """Tells the operator when the shared ledger or liquidity data changed after this page was drawn."""
+    changes = st.session_state['change_feed'].since(st.session_state['seen_changes'])
+    if changes:
+        labels = {"ledger": "ledger entries", "liquidity": "liquidity points"}
+        st.info("Since this page was drawn: " + ", ".join(f"{count:,} new {labels.get(topic, topic)}" for topic, count in changes.items())
+                + " (from all sessions).")
+        if st.button("Refresh View", key="refresh_shared_state"):
+            st.rerun() # The whole page, not only this fragment